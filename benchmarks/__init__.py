@@ -0,0 +1,51 @@
+import statistics
+import time
+from typing import Callable, List
+
+from django.contrib.auth import get_user_model
+
+from quizzes.models import Quiz, Question, Answer
+from quizzes.stats import create_stats
+
+
+def measure(func: Callable, repeat: int = 20) -> List[float]:
+    """ Calls the given function `repeat` times, returning the duration of each call in milliseconds. """
+    durations = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    return durations
+
+
+def report(name: str, durations: List[float]):
+    """ Prints the median and 95th percentile of the given durations (in milliseconds). """
+    durations = sorted(durations)
+    p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+    print(f'{name:<50} median {statistics.median(durations):>9.2f} ms    p95 {p95:>9.2f} ms')
+
+
+def create_quiz_with_questions(number_of_questions: int, answers_per_question: int = 4, creator=None) -> Quiz:
+    """ Creates a quiz with the given number of questions, each with one correct answer. """
+    if creator is None:
+        creator = get_user_model().objects.create_user(f'creator_{Quiz.objects.count()}', password='thisisasecret')
+
+    quiz = Quiz.objects.create(name='quiz', creator=creator)
+    last_question_pk = Question.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+    # Objects created by bulk_create don't have their pk set on SQLite, so fetch them again
+    Question.objects.bulk_create([Question(text=f'question_{i}', creator=creator) for i in range(number_of_questions)])
+    questions = list(Question.objects.filter(pk__gt=last_question_pk).order_by('pk'))
+
+    Answer.objects.bulk_create([
+        Answer(question=question, text=f'answer_{i}', is_correct_answer=i == 0, creator=creator)
+        for question in questions
+        for i in range(answers_per_question)
+    ])
+
+    # Bulk created questions don't send signals, so create their statistics
+    create_stats(Question, [question.pk for question in questions])
+    quiz.questions.add(*questions)
+    return quiz
@@ -0,0 +1,23 @@
+from django.test import TestCase
+
+from benchmarks import measure, report, create_quiz_with_questions
+from quizzes.models import Answer
+
+
+class AttemptBenchmarks(TestCase):
+    """ Latency of grading a quiz attempt through POST /api/quizzes/{id}/attempt/. """
+
+    def test_attempt(self):
+        print()
+
+        for number_of_questions in [10, 100, 1000]:
+            quiz = create_quiz_with_questions(number_of_questions)
+            answer_ids = list(Answer.objects.filter(question__quiz=quiz, is_correct_answer=True)
+                              .values_list('pk', flat=True))
+
+            def attempt():
+                response = self.client.post(f'/api/quizzes/{quiz.pk}/attempt/', data={'answers': answer_ids},
+                                            content_type='application/json')
+                self.assertEqual(response.status_code, 200)
+
+            report(f'attempt ({number_of_questions} questions)', measure(attempt))
@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from benchmarks import measure, report
+from quizzes.views import QuizViewSet
+from testme_auth.authentication import TokenClaimsJWTAuthentication, token_revocations
+from testme_auth.serializers import TokenObtainPairSerializer
+
+
+class AuthenticationBenchmarks(TestCase):
+    """ Latency of authenticating a read only request from a JWT's claims compared with fetching its user. """
+
+    def test_authenticate(self):
+        print()
+        user = get_user_model().objects.create_user('user', password='thisisasecret')
+        token = TokenObtainPairSerializer.get_token(user).access_token
+        request = APIRequestFactory().get('/api/quizzes/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        for name, authentication in [('fetch user', JWTAuthentication()),
+                                     ('user from claims', TokenClaimsJWTAuthentication())]:
+            token_revocations.clear()
+            report(f'authenticate ({name})', measure(lambda: authentication.authenticate(request), repeat=1000))
+
+    def test_request(self):
+        print()
+        get_user_model().objects.create_user('user', password='thisisasecret')
+        response = self.client.post('/api/auth/', {'username': 'user', 'password': 'thisisasecret'})
+        token = response.json()['data']['access']
+
+        # Authentication classes are read from the settings when views are defined
+        for name, authentication in [('fetch user', JWTAuthentication),
+                                     ('user from claims', TokenClaimsJWTAuthentication)]:
+            with mock.patch.object(QuizViewSet, 'authentication_classes', [authentication]):
+                self.client.get('/api/quizzes/latest/', HTTP_AUTHORIZATION=f'Bearer {token}')
+                report(f'GET /api/quizzes/latest/ ({name})', measure(
+                    lambda: self.client.get('/api/quizzes/latest/', HTTP_AUTHORIZATION=f'Bearer {token}'), repeat=200))
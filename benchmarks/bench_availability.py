@@ -0,0 +1,24 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from benchmarks import measure, report
+from testme_auth.availability import user_availability
+
+
+class AvailabilityBenchmarks(TestCase):
+    """ Latency of checking a username is available with the bloom filter compared with looking it up. """
+
+    def test_available(self):
+        print()
+        get_user_model().objects.bulk_create([
+            get_user_model()(username=f'user_{i}', email=f'user_{i}@example.com', password='!') for i in range(10000)
+        ])
+        user_availability.build()
+
+        report('get available (filter)', measure(lambda: user_availability.get_available(username='other'), 1000))
+        report('get taken (query)', measure(lambda: user_availability.get_taken(username='other'), 1000))
+        report('GET /api/users/available/ (available)', measure(
+            lambda: self.client.get('/api/users/available/?username=other'), 200))
+        report('GET /api/users/available/ (taken)', measure(
+            lambda: self.client.get('/api/users/available/?username=user_5000'), 200))
+        report('build filter (10000 users)', measure(user_availability.build, 5))
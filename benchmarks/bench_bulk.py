@@ -0,0 +1,54 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from benchmarks import measure, report
+from quizzes.models import Question, Tag
+
+NUMBER_OF_ROWS = int(os.environ.get('BENCH_BULK_ROWS', 10000))
+
+
+class BulkBenchmarks(TestCase):
+    """
+    Latency of creating, updating and deleting questions (each with two tags) one per request compared to a list per
+    request through /api/questions/.
+
+    The number of questions defaults to 10,000 and can be set with the BENCH_BULK_ROWS environment variable. Creating
+    questions one per request is measured for a tenth of them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser('admin', password='thisisasecret')
+        cls.tags = [f'http://testserver/api/tags/{Tag.objects.create(name=f"tag{i}").pk}/' for i in range(2)]
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def send(self, method, data, expected_status):
+        response = getattr(self.client, method)('/api/questions/', data, content_type='application/json')
+        self.assertEqual(response.status_code, expected_status)
+        return response
+
+    def report(self, name, rows, durations):
+        report(f'{name} ({rows} rows, {rows / (durations[0] / 1000):.0f} rows/s)', durations)
+
+    def test_bulk(self):
+        print()
+        items = [{'text': f'question_{i}', 'answers': [], 'tags': self.tags} for i in range(NUMBER_OF_ROWS)]
+        single_rows = NUMBER_OF_ROWS // 10
+
+        def create_singly():
+            for item in items[:single_rows]:
+                self.send('post', item, 201)
+
+        self.report('POST one per request', single_rows, measure(create_singly, repeat=1))
+        self.report('POST list', NUMBER_OF_ROWS, measure(lambda: self.send('post', items, 201), repeat=1))
+
+        urls = [f'http://testserver/api/questions/{pk}/'
+                for pk in Question.objects.order_by('-pk').values_list('pk', flat=True)[:NUMBER_OF_ROWS]]
+        updates = [{'url': url, 'text': 'updated', 'tags': self.tags[:1]} for url in urls]
+
+        self.report('PATCH list', NUMBER_OF_ROWS, measure(lambda: self.send('patch', updates, 200), repeat=1))
+        self.report('DELETE list', NUMBER_OF_ROWS, measure(lambda: self.send('delete', urls, 204), repeat=1))
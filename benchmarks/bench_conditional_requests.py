@@ -0,0 +1,45 @@
+import os
+
+from django.db.models import Count, Max
+from django.test import TestCase
+
+from benchmarks import measure, report
+from quizzes.models import Question
+
+NUMBER_OF_QUESTIONS = int(os.environ.get('BENCH_CONDITIONAL_QUESTIONS', 300000))
+
+
+class ConditionalRequestBenchmarks(TestCase):
+    """
+    Latency of finding the validators of the question list, with a MAX alone compared to with a COUNT as well, and of
+    conditional and unconditional requests to the question list.
+
+    The number of questions defaults to 300,000 and can be set with the BENCH_CONDITIONAL_QUESTIONS environment
+    variable.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        batch_size = 10000
+
+        for start in range(0, NUMBER_OF_QUESTIONS, batch_size):
+            Question.objects.bulk_create([Question(text=f'question_{i}')
+                                          for i in range(start, min(start + batch_size, NUMBER_OF_QUESTIONS))])
+
+    def test_validators(self):
+        print()
+        print(f'{NUMBER_OF_QUESTIONS} questions')
+        queryset = Question.objects.order_by()
+
+        report('MAX(updated_on)', measure(lambda: queryset.aggregate(Max('updated_on'))))
+        report('MAX(updated_on), COUNT(id)', measure(lambda: queryset.aggregate(Max('updated_on'), Count('pk'))))
+
+    def test_list(self):
+        print()
+        print(f'{NUMBER_OF_QUESTIONS} questions')
+        etag = self.client.get('/api/questions/')['ETag']
+
+        self.assertEqual(self.client.get('/api/questions/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        report('GET /api/questions/', measure(lambda: self.client.get('/api/questions/')))
+        report('GET /api/questions/ If-None-Match',
+               measure(lambda: self.client.get('/api/questions/', HTTP_IF_NONE_MATCH=etag)))
@@ -0,0 +1,29 @@
+from django.test import TestCase
+
+from benchmarks import create_quiz_with_questions, measure, report
+from utils.encoders import Encoder, BACKENDS
+
+
+class EncoderBenchmarks(TestCase):
+    """ Latency of encoding the data of a page of 100 questions and a bundle of a quiz with 100 questions, per backend. """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.quiz = create_quiz_with_questions(100)
+
+    def get_data(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return {'status': 200, 'success': True, 'message': 'OK', 'data': response.data}
+
+    def test_encode(self):
+        print()
+        payloads = {
+            'questions page': self.get_data('/api/questions/?page_size=100'),
+            'quiz bundle': self.get_data(f'/api/quizzes/{self.quiz.pk}/bundle/'),
+        }
+
+        for name, data in payloads.items():
+            for backend in (name for name, module in BACKENDS.items() if module is not None):
+                encoder = Encoder(ensure_ascii=False, allow_nan=False, backend=backend)
+                report(f'{name} ({backend})', measure(lambda: encoder.encode(data), repeat=200))
@@ -0,0 +1,65 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import TestCase
+from django.utils.module_loading import import_string
+
+from benchmarks import measure, report
+
+HASHERS = [
+    ('pbkdf2', 'testme_auth.hashers.PBKDF2PasswordHasher'),
+    ('scrypt', 'testme_auth.hashers.ScryptPasswordHasher'),
+    ('argon2', 'testme_auth.hashers.Argon2PasswordHasher'),
+]
+
+
+def is_available(hasher: str) -> bool:
+    try:
+        make_password('thisisasecret', hasher=import_string(hasher).algorithm)
+    except ValueError:
+        return False
+    return True
+
+
+class HashingBenchmarks(TestCase):
+    """
+    Latency of logging in, and logins per second per core when many users log in at once, with each hasher at the
+    costs in the settings. Argon2 is skipped unless argon2-cffi is installed.
+    """
+
+    def test_login(self):
+        print()
+
+        for name, hasher in HASHERS:
+            with self.settings(PASSWORD_HASHERS=[hasher]):
+                if not is_available(hasher):
+                    print(f'{name} isn\'t available')
+                    continue
+
+                get_user_model().objects.create_user(name, password='thisisasecret')
+                data = {'username': name, 'password': 'thisisasecret'}
+                report(f'POST /api/auth/ ({name})', measure(lambda: self.client.post('/api/auth/', data), repeat=20))
+
+    def test_throughput(self):
+        print()
+        cores = cpu_count() or 1
+
+        for name, hasher in HASHERS:
+            with self.settings(PASSWORD_HASHERS=[hasher]):
+                if not is_available(hasher):
+                    continue
+
+                # Logging in is dominated by verifying the password, which is done on the hashing pool
+                encoded = make_password('thisisasecret')
+                logins = 100
+
+                with ThreadPoolExecutor(32) as executor:
+                    start = time.perf_counter()
+                    list(executor.map(lambda _: check_password('thisisasecret', encoded), range(logins)))
+                    duration = time.perf_counter() - start
+
+                print(f'{f"logins per second per core ({name})":<50} {logins / duration / cores:>9.1f}    '
+                      f'({cores} cores)')
@@ -0,0 +1,53 @@
+import os
+from base64 import urlsafe_b64encode
+
+from django.test import TestCase
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from benchmarks import measure, report
+from quizzes.models import Question
+from utils.pagination import KeysetPagination
+
+NUMBER_OF_QUESTIONS = int(os.environ.get('BENCH_PAGINATION_QUESTIONS', 100000))
+PAGE_SIZE = 10
+
+
+class PaginationBenchmarks(TestCase):
+    """
+    Latency of fetching the first and last page of questions with PageNumberPagination compared to KeysetPagination.
+
+    The number of questions defaults to 100,000 (10,000 pages) and can be set with the BENCH_PAGINATION_QUESTIONS
+    environment variable.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        batch_size = 10000
+
+        for start in range(0, NUMBER_OF_QUESTIONS, batch_size):
+            Question.objects.bulk_create([Question(text=f'question_{i}')
+                                          for i in range(start, min(start + batch_size, NUMBER_OF_QUESTIONS))])
+
+    def paginate(self, paginator, params):
+        request = Request(APIRequestFactory().get('/api/questions/', params))
+        paginator.page_size = PAGE_SIZE
+        page = paginator.paginate_queryset(Question.objects.order_by('pk'), request)
+        return paginator.get_paginated_response(page)
+
+    def test_pagination(self):
+        print()
+        print(f'{NUMBER_OF_QUESTIONS} questions, {PAGE_SIZE} per page')
+
+        last_page = NUMBER_OF_QUESTIONS // PAGE_SIZE
+        # The cursor for the last page holds the pk of the last question on the page before it
+        last_pk = Question.objects.order_by('pk').values_list('pk', flat=True)[(last_page - 1) * PAGE_SIZE - 1]
+        last_cursor = urlsafe_b64encode(f'{{"p":[{last_pk}]}}'.encode()).decode()
+
+        report('PageNumberPagination page 1', measure(lambda: self.paginate(PageNumberPagination(), {})))
+        report(f'PageNumberPagination page {last_page}',
+               measure(lambda: self.paginate(PageNumberPagination(), {'page': last_page})))
+        report('KeysetPagination page 1', measure(lambda: self.paginate(KeysetPagination(), {})))
+        report(f'KeysetPagination page {last_page}',
+               measure(lambda: self.paginate(KeysetPagination(), {'cursor': last_cursor})))
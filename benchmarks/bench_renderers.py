@@ -0,0 +1,46 @@
+import tracemalloc
+
+from django.test import SimpleTestCase
+from rest_framework.response import Response
+
+from benchmarks import measure, report
+from utils.renderers import DescriptiveJsonRenderer, StreamingJsonRenderer
+
+NUMBER_OF_ROWS = 10000
+
+
+class RendererBenchmarks(SimpleTestCase):
+    """ Latency and peak memory use of rendering a list of 10,000 question-like rows, streamed and not. """
+
+    def setUp(self) -> None:
+        self.rows = [{
+            'url': f'http://testserver/api/questions/{i}/',
+            'creator': 'http://testserver/api/users/1/',
+            'text': f'question_{i}',
+            'description': 'description ' * 10,
+            'answers': [f'http://testserver/api/answers/{i * 4 + j}/' for j in range(4)],
+            'tags': ['http://testserver/api/tags/1/'],
+            'is_multiple_choice': False,
+        } for i in range(NUMBER_OF_ROWS)]
+        self.context = {'response': Response()}
+
+    def render(self):
+        return DescriptiveJsonRenderer().render(self.rows, 'application/json', self.context)
+
+    def render_streamed(self):
+        renderer = StreamingJsonRenderer()
+        for _ in renderer.render_chunks(renderer.wrap(self.rows, self.context)):
+            pass
+
+    def peak_memory(self, func) -> float:
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak / 2 ** 20
+
+    def test_render(self):
+        print()
+
+        for name, func in (('DescriptiveJsonRenderer', self.render), ('StreamingJsonRenderer', self.render_streamed)):
+            report(f'{name} ({self.peak_memory(func):.1f} MiB peak)', measure(func, repeat=20))
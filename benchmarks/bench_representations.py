@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from benchmarks import create_quiz_with_questions, measure, report
+from quizzes.mixins import ValuesRepresentationMixin
+from quizzes.models import Tag
+from quizzes.views import QuestionViewSet, AnswerViewSet, QuizViewSet
+
+PAGE_SIZE = 100
+
+
+class RepresentationBenchmarks(TestCase):
+    """
+    Latency of representing a page of 100 questions (each with four answers and two tags), answers and quizzes with
+    their serializers compared to from their values, alone and as part of a request to their list endpoint.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        quiz = create_quiz_with_questions(PAGE_SIZE)
+        tags = [Tag.objects.create(name=f'tag{i}') for i in range(2)]
+
+        for tag in tags:
+            tag.question_set.add(*quiz.questions.all())
+
+        for i in range(PAGE_SIZE - 1):
+            create_quiz_with_questions(1, creator=quiz.creator).questions.add(*quiz.questions.all()[:10])
+
+    def get_view(self, viewset_class):
+        request = Request(APIRequestFactory().get('/api/'))
+        view = viewset_class(request=request, format_kwarg=None, action='list', kwargs={})
+        return view, view.get_queryset().order_by('pk')[:PAGE_SIZE]
+
+    def serialize(self, viewset_class):
+        view, queryset = self.get_view(viewset_class)
+        return view.get_serializer(list(queryset), many=True).data
+
+    def represent(self, viewset_class):
+        view, queryset = self.get_view(viewset_class)
+        representation = view.get_values_representation()
+        return representation.represent(list(representation.get_values(queryset)))
+
+    def test_represent(self):
+        print()
+
+        for name, viewset_class in (('questions', QuestionViewSet), ('answers', AnswerViewSet),
+                                    ('quizzes', QuizViewSet)):
+            self.assertEqual(self.serialize(viewset_class), self.represent(viewset_class))
+            report(f'{name} serializer', measure(lambda: self.serialize(viewset_class), repeat=50))
+            report(f'{name} values', measure(lambda: self.represent(viewset_class), repeat=50))
+
+    def test_list(self):
+        print()
+        url = f'/api/questions/?page_size={PAGE_SIZE}'
+
+        with mock.patch.object(ValuesRepresentationMixin, 'get_values_representation', return_value=None):
+            report('GET /api/questions/ serializer', measure(lambda: self.client.get(url), repeat=50))
+
+        report('GET /api/questions/ values', measure(lambda: self.client.get(url), repeat=50))
@@ -0,0 +1,56 @@
+import os
+import random
+
+from django.test import TestCase
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from benchmarks import measure, report
+from quizzes.models import Question, Tag
+from quizzes.search import FullTextSearchFilter
+from quizzes.views import QuestionViewSet
+
+NUMBER_OF_QUESTIONS = int(os.environ.get('BENCH_SEARCH_QUESTIONS', 1000000))
+VOCABULARY = [f'word{i}' for i in range(5000)]
+
+
+class SearchBenchmarks(TestCase):
+    """
+    Latency of searching questions with SearchFilter compared to FullTextSearchFilter.
+
+    The number of questions defaults to 1,000,000 and can be set with the BENCH_SEARCH_QUESTIONS environment variable.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(0)
+        tags = [Tag.objects.create(name=f'tag{i}') for i in range(100)]
+        batch_size = 10000
+
+        for start in range(0, NUMBER_OF_QUESTIONS, batch_size):
+            Question.objects.bulk_create([
+                Question(text=' '.join(rng.choices(VOCABULARY, k=6)),
+                         description=' '.join(rng.choices(VOCABULARY, k=12)))
+                for _ in range(start, min(start + batch_size, NUMBER_OF_QUESTIONS))
+            ])
+
+        through = Question.tags.through
+        through.objects.bulk_create([through(question_id=pk, tag=rng.choice(tags))
+                                     for pk in range(1, NUMBER_OF_QUESTIONS + 1, 10)], batch_size=batch_size)
+
+    def search(self, backend, search):
+        """ Searches questions like the list endpoint does, counting the results and fetching the first page. """
+        request = Request(APIRequestFactory().get('/api/questions/', {'search': search}))
+        view = QuestionViewSet(action='list', request=request, format_kwarg=None)
+        queryset = backend().filter_queryset(request, view.get_queryset(), view)
+        return queryset.count(), list(queryset[:10])
+
+    def test_search(self):
+        print()
+        print(f'{NUMBER_OF_QUESTIONS} questions')
+
+        # A common word, a rare word, a prefix, two words, a tag and a word that doesn't exist
+        for search in ['word1', 'word4321', 'word432', 'word12 word34', 'tag7', 'missing']:
+            for backend in [SearchFilter, FullTextSearchFilter]:
+                report(f'{backend.__name__} "{search}"', measure(lambda: self.search(backend, search), repeat=3))
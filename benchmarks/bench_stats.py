@@ -0,0 +1,26 @@
+from django.db.models import Count, Q, Sum
+from django.test import TestCase
+
+from benchmarks import measure, report, create_quiz_with_questions
+from quizzes.models import Answer, QuizStats
+
+
+class StatsBenchmarks(TestCase):
+    """ Latency of reading a quiz's statistics compared with aggregating them from its answers on every request. """
+
+    def test_quiz_stats(self):
+        print()
+
+        for number_of_questions in [10, 100, 1000]:
+            quiz = create_quiz_with_questions(number_of_questions)
+
+            def aggregate():
+                Answer.objects.filter(question__quiz=quiz).aggregate(
+                    answer_count=Count('pk'), correct_answer_count=Count('pk', filter=Q(is_correct_answer=True)),
+                    vote_count=Sum('votes'))
+
+            def stats():
+                QuizStats.objects.get(pk=quiz.pk)
+
+            report(f'aggregate answers ({number_of_questions} questions)', measure(aggregate))
+            report(f'read statistics ({number_of_questions} questions)', measure(stats))
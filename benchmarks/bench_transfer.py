@@ -0,0 +1,44 @@
+import io
+import os
+import time
+
+from django.test import TestCase
+
+from benchmarks import create_quiz_with_questions
+from quizzes.models import Tag
+from quizzes.transfer import export_rows, Importer
+
+NUMBER_OF_QUESTIONS = int(os.environ.get('BENCH_TRANSFER_QUESTIONS', 20000))
+
+
+class TransferBenchmarks(TestCase):
+    """
+    Throughput of exporting and importing a quiz with 20,000 questions (each with four answers and two tags), as done
+    by the export_quizzes and import_quizzes commands.
+
+    The number of questions can be set with the BENCH_TRANSFER_QUESTIONS environment variable.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        quiz = create_quiz_with_questions(NUMBER_OF_QUESTIONS)
+        tags = [Tag.objects.create(name=f'tag{i}') for i in range(2)]
+
+        for tag in tags:
+            tag.question_set.add(*quiz.questions.all())
+
+    def report(self, name, rows, duration):
+        print(f'{name:<50} {rows} rows in {duration:.2f}s ({rows / duration:.0f} rows/s)')
+
+    def test_transfer(self):
+        print()
+        stream = io.StringIO()
+
+        start = time.perf_counter()
+        rows = export_rows(stream)
+        self.report('export', rows, time.perf_counter() - start)
+
+        stream.seek(0)
+        start = time.perf_counter()
+        rows = Importer().import_rows(stream)
+        self.report('import', rows, time.perf_counter() - start)
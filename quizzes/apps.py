@@ -1,5 +1,14 @@
+import atexit
+
 from django.apps import AppConfig
 
 
 class QuizzesConfig(AppConfig):
     name = 'quizzes'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - connects signal receivers
+        from .votes import flush_vote_buffer
+
+        # Write any buffered votes before the process exits
+        atexit.register(flush_vote_buffer)
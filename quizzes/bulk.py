@@ -0,0 +1,276 @@
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from django.core.exceptions import ObjectDoesNotExist, ValidationError as DjangoValidationError
+from django.db import connections, router, transaction
+from django.urls import resolve, get_script_prefix, Resolver404, ResolverMatch
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.validators import UniqueValidator
+
+from .signals import bulk_saved
+
+
+def bulk_create(model, instances: list, batch_size: int = None):
+    """ Like `QuerySet.bulk_create`, but sets the pks of the created objects on every supported database. """
+    connection = connections[router.db_for_write(model)]
+
+    if connection.features.can_return_rows_from_bulk_insert:
+        model._default_manager.bulk_create(instances, batch_size=batch_size)
+    elif connection.vendor == 'sqlite':
+        model._default_manager.bulk_create(instances, batch_size=batch_size)
+
+        # The pks of the inserted rows aren't returned, but they're consecutive as SQLite only allows one transaction to
+        # write at a time, and the caller must be in a transaction.
+        if instances:
+            last_pk = model._default_manager.order_by('-pk').values_list('pk', flat=True)[0]
+            for pk, instance in zip(range(last_pk - len(instances) + 1, last_pk + 1), instances):
+                instance.pk = pk
+    else:
+        for instance in instances:
+            instance.save(force_insert=True)
+
+
+def resolve_url(url) -> Optional[ResolverMatch]:
+    """ Resolves the path of a url (like HyperlinkedRelatedField does), or returns None if it doesn't match a view. """
+    if not isinstance(url, str):
+        return None
+
+    path = urlparse(url).path
+    prefix = get_script_prefix()
+
+    if path.startswith(prefix):
+        path = '/' + path[len(prefix):]
+
+    try:
+        return resolve(path)
+    except Resolver404:
+        return None
+
+
+class BulkHyperlinkedRelatedField(serializers.HyperlinkedRelatedField):
+    """
+    HyperlinkedRelatedField that looks up related objects among those fetched for a whole list of objects by
+    BulkListSerializer, rather than querying for each one.
+    """
+
+    prefetched_objects: Optional[Dict[str, object]] = None
+
+    def get_lookup_value(self, url) -> Optional[str]:
+        """ Returns the pk in the given url, or None if it isn't a url for this field's view. """
+        match = resolve_url(url)
+
+        if match is None or match.view_name != self.view_name:
+            return None
+
+        return match.kwargs.get(self.lookup_url_kwarg)
+
+    def get_object(self, view_name, view_args, view_kwargs):
+        if self.prefetched_objects is None:
+            return super().get_object(view_name, view_args, view_kwargs)
+
+        try:
+            return self.prefetched_objects[str(view_kwargs[self.lookup_url_kwarg])]
+        except KeyError:
+            raise ObjectDoesNotExist
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer that validates, creates and updates lists of objects with a few queries per list rather than per
+    object. Objects are saved with `bulk_create` and `bulk_update`, many-to-many relations by inserting into their
+    through tables, all in a single transaction.
+
+    As `post_save` and `m2m_changed` aren't sent, `quizzes.signals.bulk_saved` is sent once objects are saved instead.
+
+    Usage:
+        Set `list_serializer_class` on the serializer's Meta class to this class, and use BulkHyperlinkedRelatedField
+        for related fields (e.g. by setting `serializer_related_field`).
+    """
+
+    batch_size = 1000
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            return super().to_internal_value(data)
+
+        self.fetch_related_objects(data)
+        unique_validators = self.pop_unique_validators()
+        instances = self.instance if self.instance is not None else [None] * len(data)
+        validated, errors = [], []
+
+        for instance, item in zip(instances, data):
+            # Validation of partial updates and uniqueness depends on the object being updated
+            self.child.instance = instance
+
+            try:
+                validated.append(self.child.run_validation(item))
+                errors.append({})
+            except ValidationError as exc:
+                validated.append(None)
+                errors.append(exc.detail)
+
+        self.child.instance = None
+        self.validate_unique(unique_validators, instances, validated, errors)
+
+        if any(errors):
+            raise ValidationError(errors)
+
+        return validated
+
+    def fetch_related_objects(self, data: list):
+        """ Fetches the objects referred to by each related field of every item with a query per field. """
+        for name, field in self.child.fields.items():
+            relation = getattr(field, 'child_relation', field)
+
+            if field.read_only or not isinstance(relation, BulkHyperlinkedRelatedField):
+                continue
+
+            if relation.lookup_field != 'pk':
+                continue
+
+            model = relation.get_queryset().model
+            pks = set()
+
+            for item in data:
+                values = item.get(field.field_name) if isinstance(item, dict) else None
+                for url in values if isinstance(values, list) else [values]:
+                    try:
+                        pks.add(model._meta.pk.to_python(relation.get_lookup_value(url)))
+                    except DjangoValidationError:
+                        pass
+
+            pks.discard(None)
+            relation.prefetched_objects = {str(pk): obj for pk, obj in relation.get_queryset().in_bulk(pks).items()}
+
+    def pop_unique_validators(self) -> Dict[str, UniqueValidator]:
+        """ Removes the unique validators from the child's fields, as they query once per item. """
+        unique_validators = {}
+
+        for name, field in self.child.fields.items():
+            validators = [validator for validator in field.validators if isinstance(validator, UniqueValidator)]
+            if validators:
+                field.validators = [validator for validator in field.validators if validator not in validators]
+                unique_validators[name] = validators[0]
+
+        return unique_validators
+
+    def validate_unique(self, unique_validators: Dict[str, UniqueValidator], instances: list, validated: list,
+                        errors: list):
+        """ Checks values of unique fields aren't used by other objects, or by other items, with a query per field. """
+        for name, validator in unique_validators.items():
+            source = self.child.fields[name].source
+            positions = [i for i, attrs in enumerate(validated) if attrs is not None and source in attrs]
+            values = {validated[i][source] for i in positions}
+            used_by = dict(validator.queryset.filter(**{f'{source}__in': values}).values_list(source, 'pk'))
+
+            for i in positions:
+                value = validated[i][source]
+                # New items are given a placeholder pk so they can't share a value with each other
+                pk = instances[i].pk if instances[i] is not None else object()
+
+                if used_by.get(value, pk) != pk:
+                    errors[i].setdefault(name, []).append(validator.message)
+
+                used_by[value] = pk
+
+    def split_relations(self, model, attrs: dict):
+        """ Splits validated data into field values and many-to-many (or reverse foreign key) relations. """
+        fields, relations = {}, {}
+
+        for name, value in attrs.items():
+            field = model._meta.get_field(name)
+            if field.many_to_many or field.one_to_many:
+                relations[name] = value
+            else:
+                fields[name] = value
+
+        return fields, relations
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        instances, relations = [], []
+
+        for attrs in validated_data:
+            fields, related = self.split_relations(model, attrs)
+            instances.append(model(**fields))
+            relations.append(related)
+
+        with transaction.atomic(using=router.db_for_write(model)):
+            bulk_create(model, instances, self.batch_size)
+            related_pks = self.set_relations(model, instances, relations, created=True)
+
+        bulk_saved.send(sender=model, instances=instances, created=True, relations=related_pks, previous={})
+        return instances
+
+    def update(self, instances, validated_data):
+        model = self.child.Meta.model
+        changed_fields, relations, previous = set(), [], {}
+
+        for instance, attrs in zip(instances, validated_data):
+            fields, related = self.split_relations(model, attrs)
+            previous[instance.pk] = {}
+
+            for name, value in fields.items():
+                attname = model._meta.get_field(name).attname
+                previous[instance.pk][attname] = getattr(instance, attname)
+                setattr(instance, name, value)
+
+            changed_fields.update(fields)
+            relations.append(related)
+
+        # bulk_update doesn't update fields like 'updated_on', which save() does
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                for instance in instances:
+                    field.pre_save(instance, add=False)
+                changed_fields.add(field.name)
+
+        with transaction.atomic(using=router.db_for_write(model)):
+            model._default_manager.bulk_update(instances, changed_fields, batch_size=self.batch_size)
+            related_pks = self.set_relations(model, instances, relations, created=False)
+
+        bulk_saved.send(sender=model, instances=instances, created=False, relations=related_pks, previous=previous)
+        return instances
+
+    def set_relations(self, model, instances: list, relations: List[dict], created: bool) -> Dict[str, dict]:
+        """
+        Sets the related objects of many-to-many and reverse foreign key fields. Returns a mapping of field names to the
+        related pks set for each instance.
+        """
+        related_pks = {}
+
+        for name in {name for related in relations for name in related}:
+            field = model._meta.get_field(name)
+            changes = {instance.pk: (instance, related[name]) for instance, related in zip(instances, relations)
+                       if name in related}
+            related_pks[name] = {pk: {obj.pk for obj in objs} for pk, (instance, objs) in changes.items()}
+
+            if field.many_to_many:
+                through = field.remote_field.through
+                source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+
+                if not created:
+                    through.objects.filter(**{f'{source}_id__in': list(changes)}).delete()
+
+                through.objects.bulk_create([through(**{f'{source}_id': pk, f'{target}_id': related_pk})
+                                             for pk, pks in related_pks[name].items() for related_pk in pks],
+                                            batch_size=self.batch_size)
+            else:
+                # Like RelatedManager.set, objects are added to the relation but not removed as the foreign key isn't
+                # nullable
+                foreign_key = field.field
+                related_objects, previous = [], {}
+
+                for instance, objs in changes.values():
+                    for obj in objs:
+                        previous[obj.pk] = {foreign_key.attname: getattr(obj, foreign_key.attname)}
+                        setattr(obj, foreign_key.name, instance)
+                        related_objects.append(obj)
+
+                field.related_model._default_manager.bulk_update(related_objects, [foreign_key.name],
+                                                                 batch_size=self.batch_size)
+                bulk_saved.send(sender=field.related_model, instances=related_objects, created=False, relations={},
+                                previous=previous)
+
+        return related_pks
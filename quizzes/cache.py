@@ -0,0 +1,110 @@
+import hashlib
+import threading
+import uuid
+from typing import Callable, Iterable, Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Model
+
+
+class RepresentationCache:
+    """
+    Caches serialized representations of objects.
+
+    Representations are keyed by the object's model and pk, a version stamp (e.g. its 'updated_on' timestamp), a
+    variant describing anything else the representation depends on (e.g. the serializer used), and a generation token.
+    Each object's generation token is stored in the cache and replaced by 'invalidate', so changes that don't update an
+    object's version stamp (e.g. to its answers or many-to-many relations) still invalidate its cached representations.
+    Version stamps are keyed by their timestamp and variants by their hash, so keys are valid memcached keys (short,
+    without spaces) whatever they contain. Each model also has a generation token for lists of its objects, replaced by
+    'invalidate_lists' whenever objects may leave a list.
+
+    Uses the cache named by the REPRESENTATION_CACHE_ALIAS setting, which is Django's local-memory cache unless CACHES
+    is configured.
+    """
+
+    def __init__(self, alias: str = None, timeout: int = None, prefix: str = 'representation'):
+        self._alias = alias
+        self._timeout = timeout
+        self.prefix = prefix
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[self._alias or settings.REPRESENTATION_CACHE_ALIAS]
+
+    @property
+    def timeout(self) -> int:
+        """ Seconds representations are cached for. Defaults to the REPRESENTATION_CACHE_TIMEOUT setting. """
+        if self._timeout is not None:
+            return self._timeout
+        return settings.REPRESENTATION_CACHE_TIMEOUT
+
+    def get_generation_key(self, model, pk) -> str:
+        return f'{self.prefix}:{model._meta.label_lower}:{pk}:generation'
+
+    def get_generation(self, model, pk) -> str:
+        """ Returns the current generation token of an object, creating one if it doesn't have one. """
+        key = self.get_generation_key(model, pk)
+        generation = self.cache.get(key)
+
+        if generation is None:
+            # Another process may add a token between these calls, so always use whichever token was stored
+            self.cache.add(key, uuid.uuid4().hex, timeout=None)
+            generation = self.cache.get(key)
+
+        return generation
+
+    def get_key(self, instance: Model, version: Any, variant: str) -> str:
+        """ Returns the key of a representation of an object. """
+        generation = self.get_generation(type(instance), instance.pk)
+        version = version.timestamp() if hasattr(version, 'timestamp') else version
+        variant = hashlib.md5(variant.encode()).hexdigest()
+        return f'{self.prefix}:{instance._meta.label_lower}:{instance.pk}:{version}:{generation}:{variant}'
+
+    def get_or_set(self, instance: Model, version: Any, variant: str, build: Callable[[], Any]) -> Any:
+        """ Returns the cached representation of an object, calling 'build' to create and cache it on a miss. """
+        key = self.get_key(instance, version, variant)
+        data = self.cache.get(key)
+
+        if data is None:
+            with self._lock:
+                self.misses += 1
+
+            data = build()
+            self.cache.set(key, data, timeout=self.timeout)
+        else:
+            with self._lock:
+                self.hits += 1
+
+        return data
+
+    def invalidate(self, model, pks: Iterable[int]):
+        """ Invalidates all cached representations of the given objects. """
+        keys = [self.get_generation_key(model, pk) for pk in pks]
+
+        if keys:
+            self.cache.delete_many(keys)
+
+    def get_list_generation(self, model) -> str:
+        """ Returns the current generation token of the lists of a model's objects (see ConditionalGetMixin). """
+        return self.get_generation(model, 'list')
+
+    def invalidate_lists(self, models: Iterable):
+        """ Replaces the generation tokens of the lists of the given models' objects. """
+        self.cache.delete_many([self.get_generation_key(model, 'list') for model in models])
+
+    def stats(self) -> dict:
+        """ Returns the number of cache hits and misses made by this process. """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+representation_cache = RepresentationCache()
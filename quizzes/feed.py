@@ -0,0 +1,104 @@
+"""
+Keeps the summaries of the latest quizzes (the INDEX_LATEST_QUIZ_COUNT most recently created) in the cache, so the home
+feed can be listed without querying the database.
+
+The feed is stored as the rows its summaries are represented from (see quizzes.representations), newest first. It's
+built with a single query when it's read and isn't cached, and kept up to date by signal receivers (see
+quizzes.signals): created and changed quizzes are merged into it, and it's dropped when one of its quizzes is deleted so
+it's rebuilt with the quiz after them. Like representations, it's stored in the cache named by the
+REPRESENTATION_CACHE_ALIAS setting for REPRESENTATION_CACHE_TIMEOUT seconds, which bounds how long changes made without
+signals (or lost to another process updating the feed at the same time) go unseen.
+"""
+import threading
+from typing import Iterable, List
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import INDEX_LATEST_QUIZ_COUNT
+from .models import Quiz
+
+# Fields of the rows summaries are represented from. 'updated_on' isn't included, as it's also set without signals.
+SUMMARY_FIELDS = ('pk', 'name', 'description', 'creator', 'created_on')
+
+
+def get_summary_row(quiz: Quiz) -> dict:
+    """ Returns the row a quiz's summary is represented from, as it would be fetched by `values(*SUMMARY_FIELDS)`. """
+    return {
+        'pk': quiz.pk,
+        'name': quiz.name,
+        'description': quiz.description,
+        'creator': quiz.creator_id,
+        'created_on': quiz.created_on
+    }
+
+
+class LatestQuizzes:
+    """ The cached rows of the latest quizzes' summaries, newest first. """
+
+    def __init__(self, count: int = INDEX_LATEST_QUIZ_COUNT, alias: str = None, timeout: int = None,
+                 key: str = 'latest-quizzes'):
+        self.count = count
+        self._alias = alias
+        self._timeout = timeout
+        self.key = key
+
+        # Serializes updates made by this process, which read the feed and then replace it
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self._alias or settings.REPRESENTATION_CACHE_ALIAS]
+
+    @property
+    def timeout(self) -> int:
+        """ Seconds the feed is cached for. Defaults to the REPRESENTATION_CACHE_TIMEOUT setting. """
+        if self._timeout is not None:
+            return self._timeout
+        return settings.REPRESENTATION_CACHE_TIMEOUT
+
+    def get_rows(self) -> List[dict]:
+        """ Returns the rows of the latest quizzes, building the feed from the database if it isn't cached. """
+        rows = self.cache.get(self.key)
+        return self.build() if rows is None else rows
+
+    def build(self) -> List[dict]:
+        """ Builds the feed from the database and caches it. """
+        rows = list(Quiz.objects.order_by('-created_on', '-pk').values(*SUMMARY_FIELDS)[:self.count])
+        self.cache.set(self.key, rows, timeout=self.timeout)
+        return rows
+
+    def add(self, quizzes: Iterable[Quiz]):
+        """
+        Merges created or changed quizzes into the feed, keeping the latest. Does nothing if the feed isn't cached, as
+        it's built when it's next read.
+        """
+        with self._lock:
+            rows = self.cache.get(self.key)
+
+            if rows is None:
+                return
+
+            # A feed with fewer rows than its count has every quiz, so quizzes older than its last row can only be
+            # dropped from a full feed
+            changed = {quiz.pk: get_summary_row(quiz) for quiz in quizzes}
+            rows = [row for row in rows if row['pk'] not in changed] + list(changed.values())
+            rows.sort(key=lambda row: (row['created_on'], row['pk']), reverse=True)
+            self.cache.set(self.key, rows[:self.count], timeout=self.timeout)
+
+    def remove(self, pks: Iterable[int]):
+        """ Drops the feed if any of the given deleted quizzes are in it, so it's rebuilt without them. """
+        pks = set(pks)
+
+        with self._lock:
+            rows = self.cache.get(self.key)
+
+            if rows is not None and any(row['pk'] in pks for row in rows):
+                self.cache.delete(self.key)
+
+    def clear(self):
+        """ Drops the feed so it's rebuilt when next read. """
+        self.cache.delete(self.key)
+
+
+latest_quizzes = LatestQuizzes()
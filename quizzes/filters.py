@@ -0,0 +1,43 @@
+from typing import Optional
+
+from rest_framework.exceptions import NotAuthenticated, ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class CreatorFilter(BaseFilterBackend):
+    """
+    Filters objects by the id of the user who created them, e.g. `?creator=1`, or `?creator=me` for the user making the
+    request. The user can also be given by the view's 'creator' url kwarg, e.g. `/api/users/1/quizzes/`.
+
+    Objects are filtered by the user's id rather than joined to the user table, so results are found with the index on
+    their creator and pk. The user field is the view's USER_FIELD (see CreateUserLinkedModelMixin).
+
+    This filter must come before FullTextSearchFilter, which may return a union that can't be filtered further.
+    """
+
+    creator_param = 'creator'
+    current_user = 'me'
+
+    def get_creator_id(self, request, view) -> Optional[int]:
+        creator = view.kwargs.get(self.creator_param) or request.query_params.get(self.creator_param)
+
+        if not creator:
+            return None
+
+        if creator == self.current_user:
+            if not request.user.is_authenticated:
+                raise NotAuthenticated()
+            return request.user.pk
+
+        try:
+            return int(creator)
+        except ValueError:
+            raise ValidationError({self.creator_param: [f"Must be a user id or '{self.current_user}'."]})
+
+    def filter_queryset(self, request, queryset, view):
+        creator_id = self.get_creator_id(request, view)
+
+        if creator_id is None:
+            return queryset
+
+        return queryset.filter(**{f"{getattr(view, 'USER_FIELD', 'creator')}_id": creator_id})
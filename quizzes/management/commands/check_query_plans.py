@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from quizzes.filters import CreatorFilter
+from quizzes.models import Tag
+from quizzes.query_plans import capture_queries, FULL_SCAN
+from quizzes.tag_index import tag_index, TagFilter
+from quizzes.urls import router
+
+
+class Command(BaseCommand):
+    help = 'Explains the queries run by list, detail, search, tag and creator filter requests to each viewset, ' \
+           'failing if any does a full scan of a table (see quizzes.query_plans) or doesn\'t succeed. Requires SQLite.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--search', default='test', help="Term searched for (default is 'test').")
+
+    def handle(self, *args, search, verbosity, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"Query plans can only be checked with SQLite, not '{connection.vendor}'")
+
+        # The tag index reads every link once per process, which isn't part of any request
+        tag_index.build()
+        client = Client()
+        full_scans = 0
+        failed_urls = []
+
+        # Requests are made to this process, and nothing they write is kept
+        with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+            for url in self.get_urls(search):
+                responses = []
+                queries = capture_queries(lambda: responses.append(client.get(url)))
+                self.stdout.write(f'{url} ({len(queries)} queries)')
+
+                # The queries of requests that fail (e.g. for objects that don't exist) aren't those being checked
+                if responses[0].status_code != 200:
+                    self.stdout.write(self.style.ERROR(f'    status {responses[0].status_code}'))
+                    failed_urls.append(url)
+                    continue
+
+                for query in queries:
+                    scans = query.find_scans()
+                    full_scans += sum(kind == FULL_SCAN for step, kind in scans)
+
+                    if verbosity > 1 or scans:
+                        self.stdout.write(f'  {query.sql}')
+                        for step in query.plan:
+                            self.stdout.write(f'    {step}')
+                    for step, kind in scans:
+                        style = self.style.ERROR if kind == FULL_SCAN else self.style.WARNING
+                        self.stdout.write(style(f'    {kind}: {step}'))
+
+            transaction.set_rollback(True)
+
+        if failed_urls:
+            raise CommandError(f"{len(failed_urls)} requests didn't succeed, check query plans against a database with "
+                               f"at least one object of each kind: {', '.join(failed_urls)}")
+
+        if full_scans:
+            raise CommandError(f'{full_scans} full scans found')
+
+        self.stdout.write(self.style.SUCCESS('No full scans found'))
+
+    def get_urls(self, search: str):
+        """ Yields the urls of the list, detail, search, tag and creator filter requests of each registered viewset. """
+        tag = Tag.objects.values_list('name', flat=True).first() or 'tag'
+
+        for prefix, viewset, basename in router.registry:
+            pk = viewset.queryset.values_list('pk', flat=True).first() or 1
+
+            yield reverse(f'{basename}-list')
+            yield reverse(f'{basename}-detail', args=[pk])
+
+            if getattr(viewset, 'search_fields', None):
+                yield f"{reverse(f'{basename}-list')}?search={search}"
+            if TagFilter in viewset.filter_backends:
+                yield f"{reverse(f'{basename}-list')}?tags={tag}"
+            if CreatorFilter in viewset.filter_backends:
+                creator = viewset.queryset.exclude(creator=None).values_list('creator', flat=True).first() or 1
+                yield f"{reverse(f'{basename}-list')}?creator={creator}"
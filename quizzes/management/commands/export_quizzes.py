@@ -0,0 +1,36 @@
+import gzip
+import io
+import sys
+import time
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand
+
+from quizzes.transfer import export_rows
+
+
+class Command(BaseCommand):
+    help = 'Exports all quizzes, questions, answers and tags as newline delimited JSON, for use with import_quizzes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-',
+                            help="File to write to, or '-' for stdout (default). Compressed if it ends with '.gz'.")
+        parser.add_argument('--gzip', action='store_true', help='Compress the output with gzip.')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Number of rows fetched per query.')
+
+    def handle(self, *args, path, chunk_size, **options):
+        with ExitStack() as stack:
+            output = sys.stdout.buffer if path == '-' else stack.enter_context(open(path, 'wb'))
+
+            if options['gzip'] or path.endswith('.gz'):
+                output = stack.enter_context(gzip.GzipFile(fileobj=output, mode='wb'))
+
+            stream = io.TextIOWrapper(output, encoding='utf-8')
+            start = time.perf_counter()
+            count = export_rows(stream, chunk_size=chunk_size)
+
+            # Detach (and flush) rather than close the stream, so stdout stays open
+            stream.detach().flush()
+            duration = time.perf_counter() - start
+
+        self.stderr.write(f'Exported {count} rows in {duration:.2f}s ({count / max(duration, 1e-9):.0f} rows/s)')
@@ -0,0 +1,38 @@
+import gzip
+import io
+import sys
+import time
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quizzes.transfer import Importer
+
+
+class Command(BaseCommand):
+    help = 'Imports quizzes, questions, answers and tags exported by export_quizzes, giving them new ids.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to read from, or '-' for stdin. May be compressed with gzip.")
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of rows saved per query.')
+
+    def handle(self, *args, path, batch_size, **options):
+        with ExitStack() as stack:
+            source = sys.stdin.buffer if path == '-' else stack.enter_context(open(path, 'rb'))
+
+            # Compressed files are detected by gzip's magic number
+            if source.peek(2)[:2] == b'\x1f\x8b':
+                source = stack.enter_context(gzip.GzipFile(fileobj=source, mode='rb'))
+
+            stream = io.TextIOWrapper(source, encoding='utf-8')
+            start = time.perf_counter()
+
+            try:
+                count = Importer(batch_size=batch_size).import_rows(stream)
+            except ValueError as e:
+                raise CommandError(f'Nothing was imported. {e}')
+
+            stream.detach()
+            duration = time.perf_counter() - start
+
+        self.stdout.write(f'Imported {count} rows in {duration:.2f}s ({count / max(duration, 1e-9):.0f} rows/s)')
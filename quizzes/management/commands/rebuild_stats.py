@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from quizzes.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = 'Recounts the statistics of every question and quiz from scratch, creating any that are missing. ' \
+           'Attempt counts are kept, as attempts are not stored.'
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        counts = rebuild_stats()
+        duration = time.perf_counter() - start
+
+        self.stdout.write(f"Rebuilt the statistics of {counts['questions']} questions and {counts['quizzes']} quizzes "
+                          f"in {duration:.2f}s")
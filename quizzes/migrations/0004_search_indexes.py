@@ -0,0 +1,160 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+import quizzes.models
+
+# Frozen copies of the statements made by quizzes.search.SearchIndex when this migration was written
+CREATE_SEARCH_INDEXES = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE quizzes_tag_fts USING fts5(name, content='quizzes_tag', content_rowid='id')",
+        "CREATE TRIGGER quizzes_tag_fts_insert AFTER INSERT ON quizzes_tag BEGIN INSERT INTO quizzes_tag_fts(rowid, "
+        "name) VALUES (new.id, new.name); END",
+        "CREATE TRIGGER quizzes_tag_fts_delete AFTER DELETE ON quizzes_tag BEGIN INSERT INTO "
+        "quizzes_tag_fts(quizzes_tag_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+        "CREATE TRIGGER quizzes_tag_fts_update AFTER UPDATE ON quizzes_tag BEGIN INSERT INTO "
+        "quizzes_tag_fts(quizzes_tag_fts, rowid, name) VALUES ('delete', old.id, old.name); INSERT INTO "
+        "quizzes_tag_fts(rowid, name) VALUES (new.id, new.name); END",
+        "INSERT INTO quizzes_tag_fts(quizzes_tag_fts) VALUES ('rebuild')",
+        "CREATE VIRTUAL TABLE quizzes_question_fts USING fts5(text, description, content='quizzes_question', "
+        "content_rowid='id')",
+        "CREATE TRIGGER quizzes_question_fts_insert AFTER INSERT ON quizzes_question BEGIN INSERT INTO "
+        "quizzes_question_fts(rowid, text, description) VALUES (new.id, new.text, new.description); END",
+        "CREATE TRIGGER quizzes_question_fts_delete AFTER DELETE ON quizzes_question BEGIN INSERT INTO "
+        "quizzes_question_fts(quizzes_question_fts, rowid, text, description) VALUES ('delete', old.id, old.text, "
+        "old.description); END",
+        "CREATE TRIGGER quizzes_question_fts_update AFTER UPDATE ON quizzes_question BEGIN INSERT INTO "
+        "quizzes_question_fts(quizzes_question_fts, rowid, text, description) VALUES ('delete', old.id, old.text, "
+        "old.description); INSERT INTO quizzes_question_fts(rowid, text, description) VALUES (new.id, new.text, "
+        "new.description); END",
+        "INSERT INTO quizzes_question_fts(quizzes_question_fts) VALUES ('rebuild')",
+        "CREATE VIRTUAL TABLE quizzes_answer_fts USING fts5(text, content='quizzes_answer', content_rowid='id')",
+        "CREATE TRIGGER quizzes_answer_fts_insert AFTER INSERT ON quizzes_answer BEGIN INSERT INTO "
+        "quizzes_answer_fts(rowid, text) VALUES (new.id, new.text); END",
+        "CREATE TRIGGER quizzes_answer_fts_delete AFTER DELETE ON quizzes_answer BEGIN INSERT INTO "
+        "quizzes_answer_fts(quizzes_answer_fts, rowid, text) VALUES ('delete', old.id, old.text); END",
+        "CREATE TRIGGER quizzes_answer_fts_update AFTER UPDATE ON quizzes_answer BEGIN INSERT INTO "
+        "quizzes_answer_fts(quizzes_answer_fts, rowid, text) VALUES ('delete', old.id, old.text); INSERT INTO "
+        "quizzes_answer_fts(rowid, text) VALUES (new.id, new.text); END",
+        "INSERT INTO quizzes_answer_fts(quizzes_answer_fts) VALUES ('rebuild')",
+        "CREATE VIRTUAL TABLE quizzes_quiz_fts USING fts5(name, description, content='quizzes_quiz', "
+        "content_rowid='id')",
+        "CREATE TRIGGER quizzes_quiz_fts_insert AFTER INSERT ON quizzes_quiz BEGIN INSERT INTO "
+        "quizzes_quiz_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+        "CREATE TRIGGER quizzes_quiz_fts_delete AFTER DELETE ON quizzes_quiz BEGIN INSERT INTO "
+        "quizzes_quiz_fts(quizzes_quiz_fts, rowid, name, description) VALUES ('delete', old.id, old.name, "
+        "old.description); END",
+        "CREATE TRIGGER quizzes_quiz_fts_update AFTER UPDATE ON quizzes_quiz BEGIN INSERT INTO "
+        "quizzes_quiz_fts(quizzes_quiz_fts, rowid, name, description) VALUES ('delete', old.id, old.name, "
+        "old.description); INSERT INTO quizzes_quiz_fts(rowid, name, description) VALUES (new.id, new.name, "
+        "new.description); END",
+        "INSERT INTO quizzes_quiz_fts(quizzes_quiz_fts) VALUES ('rebuild')",
+    ],
+    'postgresql': [
+        "CREATE INDEX quizzes_tag_fts ON quizzes_tag USING GIN (to_tsvector('english', coalesce(name, '')))",
+        "CREATE INDEX quizzes_question_fts ON quizzes_question USING GIN (to_tsvector('english', coalesce(text, '') "
+        "|| ' ' || coalesce(description, '')))",
+        "CREATE INDEX quizzes_answer_fts ON quizzes_answer USING GIN (to_tsvector('english', coalesce(text, '')))",
+        "CREATE INDEX quizzes_quiz_fts ON quizzes_quiz USING GIN (to_tsvector('english', coalesce(name, '') || ' ' "
+        "|| coalesce(description, '')))",
+    ],
+}
+
+DROP_SEARCH_INDEXES = {
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS quizzes_tag_fts_insert",
+        "DROP TRIGGER IF EXISTS quizzes_tag_fts_delete",
+        "DROP TRIGGER IF EXISTS quizzes_tag_fts_update",
+        "DROP TABLE IF EXISTS quizzes_tag_fts",
+        "DROP TRIGGER IF EXISTS quizzes_question_fts_insert",
+        "DROP TRIGGER IF EXISTS quizzes_question_fts_delete",
+        "DROP TRIGGER IF EXISTS quizzes_question_fts_update",
+        "DROP TABLE IF EXISTS quizzes_question_fts",
+        "DROP TRIGGER IF EXISTS quizzes_answer_fts_insert",
+        "DROP TRIGGER IF EXISTS quizzes_answer_fts_delete",
+        "DROP TRIGGER IF EXISTS quizzes_answer_fts_update",
+        "DROP TABLE IF EXISTS quizzes_answer_fts",
+        "DROP TRIGGER IF EXISTS quizzes_quiz_fts_insert",
+        "DROP TRIGGER IF EXISTS quizzes_quiz_fts_delete",
+        "DROP TRIGGER IF EXISTS quizzes_quiz_fts_update",
+        "DROP TABLE IF EXISTS quizzes_quiz_fts",
+    ],
+    'postgresql': [
+        "DROP INDEX IF EXISTS quizzes_tag_fts",
+        "DROP INDEX IF EXISTS quizzes_question_fts",
+        "DROP INDEX IF EXISTS quizzes_answer_fts",
+        "DROP INDEX IF EXISTS quizzes_quiz_fts",
+    ],
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    for sql in CREATE_SEARCH_INDEXES.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    for sql in DROP_SEARCH_INDEXES.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0003_auto_20201126_0229'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagSearchDocument',
+            fields=[
+                ('tag', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='quizzes.tag')),
+                ('document', quizzes.models.FullTextField(db_column='quizzes_tag_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'quizzes_tag_fts',
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='QuestionSearchDocument',
+            fields=[
+                ('question', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='quizzes.question')),
+                ('document', quizzes.models.FullTextField(db_column='quizzes_question_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'quizzes_question_fts',
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='AnswerSearchDocument',
+            fields=[
+                ('answer', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='quizzes.answer')),
+                ('document', quizzes.models.FullTextField(db_column='quizzes_answer_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'quizzes_answer_fts',
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='QuizSearchDocument',
+            fields=[
+                ('quiz', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='quizzes.quiz')),
+                ('document', quizzes.models.FullTextField(db_column='quizzes_quiz_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'quizzes_quiz_fts',
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
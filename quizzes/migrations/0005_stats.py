@@ -0,0 +1,84 @@
+# Generated by Django 3.1.6 on 2026-10-18 20:24
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+# Frozen copies of the expressions quizzes.stats recounted statistics with when this migration was written
+def _subquery(queryset, aggregate):
+    return Coalesce(Subquery(queryset.annotate(value=aggregate).values('value'), output_field=IntegerField()), 0)
+
+
+def get_question_counts(Answer):
+    answers = Answer._default_manager.filter(question=OuterRef('question')).order_by().values('question')
+
+    return {
+        'answer_count': _subquery(answers, Count('pk')),
+        'correct_answer_count': _subquery(answers.filter(is_correct_answer=True), Count('pk')),
+        'vote_count': _subquery(answers, Sum('votes'))
+    }
+
+
+def get_quiz_counts(QuizQuestion):
+    links = QuizQuestion._default_manager.filter(quiz=OuterRef('quiz')).order_by().values('quiz')
+
+    return {
+        'question_count': _subquery(links, Count('pk')),
+        'answer_count': _subquery(links, Sum('question__stats__answer_count')),
+        'correct_answer_count': _subquery(links, Sum('question__stats__correct_answer_count')),
+        'vote_count': _subquery(links, Sum('question__stats__vote_count'))
+    }
+
+
+def create_stats(apps, schema_editor):
+    Question, Quiz, Answer = (apps.get_model('quizzes', name) for name in ('Question', 'Quiz', 'Answer'))
+    QuestionStats, QuizStats = apps.get_model('quizzes', 'QuestionStats'), apps.get_model('quizzes', 'QuizStats')
+
+    QuestionStats.objects.bulk_create([QuestionStats(question_id=pk)
+                                       for pk in Question.objects.values_list('pk', flat=True)])
+    QuizStats.objects.bulk_create([QuizStats(quiz_id=pk) for pk in Quiz.objects.values_list('pk', flat=True)])
+    QuestionStats.objects.update(**get_question_counts(Answer))
+    QuizStats.objects.update(**get_quiz_counts(Quiz.questions.through))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0004_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionStats',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='quizzes.question')),
+                ('answer_count', models.IntegerField(default=0)),
+                ('correct_answer_count', models.IntegerField(default=0)),
+                ('vote_count', models.IntegerField(default=0, help_text="Total number of votes for this question's answers.")),
+                ('attempt_count', models.IntegerField(default=0, help_text='Number of attempts at quizzes with this question.')),
+                ('correct_attempt_count', models.IntegerField(default=0, help_text='Number of attempts that answered this question correctly.')),
+            ],
+            options={
+                'verbose_name_plural': 'Question stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='QuizStats',
+            fields=[
+                ('quiz', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='quizzes.quiz')),
+                ('question_count', models.IntegerField(default=0)),
+                ('answer_count', models.IntegerField(default=0)),
+                ('correct_answer_count', models.IntegerField(default=0)),
+                ('vote_count', models.IntegerField(default=0, help_text="Total number of votes for answers to this quiz's questions.")),
+                ('attempt_count', models.IntegerField(default=0)),
+                ('perfect_attempt_count', models.IntegerField(default=0, help_text='Number of attempts that answered every question correctly.')),
+                ('total_score', models.IntegerField(default=0, help_text='Sum of the scores of every attempt.')),
+            ],
+            options={
+                'verbose_name_plural': 'Quiz stats',
+            },
+        ),
+        migrations.RunPython(create_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,145 @@
+# Generated by Django 3.1.6 on 2026-10-18 20:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Frozen copies of the statements made by quizzes.search.SearchIndex when this migration was written
+CREATE_SEARCH_INDEXES = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE quizzes_question_fts USING fts5(text, description, content='quizzes_question', "
+        "content_rowid='id')",
+        "CREATE TRIGGER quizzes_question_fts_insert AFTER INSERT ON quizzes_question BEGIN INSERT INTO "
+        "quizzes_question_fts(rowid, text, description) VALUES (new.id, new.text, new.description); END",
+        "CREATE TRIGGER quizzes_question_fts_delete AFTER DELETE ON quizzes_question BEGIN INSERT INTO "
+        "quizzes_question_fts(quizzes_question_fts, rowid, text, description) VALUES ('delete', old.id, old.text, "
+        "old.description); END",
+        "CREATE TRIGGER quizzes_question_fts_update AFTER UPDATE ON quizzes_question BEGIN INSERT INTO "
+        "quizzes_question_fts(quizzes_question_fts, rowid, text, description) VALUES ('delete', old.id, old.text, "
+        "old.description); INSERT INTO quizzes_question_fts(rowid, text, description) VALUES (new.id, new.text, "
+        "new.description); END",
+        "INSERT INTO quizzes_question_fts(quizzes_question_fts) VALUES ('rebuild')",
+        "CREATE VIRTUAL TABLE quizzes_answer_fts USING fts5(text, content='quizzes_answer', content_rowid='id')",
+        "CREATE TRIGGER quizzes_answer_fts_insert AFTER INSERT ON quizzes_answer BEGIN INSERT INTO "
+        "quizzes_answer_fts(rowid, text) VALUES (new.id, new.text); END",
+        "CREATE TRIGGER quizzes_answer_fts_delete AFTER DELETE ON quizzes_answer BEGIN INSERT INTO "
+        "quizzes_answer_fts(quizzes_answer_fts, rowid, text) VALUES ('delete', old.id, old.text); END",
+        "CREATE TRIGGER quizzes_answer_fts_update AFTER UPDATE ON quizzes_answer BEGIN INSERT INTO "
+        "quizzes_answer_fts(quizzes_answer_fts, rowid, text) VALUES ('delete', old.id, old.text); INSERT INTO "
+        "quizzes_answer_fts(rowid, text) VALUES (new.id, new.text); END",
+        "INSERT INTO quizzes_answer_fts(quizzes_answer_fts) VALUES ('rebuild')",
+        "CREATE VIRTUAL TABLE quizzes_quiz_fts USING fts5(name, description, content='quizzes_quiz', "
+        "content_rowid='id')",
+        "CREATE TRIGGER quizzes_quiz_fts_insert AFTER INSERT ON quizzes_quiz BEGIN INSERT INTO "
+        "quizzes_quiz_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+        "CREATE TRIGGER quizzes_quiz_fts_delete AFTER DELETE ON quizzes_quiz BEGIN INSERT INTO "
+        "quizzes_quiz_fts(quizzes_quiz_fts, rowid, name, description) VALUES ('delete', old.id, old.name, "
+        "old.description); END",
+        "CREATE TRIGGER quizzes_quiz_fts_update AFTER UPDATE ON quizzes_quiz BEGIN INSERT INTO "
+        "quizzes_quiz_fts(quizzes_quiz_fts, rowid, name, description) VALUES ('delete', old.id, old.name, "
+        "old.description); INSERT INTO quizzes_quiz_fts(rowid, name, description) VALUES (new.id, new.name, "
+        "new.description); END",
+        "INSERT INTO quizzes_quiz_fts(quizzes_quiz_fts) VALUES ('rebuild')",
+    ],
+    'postgresql': [
+        "CREATE INDEX quizzes_question_fts ON quizzes_question USING GIN (to_tsvector('english', coalesce(text, '') "
+        "|| ' ' || coalesce(description, '')))",
+        "CREATE INDEX quizzes_answer_fts ON quizzes_answer USING GIN (to_tsvector('english', coalesce(text, '')))",
+        "CREATE INDEX quizzes_quiz_fts ON quizzes_quiz USING GIN (to_tsvector('english', coalesce(name, '') || ' ' "
+        "|| coalesce(description, '')))",
+    ],
+}
+
+DROP_SEARCH_INDEXES = {
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS quizzes_question_fts_insert",
+        "DROP TRIGGER IF EXISTS quizzes_question_fts_delete",
+        "DROP TRIGGER IF EXISTS quizzes_question_fts_update",
+        "DROP TABLE IF EXISTS quizzes_question_fts",
+        "DROP TRIGGER IF EXISTS quizzes_answer_fts_insert",
+        "DROP TRIGGER IF EXISTS quizzes_answer_fts_delete",
+        "DROP TRIGGER IF EXISTS quizzes_answer_fts_update",
+        "DROP TABLE IF EXISTS quizzes_answer_fts",
+        "DROP TRIGGER IF EXISTS quizzes_quiz_fts_insert",
+        "DROP TRIGGER IF EXISTS quizzes_quiz_fts_delete",
+        "DROP TRIGGER IF EXISTS quizzes_quiz_fts_update",
+        "DROP TABLE IF EXISTS quizzes_quiz_fts",
+    ],
+    'postgresql': [
+        "DROP INDEX IF EXISTS quizzes_question_fts",
+        "DROP INDEX IF EXISTS quizzes_answer_fts",
+        "DROP INDEX IF EXISTS quizzes_quiz_fts",
+    ],
+}
+
+
+def recreate_search_indexes(apps, schema_editor):
+    # Altering fields rebuilds tables on SQLite, which drops the triggers that keep their full-text indexes up to date
+    vendor = schema_editor.connection.vendor
+
+    for sql in DROP_SEARCH_INDEXES.get(vendor, []) + CREATE_SEARCH_INDEXES.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('quizzes', '0005_stats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='answer',
+            name='creator',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='answer',
+            name='question',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='quizzes.question'),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='creator',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='quiz',
+            name='creator',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['creator', 'id'], name='answer_creator_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['question', 'is_correct_answer'], name='answer_question_correct_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['creator', 'id'], name='question_creator_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['created_on'], name='question_created_on_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['updated_on'], name='question_updated_on_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['creator', 'id'], name='quiz_creator_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['created_on', 'id'], name='quiz_created_on_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['updated_on'], name='quiz_updated_on_idx'),
+        ),
+        migrations.RunPython(recreate_search_indexes, recreate_search_indexes),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.1.6 on 2026-10-18 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0006_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='quiz',
+            name='quiz_creator_idx',
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['creator', 'created_on', 'id'], name='quiz_creator_created_on_idx'),
+        ),
+    ]
@@ -1,6 +1,27 @@
+import hashlib
+import operator
+from functools import reduce
+from typing import Optional
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import prefetch_related_objects, BooleanField, ExpressionWrapper, Max, Q
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.mixins import CreateModelMixin
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import GenericViewSet
 
+from quizzes.bulk import resolve_url
+from quizzes.cache import representation_cache
+from quizzes.representations import ValuesRepresentation
+from quizzes.stats import create_stats
+
 
 class CreateUserLinkedModelMixin(CreateModelMixin, GenericViewSet):
     """
@@ -20,3 +41,359 @@ class CreateUserLinkedModelMixin(CreateModelMixin, GenericViewSet):
             save_kwargs[self.USER_FIELD] = self.request.user
 
         serializer.save(**save_kwargs)
+
+
+class RelatedQuerySetMixin(GenericViewSet):
+    """
+    Apply the related lookups a serializer needs to the queryset so related objects aren't fetched once per row.
+
+    Usage:
+        Set `select_related` and/or `prefetch_related` on the serializer's Meta class to the lookups that should be
+        passed to `QuerySet.select_related` and `QuerySet.prefetch_related` respectively. Make sure to call the super
+        'get_queryset' method if you override it.
+    """
+
+    def get_select_related(self):
+        return getattr(getattr(self.get_serializer_class(), 'Meta', None), 'select_related', ())
+
+    def get_prefetch_related(self):
+        return getattr(getattr(self.get_serializer_class(), 'Meta', None), 'prefetch_related', ())
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select_related = self.get_select_related()
+        prefetch_related = self.get_prefetch_related()
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+
+        return queryset
+
+
+class ValuesRepresentationMixin(RelatedQuerySetMixin):
+    """
+    Represent the objects returned by the list and retrieve actions from rows fetched with `QuerySet.values()` rather
+    than with the serializer, which is several times faster. Responses are the same (see quizzes.representations).
+
+    Usage:
+        Use with a HyperlinkedModelSerializer. Fields other than model fields and hyperlinks need a
+        `get_<field name>_from_values` method on the serializer, which returns the field's value given an object's row
+        (including any annotations). If the serializer has other fields, objects are represented by the serializer.
+    """
+
+    def get_values_representation(self, serializer=None) -> Optional[ValuesRepresentation]:
+        return ValuesRepresentation.for_serializer(serializer or self.get_serializer())
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        representation = self.get_values_representation()
+
+        # Rows of combined queries (e.g. search results) can't be fetched with values()
+        if representation is None or queryset.query.combinator:
+            return super().list(request, *args, **kwargs)
+
+        rows = representation.get_values(queryset)
+        page = self.paginate_queryset(rows)
+
+        if page is not None:
+            return self.get_paginated_response(representation.represent(page))
+
+        return Response(representation.represent(list(rows)))
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.get_retrieve_representation(self.get_object_without_prefetching()))
+
+    def get_retrieve_representation(self, instance):
+        """ Returns the representation of an object returned by the retrieve action. """
+        return self.get_object_representation(instance)
+
+    def get_object_without_prefetching(self):
+        """ Returns the object the view is displaying, like 'get_object', but without prefetching related objects. """
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        instance = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, instance)
+        return instance
+
+    def get_object_representation(self, instance, context: dict = None):
+        """ Returns the representation of an object, prefetching its related objects if it needs the serializer. """
+        serializer = self.get_serializer(instance, context=context or self.get_serializer_context())
+        representation = self.get_values_representation(serializer)
+
+        if representation is not None:
+            return representation.represent_instance(instance)
+
+        prefetch_related_objects([instance], *self.get_prefetch_related())
+        return serializer.data
+
+
+class CachedRetrieveMixin(ValuesRepresentationMixin):
+    """
+    Cache the representations of objects returned by the retrieve action.
+
+    On a cache hit only the object itself is fetched (to check it exists, check permissions and read its version),
+    related objects are only prefetched when its representation needs to be built.
+
+    Usage:
+        Set the VERSION_FIELD class attribute to the name of a field that changes whenever the object is saved (default
+        is 'updated_on'). Changes that don't update this field (e.g. to related objects) must invalidate the object's
+        representations via 'representation_cache.invalidate' (see quizzes.signals).
+    """
+    VERSION_FIELD = 'updated_on'
+
+    def get_retrieve_representation(self, instance):
+        return self.get_cached_representation(instance)
+
+    def get_cached_representation(self, instance, variant: str = '', context: dict = None):
+        """
+        Returns the cached representation of an object, serializing it if it isn't cached. The variant must describe
+        anything in the given serializer context that changes the representation.
+        """
+        def build():
+            return self.get_object_representation(instance, context)
+
+        # Hyperlinks depend on the host the request was made to
+        variant = f'{self.get_serializer_class().__name__}:{self.request.build_absolute_uri("/")}:{variant}'
+        return representation_cache.get_or_set(instance, getattr(instance, self.VERSION_FIELD), variant, build)
+
+
+class ConditionalGetMixin(ValuesRepresentationMixin):
+    """
+    Add ETag and Last-Modified headers to the responses of the list and retrieve actions, and respond to conditional
+    requests for representations the client already has with 304 Not Modified before any objects are represented.
+
+    Validators are derived from the LAST_MODIFIED_FIELD of objects, which must change whenever an object's
+    representation does, including when related objects change (see quizzes.signals.touch). The ETags of lists are
+    derived from their latest modification, found with a single MAX (an index seek), and the generation token of the
+    model's lists, which must be replaced whenever objects may leave a list, e.g. when they are deleted (see
+    'representation_cache.invalidate_lists'). Lists are only validated by their ETag, as their Last-Modified time
+    doesn't change when objects are removed from them.
+
+    Usage:
+        Set the LAST_MODIFIED_FIELD class attribute to the name of the objects' last modified timestamp (default is
+        'updated_on'). Override 'get_validation_queryset' to leave out annotations that aren't needed to filter a list,
+        as they make finding its latest modification slower.
+    """
+    LAST_MODIFIED_FIELD = 'updated_on'
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_validation_queryset())
+
+        # Combined queries (e.g. search results) can't be aggregated
+        if queryset.query.combinator:
+            return super().list(request, *args, **kwargs)
+
+        last_modified = queryset.order_by().aggregate(last_modified=Max(self.LAST_MODIFIED_FIELD))['last_modified']
+        etag = self.get_etag(last_modified, representation_cache.get_list_generation(queryset.model))
+
+        return self.get_conditional_response(etag, last_modified, validate_last_modified=False,
+                                             get_response=lambda: super(ConditionalGetMixin, self).list(request))
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object_without_prefetching()
+        last_modified = getattr(instance, self.LAST_MODIFIED_FIELD)
+
+        return self.get_conditional_response(self.get_etag(last_modified), last_modified,
+                                             get_response=lambda: Response(self.get_retrieve_representation(instance)))
+
+    def get_validation_queryset(self):
+        """ Returns the queryset the validators of lists are found from, before it's filtered. """
+        return self.get_queryset()
+
+    def get_etag(self, *values) -> str:
+        """ Returns an ETag for the representation of the requested url with the given validators. """
+        request = self.request
+        key = (request.build_absolute_uri(), request.accepted_media_type, request.user.pk, *values)
+        return quote_etag(hashlib.md5(repr(key).encode()).hexdigest())
+
+    def get_conditional_response(self, etag: str, last_modified, get_response, validate_last_modified: bool = True):
+        """
+        Returns 304 Not Modified if the request's preconditions match the given validators, otherwise the response
+        returned by 'get_response'. Both have the validators set in their headers.
+        """
+        timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+        response = get_conditional_response(self.request, etag=etag,
+                                            last_modified=timestamp if validate_last_modified else None)
+
+        if response is None:
+            response = get_response()
+
+        response['ETag'] = etag
+
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+
+        return response
+
+
+class StatsMixin(GenericViewSet):
+    """
+    Add a 'stats' action that returns the statistics of an object, which are kept in a model with a one-to-one primary
+    key to the object's model named 'stats' in reverse (see quizzes.stats). Statistics are read with a single query
+    (plus any the serializer makes), without fetching the object separately.
+
+    Usage:
+        Set the 'stats_serializer_class' class attribute to a serializer of the statistics model.
+    """
+    stats_serializer_class = None
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, *args, **kwargs):
+        """ Returns aggregate statistics about this object. """
+        serializer_class = self.stats_serializer_class
+        model = serializer_class.Meta.model
+        field = model._meta.pk
+        pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        queryset = model._default_manager.select_related(field.name)
+
+        try:
+            stats = get_object_or_404(queryset, pk=pk)
+        except Http404:
+            # Statistics are created with their objects, but are missing if objects were created without signals
+            instance = self.get_object()
+            create_stats(type(instance), [instance.pk])
+            stats = queryset.get(pk=instance.pk)
+
+        self.check_object_permissions(request, getattr(stats, field.name))
+        return Response(serializer_class(stats, context=self.get_serializer_context()).data)
+
+
+class BulkModelMixin(RelatedQuerySetMixin):
+    """
+    Create, update or delete many objects with a single request by sending a list to the list endpoint.
+
+    Objects are created by posting a list of objects, e.g. `[{"name": "a"}, {"name": "b"}]` to `/api/tags/`. They are
+    updated (PUT or PATCH) by sending a list of objects with their urls, e.g. `[{"url": ".../api/tags/1/", "name":
+    "c"}]`, and deleted by sending a list of their urls. Every object is validated before any are saved, if any are
+    invalid a list is returned with the errors (if any) of each object.
+
+    Usage:
+        Set `list_serializer_class` on the serializer's Meta class to BulkListSerializer and register the viewset with
+        BulkRouter. Set the BULK_MAX_ITEMS class attribute to the maximum number of objects a request can contain
+        (default is 10000). Override 'perform_bulk_update' and 'perform_bulk_destroy' to customise saving and deleting.
+    """
+    BULK_MAX_ITEMS = 10000
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=self.get_bulk_data(), many=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+
+        # Created objects have no related objects cached, so fetch them for the whole list at once
+        prefetch_related_objects(serializer.instance, *self.get_prefetch_related())
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        data = self.get_bulk_data()
+        instances = self.get_bulk_objects([item.get('url') if isinstance(item, dict) else None for item in data])
+
+        serializer = self.get_serializer(instances, data=data, many=True, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_bulk_update(serializer)
+
+        # Fetch the objects again as annotations and related objects may have changed
+        updated = self.get_queryset().in_bulk([instance.pk for instance in instances])
+        serializer = self.get_serializer([updated[instance.pk] for instance in instances], many=True)
+        return Response(serializer.data)
+
+    def bulk_partial_update(self, request, *args, **kwargs):
+        kwargs['partial'] = True
+        return self.bulk_update(request, *args, **kwargs)
+
+    def bulk_destroy(self, request, *args, **kwargs):
+        data = self.get_bulk_data()
+        instances = self.get_bulk_objects([item.get('url') if isinstance(item, dict) else item for item in data])
+        self.perform_bulk_destroy(instances)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def perform_bulk_update(self, serializer):
+        serializer.save()
+
+    def perform_bulk_destroy(self, instances):
+        self.get_queryset().model._default_manager.filter(pk__in=[instance.pk for instance in instances]).delete()
+
+    def get_bulk_data(self) -> list:
+        """ Returns the list of objects sent with the request. """
+        data = self.request.data
+
+        if not isinstance(data, list):
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ['Expected a list of items.']})
+
+        if len(data) > self.BULK_MAX_ITEMS:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [f'Ensure this list has no more than {self.BULK_MAX_ITEMS} items.']
+            })
+
+        return data
+
+    def get_bulk_objects(self, urls: list) -> list:
+        """
+        Returns the objects with the given urls, in the same order, checking the user may act on each of them. Raises a
+        ValidationError with a list of errors for each url if any don't match an object.
+        """
+        pks = [self.get_pk_from_url(url) for url in urls]
+        queryset = self.get_queryset().prefetch_related(None)
+        permission_filter = self.get_permission_filter()
+
+        # Whether the user may act on each object is found by the same query that fetches them
+        if permission_filter is not None:
+            queryset = queryset.annotate(has_permission=ExpressionWrapper(permission_filter, BooleanField()))
+
+        objects = queryset.in_bulk({pk for pk in pks if pk is not None})
+        errors = []
+
+        for pk in pks:
+            if pk is None:
+                errors.append({'url': ['Invalid hyperlink - No URL match.']})
+            elif pk not in objects:
+                errors.append({'url': ['Invalid hyperlink - Object does not exist.']})
+            else:
+                errors.append({})
+
+        if any(errors):
+            raise ValidationError(errors)
+
+        instances = [objects[pk] for pk in pks]
+
+        for instance in instances:
+            if permission_filter is not None and not instance.has_permission:
+                self.permission_denied(self.request)
+
+            # Permissions that filter querysets have already been checked
+            for permission in self.get_permissions():
+                if not hasattr(permission, 'get_queryset_filter') \
+                        and not permission.has_object_permission(self.request, self, instance):
+                    self.permission_denied(self.request, message=getattr(permission, 'message', None),
+                                           code=getattr(permission, 'code', None))
+
+        return instances
+
+    def get_permission_filter(self) -> Optional[Q]:
+        """
+        Returns a filter matching the objects the user may act on, combining the filters of the permissions with a
+        'get_queryset_filter' method (see IsCreatorOrAdminUserOrReadOnly), or None if none of them restrict objects.
+        """
+        filters = [permission.get_queryset_filter(self.request, self) for permission in self.get_permissions()
+                   if hasattr(permission, 'get_queryset_filter')]
+        filters = [permission_filter for permission_filter in filters if permission_filter is not None]
+        return reduce(operator.and_, filters) if filters else None
+
+    def get_pk_from_url(self, url):
+        """ Returns the pk in the given url to this viewset's detail view, or None if it isn't one. """
+        match = resolve_url(url)
+
+        if match is None or match.url_name != f'{self.basename}-detail':
+            return None
+
+        try:
+            lookup_value = match.kwargs[self.lookup_url_kwarg or self.lookup_field]
+            return self.get_queryset().model._meta.pk.to_python(lookup_value)
+        except (KeyError, DjangoValidationError):
+            return None
@@ -1,9 +1,47 @@
+from collections import Counter
+from typing import Iterable, Mapping, NamedTuple, List, Set
+
 from django.contrib.sessions.models import Session
 from django.db import models
+from django.db.models import F, Case, When, Value, Lookup
 
 from testme.settings import AUTH_USER_MODEL
 
 
+class FullTextField(models.TextField):
+    """
+    The hidden column of an SQLite FTS5 table that has the same name as the table. Supports the 'match' lookup, which
+    matches rows against a full-text query.
+    """
+    pass
+
+
+@FullTextField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class AbstractSearchDocument(models.Model):
+    """
+    A row of an SQLite FTS5 table indexing another table (see quizzes.search). The 'rank' of a row is only available
+    when filtering by 'document__match', and is lower for better matches.
+
+    Subclasses must set the db_table and add a OneToOneField named after the indexed model, with primary_key=True,
+    db_column='rowid' and related_name='search_document'.
+    """
+    document = FullTextField()
+    rank = models.FloatField()
+
+    class Meta:
+        abstract = True
+        managed = False
+
+
 class AbstractTimestampedModel(models.Model):
     created_on = models.DateTimeField(auto_now_add=True)
     updated_on = models.DateTimeField(auto_now=True)
@@ -20,11 +58,19 @@ class Tag(models.Model):
 
 
 class Question(AbstractTimestampedModel):
-    creator = models.ForeignKey(AUTH_USER_MODEL, on_delete=models.CASCADE, null=True)
+    # Creators are indexed with pks by Meta.indexes
+    creator = models.ForeignKey(AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, db_index=False)
     text = models.CharField(max_length=255)
     description = models.TextField(help_text="Any additional details related to this question", blank=True)
     tags = models.ManyToManyField(Tag, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['creator', 'id'], name='question_creator_idx'),
+            models.Index(fields=['created_on'], name='question_created_on_idx'),
+            models.Index(fields=['updated_on'], name='question_updated_on_idx'),
+        ]
+
     def __str__(self):
         return self.text
 
@@ -32,29 +78,214 @@ class Question(AbstractTimestampedModel):
         """
         Returns True if this question is multiple choice (a question is multiple choice if it has multiple correct
         answers.
+
+        Uses the 'correct_answer_count' annotation or prefetched answers if this question was fetched with either,
+        otherwise the number of correct answers is queried.
+        """
+        correct_answer_count = getattr(self, 'correct_answer_count', None)
+
+        if correct_answer_count is None:
+            if 'answers' in getattr(self, '_prefetched_objects_cache', {}):
+                correct_answer_count = sum(answer.is_correct_answer for answer in self.answers.all())
+            else:
+                correct_answer_count = self.answers.filter(is_correct_answer=True).count()
+
+        return correct_answer_count > 1
+
+
+class AnswerManager(models.Manager):
+
+    def add_votes(self, votes: Mapping[int, int]) -> int:
+        """
+        Adds votes to answers given a mapping of answer ids to the number of votes to add to each answer. Returns the
+        number of answers updated.
+
+        Votes are added in the database (i.e. 'SET votes = votes + n') by a single UPDATE rather than read, modified and
+        then saved, so concurrent calls never lose votes. The UPDATE has up to three parameters per answer, so the
+        votes of many answers should be added in batches (see quizzes.votes.get_batch_size).
         """
-        return self.answers.filter(is_correct_answer=True).count() > 1
+        votes = {answer_id: increment for answer_id, increment in votes.items() if increment}
+
+        if not votes:
+            return 0
+
+        increments = set(votes.values())
+
+        if len(increments) == 1:
+            increment = Value(increments.pop())
+        else:
+            whens = [When(pk=answer_id, then=Value(increment)) for answer_id, increment in votes.items()]
+            increment = Case(*whens, default=Value(0), output_field=models.IntegerField())
+
+        return self.filter(pk__in=votes.keys()).update(votes=F('votes') + increment)
+
+    def vote(self, answer_ids: Iterable[int]) -> int:
+        """ Adds one vote to each of the given answers. Answers appearing more than once receive more than one vote. """
+        return self.add_votes(Counter(answer_ids))
 
 
 class Answer(models.Model):
-    creator = models.ForeignKey(AUTH_USER_MODEL, on_delete=models.CASCADE, null=True)
-    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='answers')
+    # Creators and questions are indexed with other columns by Meta.indexes
+    creator = models.ForeignKey(AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, db_index=False)
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='answers', db_index=False)
     text = models.CharField(max_length=255)
     votes = models.IntegerField(default=0, editable=False, help_text="Number of times this answer has been chosen.")
     is_correct_answer = models.BooleanField(default=False, help_text="Whether or not this answer is correct.")
 
+    objects = AnswerManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['creator', 'id'], name='answer_creator_idx'),
+            models.Index(fields=['question', 'is_correct_answer'], name='answer_question_correct_idx'),
+        ]
+
     def __str__(self):
         return self.text
 
 
+class QuestionResult(NamedTuple):
+    """ The result of answering a question. """
+    question_id: int
+    chosen_answer_ids: Set[int]
+    correct_answer_ids: Set[int]
+
+    @property
+    def is_multiple_choice(self) -> bool:
+        return len(self.correct_answer_ids) > 1
+
+    @property
+    def is_correct(self) -> bool:
+        """
+        Returns True if exactly the correct answers were chosen, i.e. the correct answer of a single choice question or
+        all the correct answers (and no incorrect answers) of a multiple choice question.
+        """
+        return self.chosen_answer_ids == self.correct_answer_ids
+
+
 class Quiz(AbstractTimestampedModel):
-    creator = models.ForeignKey(AUTH_USER_MODEL, on_delete=models.CASCADE, null=True)
+    # Creators are indexed with creation times and pks by Meta.indexes, the order a creator's quizzes are listed in
+    creator = models.ForeignKey(AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, db_index=False)
     name = models.CharField(max_length=255)
     description = models.TextField(help_text="Any additional details related to this quiz", blank=True)
     questions = models.ManyToManyField(Question, blank=True)
 
     class Meta:
         verbose_name_plural = 'Quizzes'
+        indexes = [
+            models.Index(fields=['creator', 'created_on', 'id'], name='quiz_creator_created_on_idx'),
+            models.Index(fields=['created_on', 'id'], name='quiz_created_on_idx'),
+            models.Index(fields=['updated_on'], name='quiz_updated_on_idx'),
+        ]
 
     def __str__(self):
         return self.name
+
+    def grade(self, answer_ids: Iterable[int]) -> List[QuestionResult]:
+        """
+        Grades an attempt at this quiz given the ids of the chosen answers. Returns a result for each question in this
+        quiz, ordered by question id.
+
+        Runs a single query regardless of the number of questions. Raises a ValueError if any of the given answers don't
+        belong to a question in this quiz.
+        """
+        rows = Question.objects.filter(quiz=self).order_by('pk', 'answers__pk') \
+            .values_list('pk', 'answers__pk', 'answers__is_correct_answer')
+
+        correct_answer_ids = {}
+        question_ids = {}
+
+        for question_id, answer_id, is_correct_answer in rows:
+            correct_answer_ids.setdefault(question_id, set())
+
+            if answer_id is not None:
+                question_ids[answer_id] = question_id
+
+                if is_correct_answer:
+                    correct_answer_ids[question_id].add(answer_id)
+
+        answer_ids = set(answer_ids)
+        invalid = sorted(answer_ids - question_ids.keys())
+
+        if invalid:
+            raise ValueError(f"Invalid answer ids {invalid} - answers do not belong to this quiz.")
+
+        chosen_answer_ids = {question_id: set() for question_id in correct_answer_ids}
+
+        for answer_id in answer_ids:
+            chosen_answer_ids[question_ids[answer_id]].add(answer_id)
+
+        return [QuestionResult(question_id, chosen_answer_ids[question_id], correct)
+                for question_id, correct in correct_answer_ids.items()]
+
+
+class QuestionStats(models.Model):
+    """
+    Aggregate statistics about a question, kept up to date as its answers, their votes and attempts at quizzes with
+    the question change (see quizzes.stats).
+    """
+    question = models.OneToOneField(Question, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    answer_count = models.IntegerField(default=0)
+    correct_answer_count = models.IntegerField(default=0)
+    vote_count = models.IntegerField(default=0, help_text="Total number of votes for this question's answers.")
+    attempt_count = models.IntegerField(default=0, help_text="Number of attempts at quizzes with this question.")
+    correct_attempt_count = models.IntegerField(default=0,
+                                                help_text="Number of attempts that answered this question correctly.")
+
+    class Meta:
+        verbose_name_plural = 'Question stats'
+
+
+class QuizStats(models.Model):
+    """
+    Aggregate statistics about a quiz, kept up to date as its questions, their answers and votes and attempts at the
+    quiz change (see quizzes.stats).
+    """
+    quiz = models.OneToOneField(Quiz, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    question_count = models.IntegerField(default=0)
+    answer_count = models.IntegerField(default=0)
+    correct_answer_count = models.IntegerField(default=0)
+    vote_count = models.IntegerField(default=0, help_text="Total number of votes for answers to this quiz's questions.")
+    attempt_count = models.IntegerField(default=0)
+    perfect_attempt_count = models.IntegerField(default=0,
+                                                help_text="Number of attempts that answered every question correctly.")
+    total_score = models.IntegerField(default=0, help_text="Sum of the scores of every attempt.")
+
+    class Meta:
+        verbose_name_plural = 'Quiz stats'
+
+
+class TagSearchDocument(AbstractSearchDocument):
+    tag = models.OneToOneField(Tag, primary_key=True, db_column='rowid', on_delete=models.DO_NOTHING,
+                               related_name='search_document')
+    document = FullTextField(db_column='quizzes_tag_fts')
+
+    class Meta(AbstractSearchDocument.Meta):
+        db_table = 'quizzes_tag_fts'
+
+
+class QuestionSearchDocument(AbstractSearchDocument):
+    question = models.OneToOneField(Question, primary_key=True, db_column='rowid', on_delete=models.DO_NOTHING,
+                                    related_name='search_document')
+    document = FullTextField(db_column='quizzes_question_fts')
+
+    class Meta(AbstractSearchDocument.Meta):
+        db_table = 'quizzes_question_fts'
+
+
+class AnswerSearchDocument(AbstractSearchDocument):
+    answer = models.OneToOneField(Answer, primary_key=True, db_column='rowid', on_delete=models.DO_NOTHING,
+                                  related_name='search_document')
+    document = FullTextField(db_column='quizzes_answer_fts')
+
+    class Meta(AbstractSearchDocument.Meta):
+        db_table = 'quizzes_answer_fts'
+
+
+class QuizSearchDocument(AbstractSearchDocument):
+    quiz = models.OneToOneField(Quiz, primary_key=True, db_column='rowid', on_delete=models.DO_NOTHING,
+                                related_name='search_document')
+    document = FullTextField(db_column='quizzes_quiz_fts')
+
+    class Meta(AbstractSearchDocument.Meta):
+        db_table = 'quizzes_quiz_fts'
@@ -1,3 +1,6 @@
+from typing import Optional
+
+from django.db.models import Q
 from rest_framework import permissions
 from rest_framework.permissions import BasePermission
 
@@ -8,10 +11,26 @@ class IsCreatorOrAdminUserOrReadOnly(BasePermission):
     on.
 
     Allows read access for safe methods (GET, HEAD, OPTIONS).
+
+    Creators are compared by id, so checking an object doesn't fetch its creator. Many objects can be checked at once
+    with the filter returned by 'get_queryset_filter' (see BulkModelMixin).
     """
 
     USER_FIELD = 'creator'
 
     def has_object_permission(self, request, view, obj):
-        creator = getattr(obj, self.USER_FIELD)
-        return creator == request.user or request.user.is_staff or request.method in permissions.SAFE_METHODS
+        if request.method in permissions.SAFE_METHODS or request.user.is_staff:
+            return True
+
+        creator_id = getattr(obj, obj._meta.get_field(self.USER_FIELD).attname)
+        return request.user.is_authenticated and creator_id == request.user.pk
+
+    def get_queryset_filter(self, request, view) -> Optional[Q]:
+        """ Returns a filter matching the objects the user may act on, or None if they may act on any object. """
+        if request.method in permissions.SAFE_METHODS or request.user.is_staff:
+            return None
+
+        if not request.user.is_authenticated:
+            return Q(pk__in=[])
+
+        return Q(**{f'{self.USER_FIELD}_id': request.user.pk})
@@ -0,0 +1,117 @@
+"""
+Checks the SQLite query plans of the queries run by requests, to catch queries that read every row of a table. Used by
+the check_query_plans command.
+
+A step of a plan that scans a table (rather than searching it with an index) is a full scan, unless it's the outermost
+loop of a query with an ORDER BY and a LIMIT that reads rows in the order they're returned in (i.e. doesn't sort them
+with a temporary b-tree), so the scan stops after a page of rows. Scans inside subqueries and in the inner loops of
+joins are always checked, as are queries with a LIMIT but no ORDER BY (e.g. those of `QuerySet.get()`), which scan
+every row when few or none match. Scans of a covering index read every entry of the index rather than every row of the
+table, and are reported as index scans instead.
+
+Steps are indented by two spaces per level of nesting, e.g. the steps of a subquery below the step that runs it.
+"""
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from django.db import connection
+
+SCAN = re.compile(r'^SCAN (TABLE )?(?P<table>\S+)(?P<rest>.*)$')
+LOOP = re.compile(r'^(SCAN|SEARCH) ')
+ORDER_BY = re.compile(r'\bORDER\s+BY\b', re.IGNORECASE)
+LIMIT = re.compile(r'\bLIMIT\b', re.IGNORECASE)
+LITERAL = re.compile(r"'(?:[^']|'')*'")
+PARENTHESES = re.compile(r'\([^()]*\)')
+INDENT = '  '
+
+FULL_SCAN = 'full scan'
+INDEX_SCAN = 'index scan'
+
+
+def get_outer_sql(sql: str) -> str:
+    """ Returns an SQL statement without its string literals and anything in parentheses, e.g. its subqueries. """
+    sql = LITERAL.sub("''", sql)
+    previous = None
+
+    while sql != previous:
+        previous, sql = sql, PARENTHESES.sub('()', sql)
+
+    return sql
+
+
+class Query(NamedTuple):
+    sql: str
+    params: tuple
+    plan: List[str]
+
+    def get_steps(self) -> List[Tuple[int, str]]:
+        """ Returns the depth of nesting and the description of each step of this query's plan. """
+        steps = []
+
+        for step in self.plan:
+            description = step.lstrip(' ')
+            steps.append(((len(step) - len(description)) // len(INDENT), description))
+
+        return steps
+
+    def get_bounded_step(self) -> Optional[int]:
+        """
+        Returns the index of the step of this query's outermost loop if a LIMIT stops it early, i.e. the query returns
+        rows in the order the loop reads them, otherwise None.
+        """
+        outer_sql = get_outer_sql(self.sql)
+        steps = [(index, step) for index, (depth, step) in enumerate(self.get_steps()) if depth == 0]
+
+        if not ORDER_BY.search(outer_sql) or not LIMIT.search(outer_sql) \
+                or any(step.startswith('USE TEMP B-TREE') for index, step in steps):
+            return None
+
+        return next((index for index, step in steps if LOOP.match(step)), None)
+
+    def find_scans(self) -> List[Tuple[str, str]]:
+        """ Returns each step of this query's plan that scans a table or index, and the kind of scan it is. """
+        bounded_step = self.get_bounded_step()
+        scans = []
+
+        for index, (depth, step) in enumerate(self.get_steps()):
+            match = SCAN.match(step)
+
+            # Virtual tables (e.g. full-text indexes), subqueries and constant rows aren't tables
+            if match is None or index == bounded_step or 'VIRTUAL TABLE' in match['rest'] \
+                    or match['table'] == 'CONSTANT' or match['table'].startswith('(') or match['table'] == 'SUBQUERY':
+                continue
+
+            scans.append((step, INDEX_SCAN if 'COVERING INDEX' in match['rest'] else FULL_SCAN))
+
+        return scans
+
+
+def explain(sql: str, params=()) -> List[str]:
+    """ Returns the steps of an SQLite query's plan, indented by their depth of nesting. """
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        rows = cursor.fetchall()
+
+    depths = {}
+    plan = []
+
+    for step_id, parent_id, _, description in rows:
+        depths[step_id] = depths[parent_id] + 1 if parent_id in depths else 0
+        plan.append(f'{INDENT * depths[step_id]}{description}')
+
+    return plan
+
+
+def capture_queries(func) -> List[Query]:
+    """ Calls the given function, returning the SELECT queries it ran with their plans. """
+    statements = []
+
+    def capture(execute, sql, params, many, context):
+        statements.append((sql, tuple(params or ())))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        func()
+
+    return [Query(sql, params, explain(sql, params)) for sql, params in statements
+            if sql.lstrip().upper().startswith('SELECT')]
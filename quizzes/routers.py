@@ -0,0 +1,15 @@
+from rest_framework.routers import DefaultRouter, SimpleRouter
+
+
+class BulkRouter(DefaultRouter):
+    """
+    DefaultRouter that also routes PUT, PATCH and DELETE requests to the list endpoint to the 'bulk_update',
+    'bulk_partial_update' and 'bulk_destroy' actions of viewsets that have them (see BulkModelMixin).
+    """
+
+    routes = [SimpleRouter.routes[0]._replace(mapping={
+        **SimpleRouter.routes[0].mapping,
+        'put': 'bulk_update',
+        'patch': 'bulk_partial_update',
+        'delete': 'bulk_destroy'
+    })] + SimpleRouter.routes[1:]
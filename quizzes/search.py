@@ -0,0 +1,198 @@
+import operator
+import re
+from functools import reduce
+from typing import List, Sequence
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import Q, F, FloatField, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+from rest_framework.filters import SearchFilter
+
+
+class SearchIndex:
+    """
+    A full-text index over the text columns of a table.
+
+    On SQLite the index is an FTS5 table using the indexed table as external content, kept up to date by triggers. On
+    PostgreSQL it is a GIN index over a tsvector of the columns. Other databases aren't supported.
+
+    Only table and column names are used (rather than models) so indexes can be created from migrations.
+    """
+
+    POSTGRESQL_CONFIG = 'english'
+
+    def __init__(self, table: str, columns: Sequence[str], pk: str = 'id'):
+        self.table = table
+        self.columns = list(columns)
+        self.pk = pk
+
+    @property
+    def name(self) -> str:
+        return f'{self.table}_fts'
+
+    @staticmethod
+    def is_supported(vendor: str) -> bool:
+        return vendor in ('sqlite', 'postgresql')
+
+    def create_sql(self, vendor: str) -> List[str]:
+        """ Returns the statements that create and populate this index. """
+        if vendor == 'sqlite':
+            columns = ', '.join(self.columns)
+            new = ', '.join(f'new.{column}' for column in self.columns)
+            old = ', '.join(f'old.{column}' for column in self.columns)
+            insert = f"INSERT INTO {self.name}(rowid, {columns}) VALUES (new.{self.pk}, {new});"
+            delete = f"INSERT INTO {self.name}({self.name}, rowid, {columns}) VALUES ('delete', old.{self.pk}, {old});"
+            return [
+                f"CREATE VIRTUAL TABLE {self.name} USING fts5({columns}, content='{self.table}', "
+                f"content_rowid='{self.pk}')",
+                f"CREATE TRIGGER {self.name}_insert AFTER INSERT ON {self.table} BEGIN {insert} END",
+                f"CREATE TRIGGER {self.name}_delete AFTER DELETE ON {self.table} BEGIN {delete} END",
+                f"CREATE TRIGGER {self.name}_update AFTER UPDATE ON {self.table} BEGIN {delete} {insert} END",
+                f"INSERT INTO {self.name}({self.name}) VALUES ('rebuild')"
+            ]
+
+        if vendor == 'postgresql':
+            return [f"CREATE INDEX {self.name} ON {self.table} USING GIN ({self._postgresql_vector()})"]
+
+        return []
+
+    def drop_sql(self, vendor: str) -> List[str]:
+        """ Returns the statements that drop this index. """
+        if vendor == 'sqlite':
+            return [
+                f"DROP TRIGGER IF EXISTS {self.name}_insert",
+                f"DROP TRIGGER IF EXISTS {self.name}_delete",
+                f"DROP TRIGGER IF EXISTS {self.name}_update",
+                f"DROP TABLE IF EXISTS {self.name}"
+            ]
+
+        if vendor == 'postgresql':
+            return [f"DROP INDEX IF EXISTS {self.name}"]
+
+        return []
+
+    def _postgresql_vector(self, table: str = None) -> str:
+        prefix = f'{table}.' if table else ''
+        document = " || ' ' || ".join(f"coalesce({prefix}{column}, '')" for column in self.columns)
+        return f"to_tsvector('{self.POSTGRESQL_CONFIG}', {document})"
+
+    def to_query(self, terms: Sequence[str], vendor: str) -> str:
+        """
+        Converts search terms into a query matching rows that contain every term, each as a whole word or prefix of a
+        word. Characters with special meaning in queries are removed.
+        """
+        words = [word for term in terms for word in re.findall(r'\w+', term)]
+
+        if vendor == 'sqlite':
+            return ' '.join(f'"{word}"*' for word in words)
+
+        return ' & '.join(f'{word}:*' for word in words)
+
+    def matching_ids(self, terms: Sequence[str], vendor: str) -> RawSQL:
+        """ Returns a subquery selecting the pks of rows matching the given terms. """
+        query = self.to_query(terms, vendor)
+
+        if vendor == 'sqlite':
+            return RawSQL(f'SELECT rowid FROM {self.name} WHERE {self.name} MATCH %s', [query])
+
+        return RawSQL(f'SELECT {self.pk} FROM {self.table} '
+                      f"WHERE {self._postgresql_vector()} @@ to_tsquery('{self.POSTGRESQL_CONFIG}', %s)", [query])
+
+    def rank(self, terms: Sequence[str]) -> RawSQL:
+        """ Returns an expression ranking a row of the indexed table against the given terms on PostgreSQL. """
+        query = self.to_query(terms, 'postgresql')
+        return RawSQL(f"ts_rank({self._postgresql_vector(self.table)}, to_tsquery('{self.POSTGRESQL_CONFIG}', %s))",
+                      [query], output_field=FloatField())
+
+
+TAG_INDEX = SearchIndex('quizzes_tag', ['name'])
+QUESTION_INDEX = SearchIndex('quizzes_question', ['text', 'description'])
+ANSWER_INDEX = SearchIndex('quizzes_answer', ['text'])
+QUIZ_INDEX = SearchIndex('quizzes_quiz', ['name', 'description'])
+
+SEARCH_INDEXES = [TAG_INDEX, QUESTION_INDEX, ANSWER_INDEX, QUIZ_INDEX]
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for SearchFilter which searches full-text indexes rather than matching substrings, and orders
+    results by relevance.
+
+    Set `.search_indexes` on the view to a list of (lookup, SearchIndex) pairs, where lookup is the relation from the
+    view's model to the indexed model ('pk' for the model itself). A row is returned if it or any of its related rows
+    contains every search term. Rows are ranked by how well they themselves match, rows that only match related rows
+    come last. Falls back to SearchFilter (using `.search_fields`) on unsupported databases.
+
+    Set `.search_user_lookups` on the view to the relations from its model to users (e.g. ['creator']) to also return
+    rows linked to a user whose username or email is the search, ignoring case. These rows are ranked like those that
+    only match related rows.
+
+    On SQLite the view's model must have a related AbstractSearchDocument named 'search_document' for its own index.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        vendor = connections[queryset.db].vendor
+        search_indexes = getattr(view, 'search_indexes', None)
+        search_terms = self.get_search_terms(request)
+
+        if not search_indexes or not SearchIndex.is_supported(vendor):
+            return super().filter_queryset(request, queryset, view)
+
+        if not any(re.search(r'\w', term) for term in search_terms):
+            return queryset
+
+        model = queryset.model
+        own_index = next((index for lookup, index in search_indexes if lookup == 'pk'), None)
+        related_matches = self.get_user_matches(search_terms, view)
+
+        for lookup, index in search_indexes:
+            if lookup != 'pk':
+                # Filter with a subquery rather than a join, which would return duplicate rows
+                ids = index.matching_ids(search_terms, vendor)
+                related_matches |= Q(pk__in=model._default_manager.filter(**{f'{lookup}__in': ids}).values('pk'))
+
+        if own_index is None or getattr(view, 'detail', False):
+            # Results aren't ranked, e.g. when retrieving a single object
+            own_matches = Q(pk__in=own_index.matching_ids(search_terms, vendor)) if own_index else Q()
+            return queryset.filter(own_matches | related_matches)
+
+        if vendor == 'postgresql':
+            own_matches = Q(pk__in=own_index.matching_ids(search_terms, vendor))
+            return queryset.filter(own_matches | related_matches) \
+                .annotate(search_rank=own_index.rank(search_terms)) \
+                .order_by(F('search_rank').desc(), 'pk')
+
+        # On SQLite a match's rank is only available when joining its FTS5 table and filtering with MATCH, which can't
+        # be combined with other conditions using OR. Rows that only match related objects are added with a union.
+        query = own_index.to_query(search_terms, vendor)
+        ranked = queryset.filter(search_document__document__match=query) \
+            .annotate(search_rank=-F('search_document__rank'))
+
+        if related_matches:
+            # Ordering isn't allowed in the queries of a union, the union itself is ordered instead
+            ranked = ranked.order_by()
+            unranked = queryset.filter(related_matches) \
+                .exclude(pk__in=own_index.matching_ids(search_terms, vendor)) \
+                .annotate(search_rank=Value(0.0, output_field=FloatField())) \
+                .order_by()
+            ranked = ranked.union(unranked)
+
+        return ranked.order_by('-search_rank', 'pk')
+
+    @staticmethod
+    def get_user_matches(search_terms: Sequence[str], view) -> Q:
+        """
+        Returns a filter matching rows linked to a user whose username or email is the search (a single term), found
+        with the indexes on their lowercase forms (see testme_auth.availability) rather than a full-text index.
+        """
+        lookups = getattr(view, 'search_user_lookups', None)
+
+        if not lookups or len(search_terms) != 1:
+            return Q()
+
+        term = Lower(Value(search_terms[0]))
+        users = get_user_model().objects.annotate(username_lower=Lower('username'), email_lower=Lower('email')) \
+            .filter(Q(username_lower=term) | Q(email_lower=term)).values('pk')
+        return reduce(operator.or_, [Q(**{f'{lookup}__in': users}) for lookup in lookups])
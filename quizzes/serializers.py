@@ -1,20 +1,26 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 
-from quizzes.models import Tag, Question, Answer, Quiz
+from quizzes.bulk import BulkListSerializer, BulkHyperlinkedRelatedField
+from quizzes.models import Tag, Question, Answer, Quiz, QuestionStats, QuizStats
 
 
 class TagSerializer(serializers.HyperlinkedModelSerializer):
     class Meta:
         model = Tag
         fields = '__all__'
+        list_serializer_class = BulkListSerializer
 
 
 class AnswerSerializer(serializers.HyperlinkedModelSerializer):
-    question = serializers.HyperlinkedRelatedField(queryset=Question.objects.all(), view_name='question-detail')
+    serializer_related_field = BulkHyperlinkedRelatedField
+    question = BulkHyperlinkedRelatedField(queryset=Question.objects.all(), view_name='question-detail')
 
     class Meta:
         model = Answer
         fields = '__all__'
+        list_serializer_class = BulkListSerializer
         extra_kwargs = {
             'creator': {
                 'read_only': True
@@ -26,28 +32,178 @@ class AnswerSerializer(serializers.HyperlinkedModelSerializer):
 
 
 class QuestionSerializer(serializers.HyperlinkedModelSerializer):
+    serializer_related_field = BulkHyperlinkedRelatedField
     is_multiple_choice = serializers.ReadOnlyField()
-    answers = serializers.HyperlinkedRelatedField(queryset=Answer.objects.all(), view_name='answer-detail', many=True)
+    answers = BulkHyperlinkedRelatedField(queryset=Answer.objects.all(), view_name='answer-detail', many=True)
 
     class Meta:
         model = Question
         fields = '__all__'
+        list_serializer_class = BulkListSerializer
+        prefetch_related = [
+            Prefetch('answers', queryset=Answer.objects.order_by('pk')),
+            Prefetch('tags', queryset=Tag.objects.order_by('pk'))
+        ]
         extra_kwargs = {
             'creator': {
                 'read_only': True
             }
         }
 
+    def get_is_multiple_choice_from_values(self, row: dict) -> bool:
+        """ Returns 'is_multiple_choice' for a row of a question's values (see quizzes.representations). """
+        correct_answer_count = row.get('correct_answer_count')
+
+        if correct_answer_count is None:
+            correct_answer_count = Answer.objects.filter(question=row['pk'], is_correct_answer=True).count()
+
+        return correct_answer_count > 1
+
 
 class QuizSerializer(serializers.HyperlinkedModelSerializer):
-    questions = serializers.HyperlinkedRelatedField(many=True, queryset=Question.objects.all(),
-                                                    view_name='question-detail')
+    serializer_related_field = BulkHyperlinkedRelatedField
+    questions = BulkHyperlinkedRelatedField(many=True, queryset=Question.objects.all(), view_name='question-detail')
 
     class Meta:
         model = Quiz
         fields = '__all__'
+        list_serializer_class = BulkListSerializer
+        prefetch_related = [Prefetch('questions', queryset=Question.objects.order_by('pk'))]
         extra_kwargs = {
             'creator': {
                 'read_only': True
             }
         }
+
+
+class QuizSummarySerializer(serializers.HyperlinkedModelSerializer):
+    """ Summarizes a quiz in the latest quizzes feed, represented from the rows cached by quizzes.feed. """
+
+    class Meta:
+        model = Quiz
+        fields = ['url', 'name', 'description', 'creator', 'created_on']
+        read_only_fields = fields
+
+
+class QuizBundleAnswerSerializer(serializers.HyperlinkedModelSerializer):
+    class Meta:
+        model = Answer
+        fields = ['url', 'text', 'votes', 'is_correct_answer']
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+
+        if self.context.get('hide_correct_answers'):
+            del data['is_correct_answer']
+
+        return data
+
+
+class QuizBundleQuestionSerializer(serializers.HyperlinkedModelSerializer):
+    is_multiple_choice = serializers.ReadOnlyField()
+    tags = serializers.SlugRelatedField(slug_field='name', many=True, read_only=True)
+    answers = QuizBundleAnswerSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Question
+        fields = ['url', 'text', 'description', 'is_multiple_choice', 'tags', 'answers', 'created_on', 'updated_on']
+
+
+class QuizBundleSerializer(serializers.HyperlinkedModelSerializer):
+    """ Read only representation of a quiz with its questions, their answers and tag names embedded. """
+    questions = QuizBundleQuestionSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Quiz
+        fields = ['url', 'creator', 'name', 'description', 'questions', 'created_on', 'updated_on']
+        read_only_fields = fields
+        prefetch_related = [
+            Prefetch('questions', queryset=Question.objects.order_by('pk')),
+            Prefetch('questions__answers', queryset=Answer.objects.order_by('pk')),
+            Prefetch('questions__tags', queryset=Tag.objects.order_by('name'))
+        ]
+
+
+def _ratio(numerator: int, denominator: int):
+    return numerator / denominator if denominator else None
+
+
+class QuestionStatsSerializer(serializers.HyperlinkedModelSerializer):
+    question = serializers.HyperlinkedRelatedField(view_name='question-detail', read_only=True)
+    correct_attempt_rate = serializers.SerializerMethodField(help_text="Fraction of attempts answered correctly.")
+    answers = serializers.SerializerMethodField(help_text="Votes for each answer and their share of all votes.")
+
+    class Meta:
+        model = QuestionStats
+        fields = ['question', 'answer_count', 'correct_answer_count', 'vote_count', 'attempt_count',
+                  'correct_attempt_count', 'correct_attempt_rate', 'answers']
+        read_only_fields = fields
+
+    def get_correct_attempt_rate(self, stats):
+        return _ratio(stats.correct_attempt_count, stats.attempt_count)
+
+    def get_answers(self, stats):
+        answers = Answer.objects.filter(question=stats.question_id).order_by('pk').values_list('pk', 'votes')
+        request = self.context.get('request')
+
+        return [{'answer': reverse('answer-detail', args=[pk], request=request), 'votes': votes,
+                 'vote_share': _ratio(votes, stats.vote_count)} for pk, votes in answers]
+
+
+class QuizStatsSerializer(serializers.HyperlinkedModelSerializer):
+    quiz = serializers.HyperlinkedRelatedField(view_name='quiz-detail', read_only=True)
+    mean_score = serializers.SerializerMethodField(help_text="Mean number of questions answered correctly.")
+    perfect_attempt_rate = serializers.SerializerMethodField(
+        help_text="Fraction of attempts that answered every question correctly.")
+
+    class Meta:
+        model = QuizStats
+        fields = ['quiz', 'question_count', 'answer_count', 'correct_answer_count', 'vote_count', 'attempt_count',
+                  'perfect_attempt_count', 'perfect_attempt_rate', 'mean_score']
+        read_only_fields = fields
+
+    def get_mean_score(self, stats):
+        return _ratio(stats.total_score, stats.attempt_count)
+
+    def get_perfect_attempt_rate(self, stats):
+        return _ratio(stats.perfect_attempt_count, stats.attempt_count)
+
+
+class VoteSerializer(serializers.Serializer):
+    answers = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000,
+                                    help_text="Ids of the chosen answers. Each is voted for once.")
+
+    def validate_answers(self, value):
+        existing = set(Answer.objects.filter(pk__in=value).values_list('pk', flat=True))
+        missing = sorted(set(value) - existing)
+
+        if missing:
+            raise serializers.ValidationError(f"Invalid answer ids {missing} - objects do not exist.")
+
+        # One vote per answer per request, so a single request can't stuff the votes of an answer
+        return list(dict.fromkeys(value))
+
+
+class AttemptSerializer(serializers.Serializer):
+    answers = serializers.ListField(child=serializers.IntegerField(min_value=1), max_length=10000,
+                                    help_text="Ids of the chosen answers.")
+
+
+class QuestionResultSerializer(serializers.Serializer):
+    question = serializers.SerializerMethodField()
+    is_correct = serializers.BooleanField()
+    is_multiple_choice = serializers.BooleanField()
+    chosen_answers = serializers.SerializerMethodField()
+    correct_answers = serializers.SerializerMethodField()
+
+    def get_question(self, result):
+        return self.reverse('question-detail', result.question_id)
+
+    def get_chosen_answers(self, result):
+        return [self.reverse('answer-detail', pk) for pk in sorted(result.chosen_answer_ids)]
+
+    def get_correct_answers(self, result):
+        return [self.reverse('answer-detail', pk) for pk in sorted(result.correct_answer_ids)]
+
+    def reverse(self, view_name, pk):
+        return reverse(view_name, args=[pk], request=self.context.get('request'))
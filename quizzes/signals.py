@@ -0,0 +1,321 @@
+from typing import Iterable
+
+from django.db.models.signals import pre_save, post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver, Signal
+from django.utils import timezone
+
+from .cache import representation_cache
+from .feed import latest_quizzes
+from .models import Quiz, Question, Answer, Tag, QuestionStats, QuizStats
+from .stats import refresh_stats, refresh_quiz_stats, create_stats
+from .tag_index import tag_index
+
+# Sent after objects are created or updated in bulk (see quizzes.bulk.BulkListSerializer), instead of post_save and
+# m2m_changed. Receivers are given the saved 'instances', whether they were 'created', 'relations' mapping the names of
+# many-to-many fields that were set to the related pks set for each instance, and 'previous' mapping the pks of updated
+# instances to the previous values of the fields that were set.
+bulk_saved = Signal()
+
+
+def invalidate_questions(question_ids: Iterable[int]):
+    """ Invalidates the cached representations of the given questions and the quizzes they are in. """
+    question_ids = list(question_ids)
+    quiz_ids = Quiz.questions.through.objects.filter(question_id__in=question_ids) \
+        .values_list('quiz_id', flat=True).distinct()
+
+    representation_cache.invalidate(Question, question_ids)
+    representation_cache.invalidate(Quiz, quiz_ids)
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def invalidate_quiz(sender, instance, **kwargs):
+    representation_cache.invalidate(Quiz, [instance.pk])
+
+
+@receiver(post_save, sender=Question)
+@receiver(pre_delete, sender=Question)
+def invalidate_question(sender, instance, **kwargs):
+    # Quizzes are found before the question is deleted, as deleting it also deletes its links to quizzes
+    invalidate_questions([instance.pk])
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def invalidate_answer(sender, instance, **kwargs):
+    invalidate_questions([instance.question_id])
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def invalidate_tag(sender, instance, **kwargs):
+    invalidate_questions(instance.question_set.values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=Quiz.questions.through)
+def invalidate_quiz_questions(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        representation_cache.invalidate(Quiz, [instance.pk])
+    elif action == 'pre_clear':
+        representation_cache.invalidate(Quiz, instance.quiz_set.values_list('pk', flat=True))
+    else:
+        representation_cache.invalidate(Quiz, pk_set)
+
+
+@receiver(m2m_changed, sender=Question.tags.through)
+def invalidate_question_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        invalidate_questions([instance.pk])
+    elif action == 'pre_clear':
+        invalidate_questions(instance.question_set.values_list('pk', flat=True))
+    else:
+        invalidate_questions(pk_set)
+
+
+# The models whose lists may lose objects when objects of each sender change, e.g. quizzes leave lists filtered by tag
+# when their questions are untagged, without being modified themselves
+LISTS_CHANGED_BY = {
+    Tag: [Question, Quiz],
+    Question: [Question, Quiz],
+    Quiz: [Quiz],
+    Question.tags.through: [Question, Quiz],
+    Quiz.questions.through: [Quiz],
+}
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(bulk_saved, sender=Tag)
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+@receiver(bulk_saved, sender=Question)
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+@receiver(bulk_saved, sender=Quiz)
+@receiver(m2m_changed, sender=Question.tags.through)
+@receiver(m2m_changed, sender=Quiz.questions.through)
+def invalidate_lists(sender, action=None, **kwargs):
+    # m2m_changed is sent both before and after each change, lists are invalidated once it's made
+    if action in (None, 'post_add', 'post_remove', 'post_clear'):
+        representation_cache.invalidate_lists(LISTS_CHANGED_BY[sender])
+
+
+@receiver(post_save, sender=Tag)
+def index_tag(sender, instance, **kwargs):
+    tag_index.set_tag(instance.pk, instance.name)
+
+
+@receiver(post_delete, sender=Tag)
+def unindex_tag(sender, instance, **kwargs):
+    tag_index.remove_tag(instance.pk)
+
+
+@receiver(post_delete, sender=Question)
+def unindex_question(sender, instance, **kwargs):
+    tag_index.remove_question(instance.pk)
+
+
+@receiver(post_delete, sender=Quiz)
+def unindex_quiz(sender, instance, **kwargs):
+    tag_index.remove_quiz(instance.pk)
+
+
+@receiver(m2m_changed, sender=Question.tags.through)
+def index_question_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'post_add':
+        if reverse:
+            tag_index.link_question_tags(pk_set, [instance.pk])
+        else:
+            tag_index.link_question_tags([instance.pk], pk_set)
+    elif action in ('post_remove', 'post_clear'):
+        # pk_set is None when cleared, which unlinks every question or tag
+        if reverse:
+            tag_index.unlink_question_tags(question_ids=pk_set, tag_ids=[instance.pk])
+        else:
+            tag_index.unlink_question_tags(question_ids=[instance.pk], tag_ids=pk_set)
+
+
+@receiver(m2m_changed, sender=Quiz.questions.through)
+def index_quiz_questions(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'post_add':
+        if reverse:
+            tag_index.link_quiz_questions(pk_set, [instance.pk])
+        else:
+            tag_index.link_quiz_questions([instance.pk], pk_set)
+    elif action in ('post_remove', 'post_clear'):
+        if reverse:
+            tag_index.unlink_quiz_questions(quiz_ids=pk_set, question_ids=[instance.pk])
+        else:
+            tag_index.unlink_quiz_questions(quiz_ids=[instance.pk], question_ids=pk_set)
+
+
+@receiver(post_save, sender=Quiz)
+def add_latest_quiz(sender, instance, **kwargs):
+    latest_quizzes.add([instance])
+
+
+@receiver(post_delete, sender=Quiz)
+def remove_latest_quiz(sender, instance, **kwargs):
+    latest_quizzes.remove([instance.pk])
+
+
+def touch(model, pks: Iterable[int]):
+    """
+    Sets the 'updated_on' timestamp of the given objects to now, for changes to related objects that change their
+    representations (e.g. their answers) so the timestamps can be used to validate conditional requests.
+    """
+    model._default_manager.filter(pk__in=list(pks)).update(updated_on=timezone.now())
+
+
+@receiver(pre_save, sender=Answer)
+def find_previous_question(sender, instance, **kwargs):
+    # Both the answer's previous and current question change if it's moved
+    if instance.pk is not None:
+        instance._previous_question_id = Answer.objects.filter(pk=instance.pk) \
+            .values_list('question_id', flat=True).first()
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def touch_answer_question(sender, instance, **kwargs):
+    touch(Question, {instance.question_id, getattr(instance, '_previous_question_id', None)} - {None})
+
+
+@receiver(pre_delete, sender=Question)
+def touch_question_quizzes(sender, instance, **kwargs):
+    touch(Quiz, instance.quiz_set.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Tag)
+def touch_tag_questions(sender, instance, **kwargs):
+    touch(Question, instance.question_set.values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=Question.tags.through)
+def touch_question_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        touch(Question, [instance.pk])
+    elif action == 'pre_clear':
+        touch(Question, instance.question_set.values_list('pk', flat=True))
+    else:
+        touch(Question, pk_set)
+
+
+@receiver(m2m_changed, sender=Quiz.questions.through)
+def touch_quiz_questions(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        touch(Quiz, [instance.pk])
+    elif action == 'pre_clear':
+        touch(Quiz, instance.quiz_set.values_list('pk', flat=True))
+    else:
+        touch(Quiz, pk_set)
+
+
+@receiver(post_save, sender=Question)
+def create_question_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        QuestionStats.objects.create(question=instance)
+
+
+@receiver(post_save, sender=Quiz)
+def create_quiz_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        QuizStats.objects.create(quiz=instance)
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def refresh_answer_stats(sender, instance, **kwargs):
+    refresh_stats({instance.question_id, getattr(instance, '_previous_question_id', None)} - {None})
+
+
+@receiver(pre_delete, sender=Question)
+def find_question_quizzes(sender, instance, **kwargs):
+    # The question's links to quizzes are deleted with it
+    instance._quiz_ids = list(instance.quiz_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Question)
+def refresh_question_quiz_stats(sender, instance, **kwargs):
+    refresh_quiz_stats(getattr(instance, '_quiz_ids', []))
+
+
+@receiver(m2m_changed, sender=Quiz.questions.through)
+def refresh_quiz_question_stats(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            refresh_quiz_stats([instance.pk])
+    elif action == 'pre_clear':
+        instance._cleared_quiz_ids = list(instance.quiz_set.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        refresh_quiz_stats(instance._cleared_quiz_ids)
+    elif action in ('post_add', 'post_remove'):
+        refresh_quiz_stats(pk_set)
+
+
+@receiver(bulk_saved, sender=Tag)
+def bulk_saved_tags(sender, instances, created, **kwargs):
+    for tag in instances:
+        tag_index.set_tag(tag.pk, tag.name)
+
+    if not created:
+        tag_ids = [tag.pk for tag in instances]
+        question_ids = Question.tags.through.objects.filter(tag_id__in=tag_ids).values_list('question_id', flat=True)
+        invalidate_questions(question_ids)
+
+
+@receiver(bulk_saved, sender=Question)
+def bulk_saved_questions(sender, instances, created, relations, **kwargs):
+    question_ids = [question.pk for question in instances]
+
+    if created:
+        create_stats(Question, question_ids)
+    else:
+        invalidate_questions(question_ids)
+
+    if 'tags' in relations:
+        if not created:
+            tag_index.unlink_question_tags(question_ids=list(relations['tags']))
+        for question_id, tag_ids in relations['tags'].items():
+            tag_index.link_question_tags([question_id], tag_ids)
+
+
+@receiver(bulk_saved, sender=Answer)
+def bulk_saved_answers(sender, instances, previous, **kwargs):
+    # Answers may have been moved from other questions
+    question_ids = {answer.question_id for answer in instances}
+    question_ids.update(values['question_id'] for values in previous.values() if 'question_id' in values)
+    invalidate_questions(question_ids)
+    touch(Question, question_ids)
+    refresh_stats(question_ids)
+
+
+@receiver(bulk_saved, sender=Quiz)
+def bulk_saved_quizzes(sender, instances, created, relations, **kwargs):
+    quiz_ids = [quiz.pk for quiz in instances]
+    latest_quizzes.add(instances)
+
+    if created:
+        create_stats(Quiz, quiz_ids)
+    else:
+        representation_cache.invalidate(Quiz, quiz_ids)
+        if 'questions' in relations:
+            refresh_quiz_stats(quiz_ids)
+
+    if 'questions' in relations:
+        if not created:
+            tag_index.unlink_quiz_questions(quiz_ids=list(relations['questions']))
+        for quiz_id, question_ids in relations['questions'].items():
+            tag_index.link_quiz_questions([quiz_id], question_ids)
@@ -0,0 +1,129 @@
+"""
+Maintains the denormalized statistics of questions and quizzes (QuestionStats and QuizStats), so they can be read with
+a single query rather than aggregated from every answer of every question of a quiz.
+
+Counts of answers, correct answers, votes and questions are derived from other tables and refreshed whenever those
+change, with a single UPDATE per table that recounts them in the database for the affected rows. Attempt counts can't be
+derived, as attempts aren't stored, so they are only ever incremented as attempts are graded (see `record_attempt`)
+and are kept by `rebuild_stats`.
+"""
+from typing import Iterable, List, Union
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, QuerySet, Subquery, Sum, When, Value
+from django.db.models.functions import Coalesce
+
+from .models import Question, Answer, Quiz, QuestionStats, QuizStats, QuestionResult
+
+# Pks of objects, or a queryset of their pks (e.g. `Answer.objects.filter(...).values('question')`)
+Pks = Union[Iterable[int], QuerySet]
+
+
+def _subquery(queryset: QuerySet, aggregate) -> Coalesce:
+    """ Returns a subquery of the given aggregate of a queryset filtered by an outer reference, or 0 if it's empty. """
+    return Coalesce(Subquery(queryset.annotate(value=aggregate).values('value'), output_field=IntegerField()), 0)
+
+
+def _pks(pks: Pks):
+    return pks if isinstance(pks, QuerySet) else list(pks)
+
+
+def get_question_counts() -> dict:
+    """ Returns expressions for the derived counts of QuestionStats, for updating them in the database. """
+    answers = Answer.objects.filter(question=OuterRef('question')).order_by().values('question')
+
+    return {
+        'answer_count': _subquery(answers, Count('pk')),
+        'correct_answer_count': _subquery(answers.filter(is_correct_answer=True), Count('pk')),
+        'vote_count': _subquery(answers, Sum('votes'))
+    }
+
+
+def get_quiz_counts() -> dict:
+    """ Returns expressions for the derived counts of QuizStats, summed from the stats of each quiz's questions. """
+    links = Quiz.questions.through.objects.filter(quiz=OuterRef('quiz')).order_by().values('quiz')
+
+    return {
+        'question_count': _subquery(links, Count('pk')),
+        'answer_count': _subquery(links, Sum('question__stats__answer_count')),
+        'correct_answer_count': _subquery(links, Sum('question__stats__correct_answer_count')),
+        'vote_count': _subquery(links, Sum('question__stats__vote_count'))
+    }
+
+
+def refresh_question_stats(question_ids: Pks = None) -> int:
+    """ Recounts the answers, correct answers and votes of the given questions, or every question if None. """
+    stats = QuestionStats.objects.all()
+
+    if question_ids is not None:
+        stats = stats.filter(question__in=_pks(question_ids))
+
+    return stats.update(**get_question_counts())
+
+
+def refresh_quiz_stats(quiz_ids: Pks = None) -> int:
+    """
+    Recounts the questions of the given quizzes, or every quiz if None, and sums the counts of their questions'
+    statistics (which should be refreshed first).
+    """
+    stats = QuizStats.objects.all()
+
+    if quiz_ids is not None:
+        stats = stats.filter(quiz__in=_pks(quiz_ids))
+
+    return stats.update(**get_quiz_counts())
+
+
+def refresh_stats(question_ids: Pks):
+    """ Refreshes the statistics of the given questions and the quizzes they are in. """
+    question_ids = _pks(question_ids)
+    refresh_question_stats(question_ids)
+    refresh_quiz_stats(Quiz.questions.through.objects.filter(question__in=question_ids).values('quiz'))
+
+
+def create_stats(model, pks: Iterable[int]):
+    """ Creates the statistics of the given questions or quizzes that don't have any, and refreshes them. """
+    pks = list(pks)
+    stats_model = model._meta.get_field('stats').related_model
+    field = stats_model._meta.pk
+
+    stats_model.objects.bulk_create([stats_model(**{field.attname: pk}) for pk in pks], ignore_conflicts=True)
+
+    if model is Question:
+        refresh_question_stats(pks)
+    else:
+        refresh_quiz_stats(pks)
+
+
+def record_attempt(quiz_id: int, results: List[QuestionResult]):
+    """ Adds a graded attempt at a quiz (see Quiz.grade) to the statistics of the quiz and its questions. """
+    score = sum(result.is_correct for result in results)
+    correct_question_ids = [result.question_id for result in results if result.is_correct]
+
+    QuizStats.objects.filter(quiz=quiz_id).update(
+        attempt_count=F('attempt_count') + 1,
+        perfect_attempt_count=F('perfect_attempt_count') + int(bool(results) and score == len(results)),
+        total_score=F('total_score') + score
+    )
+
+    if results:
+        correct = Case(When(Q(question__in=correct_question_ids), then=Value(1)), default=Value(0),
+                       output_field=IntegerField())
+        QuestionStats.objects.filter(question__in=[result.question_id for result in results]).update(
+            attempt_count=F('attempt_count') + 1,
+            correct_attempt_count=F('correct_attempt_count') + correct
+        )
+
+
+def rebuild_stats() -> dict:
+    """
+    Creates any missing statistics and recounts every derived count from scratch, e.g. to repair statistics after rows
+    were changed without sending signals. Returns the number of questions and quizzes rebuilt.
+    """
+    with transaction.atomic():
+        QuestionStats.objects.bulk_create([QuestionStats(question_id=pk) for pk in
+                                           Question.objects.filter(stats=None).values_list('pk', flat=True)])
+        QuizStats.objects.bulk_create([QuizStats(quiz_id=pk) for pk in
+                                       Quiz.objects.filter(stats=None).values_list('pk', flat=True)])
+
+        return {'questions': refresh_question_stats(), 'quizzes': refresh_quiz_stats()}
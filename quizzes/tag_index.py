@@ -0,0 +1,215 @@
+import json
+import threading
+import time
+from itertools import product
+from typing import Dict, Set, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Quiz, Question, Tag
+
+
+class TagIndex:
+    """
+    Process-local inverted index from tags to the questions that have them, and from questions to the quizzes that
+    contain them. A quiz has a tag if any of its questions have the tag.
+
+    The index is built from the database on first use and kept up to date by signal receivers (see quizzes.signals).
+    Changes made by other processes or in rolled back transactions aren't seen until the index is rebuilt, which happens
+    once it is older than the TAG_INDEX_MAX_AGE setting (in seconds).
+    """
+
+    def __init__(self, max_age: int = None):
+        self._max_age = max_age
+        self._lock = threading.RLock()
+        self._built_at = None
+
+        self._tag_ids: Dict[str, int] = {}
+        self._question_ids: Dict[int, Set[int]] = {}
+        self._quiz_ids: Dict[int, Set[int]] = {}
+
+    @property
+    def max_age(self) -> int:
+        return settings.TAG_INDEX_MAX_AGE if self._max_age is None else self._max_age
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def build(self):
+        """ Builds the index from the database. """
+        tag_ids = dict(Tag.objects.values_list('name', 'pk'))
+        question_ids = {}
+        quiz_ids = {}
+
+        for question_id, tag_id in Question.tags.through.objects.values_list('question_id', 'tag_id').iterator():
+            question_ids.setdefault(tag_id, set()).add(question_id)
+
+        for quiz_id, question_id in Quiz.questions.through.objects.values_list('quiz_id', 'question_id').iterator():
+            quiz_ids.setdefault(question_id, set()).add(quiz_id)
+
+        with self._lock:
+            self._tag_ids = tag_ids
+            self._question_ids = question_ids
+            self._quiz_ids = quiz_ids
+            self._built_at = time.monotonic()
+
+    def clear(self):
+        """ Discards the index so it is rebuilt when next used. """
+        with self._lock:
+            self._built_at = None
+            self._tag_ids, self._question_ids, self._quiz_ids = {}, {}, {}
+
+    def _get_tag_ids(self, tag_names: Iterable[str], match_all: bool) -> List[int]:
+        if not self.is_built or time.monotonic() - self._built_at > self.max_age:
+            self.build()
+
+        tag_names = set(tag_names)
+        tag_ids = [self._tag_ids[name] for name in tag_names if name in self._tag_ids]
+
+        if match_all and len(tag_ids) < len(tag_names):
+            # A tag that doesn't exist can't be matched
+            return []
+
+        return tag_ids
+
+    @staticmethod
+    def _combine(id_sets: List[Set[int]], match_all: bool) -> Set[int]:
+        if not id_sets:
+            return set()
+        return set.intersection(*id_sets) if match_all else set.union(*id_sets)
+
+    def question_ids(self, tag_names: Iterable[str], match_all: bool = True) -> Set[int]:
+        """ Returns the ids of questions with all (or any) of the given tags. """
+        with self._lock:
+            tag_ids = self._get_tag_ids(tag_names, match_all)
+            return self._combine([self._question_ids.get(tag_id, set()) for tag_id in tag_ids], match_all)
+
+    def quiz_ids(self, tag_names: Iterable[str], match_all: bool = True) -> Set[int]:
+        """ Returns the ids of quizzes with questions that have all (or any) of the given tags. """
+        with self._lock:
+            tag_ids = self._get_tag_ids(tag_names, match_all)
+            id_sets = []
+
+            for tag_id in tag_ids:
+                quiz_ids = set()
+                for question_id in self._question_ids.get(tag_id, ()):
+                    quiz_ids.update(self._quiz_ids.get(question_id, ()))
+                id_sets.append(quiz_ids)
+
+            return self._combine(id_sets, match_all)
+
+    # The methods below update the index after the database has changed. They do nothing until the index is built, as
+    # it is then built from the database.
+
+    def set_tag(self, tag_id: int, name: str):
+        """ Adds a tag or updates its name. """
+        with self._lock:
+            if self.is_built:
+                self._tag_ids = {key: pk for key, pk in self._tag_ids.items() if pk != tag_id}
+                self._tag_ids[name] = tag_id
+
+    def remove_tag(self, tag_id: int):
+        with self._lock:
+            if self.is_built:
+                self._tag_ids = {key: pk for key, pk in self._tag_ids.items() if pk != tag_id}
+                self._question_ids.pop(tag_id, None)
+
+    def remove_question(self, question_id: int):
+        with self._lock:
+            if self.is_built:
+                self.unlink_question_tags(question_ids=[question_id])
+                self._quiz_ids.pop(question_id, None)
+
+    def remove_quiz(self, quiz_id: int):
+        self.unlink_quiz_questions(quiz_ids=[quiz_id])
+
+    def link_question_tags(self, question_ids: Iterable[int], tag_ids: Iterable[int]):
+        """ Records that each of the given questions has each of the given tags. """
+        with self._lock:
+            if self.is_built:
+                for question_id, tag_id in product(question_ids, tag_ids):
+                    self._question_ids.setdefault(tag_id, set()).add(question_id)
+
+    def unlink_question_tags(self, question_ids: Iterable[int] = None, tag_ids: Iterable[int] = None):
+        """ Records that the given questions (or all) no longer have the given tags (or any). """
+        with self._lock:
+            if self.is_built:
+                self._unlink(self._question_ids, tag_ids, question_ids)
+
+    def link_quiz_questions(self, quiz_ids: Iterable[int], question_ids: Iterable[int]):
+        """ Records that each of the given quizzes contains each of the given questions. """
+        with self._lock:
+            if self.is_built:
+                for quiz_id, question_id in product(quiz_ids, question_ids):
+                    self._quiz_ids.setdefault(question_id, set()).add(quiz_id)
+
+    def unlink_quiz_questions(self, quiz_ids: Iterable[int] = None, question_ids: Iterable[int] = None):
+        """ Records that the given quizzes (or all) no longer contain the given questions (or any). """
+        with self._lock:
+            if self.is_built:
+                self._unlink(self._quiz_ids, question_ids, quiz_ids)
+
+    @staticmethod
+    def _unlink(index: Dict[int, Set[int]], keys: Iterable[int] = None, values: Iterable[int] = None):
+        for key in list(index) if keys is None else keys:
+            if key not in index:
+                continue
+            if values is None:
+                del index[key]
+            else:
+                index[key].difference_update(values)
+
+
+tag_index = TagIndex()
+
+
+class TagFilter(BaseFilterBackend):
+    """
+    Filters questions or quizzes by tag name using the in-memory tag index, e.g. `?tags=python,django&match=any`.
+
+    By default only rows with every tag are returned (`match=all`). Matching ids are found without querying the
+    database, the queryset is then filtered by pk. Set `.tag_index_lookup` on the view to 'question_ids' or 'quiz_ids'.
+
+    This filter must come before FullTextSearchFilter, which may return a union that can't be filtered further.
+    """
+
+    tags_param = 'tags'
+    match_param = 'match'
+    match_choices = ('all', 'any')
+
+    def get_tags(self, request) -> Tuple[List[str], bool]:
+        tags = request.query_params.get(self.tags_param, '')
+        tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+        match = request.query_params.get(self.match_param, 'all')
+
+        if match not in self.match_choices:
+            raise ValidationError({self.match_param: [f"Must be one of {', '.join(self.match_choices)}."]})
+
+        return tags, match == 'all'
+
+    def filter_queryset(self, request, queryset, view):
+        tags, match_all = self.get_tags(request)
+        lookup = getattr(view, 'tag_index_lookup', None)
+
+        if not tags or lookup is None:
+            return queryset
+
+        ids = getattr(tag_index, lookup)(tags, match_all)
+        return queryset.filter(pk__in=self.ids_expression(sorted(ids), connections[queryset.db].vendor))
+
+    @staticmethod
+    def ids_expression(ids: List[int], vendor: str):
+        """
+        Returns ids in a form usable with an `in` lookup. The ids are passed as a single parameter where possible, as
+        the number of parameters in a query is limited (to 999 on some SQLite builds).
+        """
+        if vendor == 'sqlite':
+            return RawSQL('SELECT value FROM json_each(%s)', [json.dumps(ids)])
+        if vendor == 'postgresql':
+            return RawSQL('SELECT unnest(%s::integer[])', [ids])
+        return ids
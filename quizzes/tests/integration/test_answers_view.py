@@ -1,7 +1,10 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from django.test import override_settings
 from parameterized import parameterized
 
+from quizzes.votes import vote_buffer
+
 from quizzes.tests import create_api_response, create_question, MockedTestCase, create_answer, UserAuthTestsMixin
 
 
@@ -14,7 +17,6 @@ class AnswerTests(MockedTestCase, UserAuthTestsMixin):
         """ Returns an empty array when there are no results. """
         expected = create_api_response(
             data={
-                "count": 0,
                 "next": None,
                 "previous": None,
                 "results": []
@@ -30,8 +32,7 @@ class AnswerTests(MockedTestCase, UserAuthTestsMixin):
         create_answer(self.question, False)
 
         expected = create_api_response(
-            data={'count': 2,
-                  'next': None,
+            data={'next': None,
                   'previous': None,
                   'results': [
                       {'is_correct_answer': True,
@@ -278,3 +279,88 @@ class AnswerTests(MockedTestCase, UserAuthTestsMixin):
 
         self.assertEqual(response.status_code, 403)
         self.assertJSONEqual(response.content.decode(), expected)
+
+    def test_vote(self):
+        """ Records a vote for each of the given answers. """
+        first = create_answer(self.question, True)
+        second = create_answer(self.question, False)
+        expected = create_api_response(data={'votes': 2})
+
+        response = self.client.post('/api/answers/vote/', data={'answers': [first.pk, second.pk]},
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertJSONEqual(response.content.decode(), expected)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.votes, 1)
+        self.assertEqual(second.votes, 1)
+
+    def test_vote_duplicates(self):
+        """ Answers given more than once in a request are only voted for once. """
+        first = create_answer(self.question, True)
+        second = create_answer(self.question, False)
+
+        response = self.client.post('/api/answers/vote/', data={'answers': [first.pk, second.pk] + [first.pk] * 998},
+                                    content_type='application/json')
+
+        self.assertEqual(response.json()['data'], {'votes': 2})
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.votes, 1)
+        self.assertEqual(second.votes, 1)
+
+    @parameterized.expand([
+        ({}, {'answers': ['This field is required.']}),
+        ({'answers': []}, {'answers': ['This list may not be empty.']}),
+        ({'answers': [1000]}, {'answers': ['Invalid answer ids [1000] - objects do not exist.']}),
+    ])
+    def test_vote_invalid_input(self, data, expected_data):
+        """ No votes are recorded when an invalid list of answers is given. """
+        answer = create_answer(self.question, True)
+        expected = create_api_response(400, "Bad Request", data=expected_data)
+
+        response = self.client.post('/api/answers/vote/', data=data, content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertJSONEqual(response.content.decode(), expected)
+        answer.refresh_from_db()
+        self.assertEqual(answer.votes, 0)
+
+    @override_settings(VOTE_BUFFER_FLUSH_INTERVAL=60 * 1000)
+    def test_vote_buffered(self):
+        """ Votes are buffered rather than written immediately when buffering is enabled. """
+        answer = create_answer(self.question, True)
+        self.addCleanup(vote_buffer.flush)
+
+        response = self.client.post('/api/answers/vote/', data={'answers': [answer.pk]},
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        answer.refresh_from_db()
+        self.assertEqual(answer.votes, 0)
+        self.assertEqual(vote_buffer.pending_votes, 1)
+
+        vote_buffer.flush()
+        answer.refresh_from_db()
+        self.assertEqual(answer.votes, 1)
+
+    @parameterized.expand([
+        ('user', 403),
+        ('admin', 200),
+        ('anonymous', 401)
+    ])
+    def test_vote_buffer_stats(self, user_field, expected_status_code):
+        """ Only admin users can view vote buffer metrics. """
+        user = getattr(self, user_field)
+
+        if not user.is_anonymous:
+            is_authenticated = self.client.login(username=user.username, password=self.password)
+            self.assertTrue(is_authenticated)
+
+        response = self.client.get('/api/answers/vote-buffer/')
+
+        self.assertEqual(response.status_code, expected_status_code)
+
+        if expected_status_code == 200:
+            self.assertEqual(response.json()['data']['pending_votes'], 0)
@@ -0,0 +1,186 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from parameterized import parameterized
+
+from quizzes.models import Question, Tag
+from quizzes.tag_index import tag_index
+from quizzes.views import TagViewSet
+from quizzes.tests import create_question, create_tag, UserAuthTestsMixin
+
+QUESTIONS_URL = 'http://testserver/api/questions/'
+TAGS_URL = 'http://testserver/api/tags/'
+
+
+class BulkTests(TestCase, UserAuthTestsMixin):
+    def setUp(self) -> None:
+        self.setUpTestUsers()
+        self.client.login(username=self.admin.username, password=self.password)
+        tag_index.clear()
+        self.addCleanup(tag_index.clear)
+
+    def send(self, method, endpoint, data, expected_status):
+        response = getattr(self.client, method)(f'/api/{endpoint}/', data, content_type='application/json')
+        self.assertEqual(response.status_code, expected_status, response.content)
+        return response.json()['data'] if response.content else None
+
+    def create_questions(self, number_of_questions, tags=()):
+        data = [{'text': f'question_{i}', 'answers': [], 'tags': [f'{TAGS_URL}{tag.pk}/' for tag in tags]}
+                for i in range(number_of_questions)]
+        return self.send('post', 'questions', data, 201)
+
+    def test_create(self):
+        """ Creates every object in the list, linked to the user who made the request. """
+        tags = [create_tag('a'), create_tag('b')]
+        results = self.create_questions(3, tags)
+
+        self.assertEqual([result['url'] for result in results], [f'{QUESTIONS_URL}{pk}/' for pk in range(1, 4)])
+        self.assertEqual(results[0]['tags'], [f'{TAGS_URL}1/', f'{TAGS_URL}2/'])
+        self.assertEqual(Question.objects.filter(creator=self.admin).count(), 3)
+        self.assertEqual(Question.tags.through.objects.count(), 6)
+
+    @parameterized.expand([
+        ('tags', lambda i: {'name': f'tag_{i}'}),
+        ('questions', lambda i: {'text': f'question_{i}', 'answers': [], 'tags': [f'{TAGS_URL}1/']}),
+        ('answers', lambda i: {'text': 'answer', 'is_correct_answer': True, 'question': f'{QUESTIONS_URL}1/'}),
+        ('quizzes', lambda i: {'name': f'quiz_{i}', 'questions': [f'{QUESTIONS_URL}1/']}),
+    ])
+    def test_create_query_count(self, endpoint, create_item):
+        """ Creating a list of objects uses the same number of queries regardless of its length. """
+        create_question().tags.add(create_tag('existing'))
+
+        with self.assertNumQueries(self.count_queries(lambda: self.send('post', endpoint, [create_item(0)], 201))):
+            self.send('post', endpoint, [create_item(i) for i in range(1, 51)], 201)
+
+    def count_queries(self, func):
+        with CaptureQueriesContext(connection) as context:
+            func()
+
+        return len(context.captured_queries)
+
+    def test_create_errors(self):
+        """ Returns the errors of each object and creates none if any are invalid. """
+        create_tag('taken')
+        data = [{'name': 'new'}, {'name': 'taken'}, {'name': ''}, {'name': 'new'}]
+
+        errors = self.send('post', 'tags', data, 400)
+
+        self.assertEqual(errors, [{}, {'name': ['tag with this name already exists.']},
+                                  {'name': ['This field may not be blank.']},
+                                  {'name': ['tag with this name already exists.']}])
+        self.assertEqual(Tag.objects.count(), 1)
+
+    def test_create_invalid_relation(self):
+        """ Related objects that don't exist are reported for each object. """
+        data = [{'text': 'question', 'answers': [], 'tags': [f'{TAGS_URL}1/']}]
+        errors = self.send('post', 'questions', data, 400)
+        self.assertEqual(errors, [{'tags': ['Invalid hyperlink - Object does not exist.']}])
+
+    def test_create_updates_tag_index(self):
+        """ Tags and quizzes created in bulk can be filtered by tag. """
+        tag_index.build()
+        tag = create_tag('tag')
+        self.create_questions(2, [tag])
+        self.send('post', 'quizzes', [{'name': 'quiz', 'questions': [f'{QUESTIONS_URL}2/']}], 201)
+
+        self.assertEqual(tag_index.question_ids(['tag']), {1, 2})
+        self.assertEqual(tag_index.quiz_ids(['tag']), {1})
+
+    def test_create_answers_invalidates_question(self):
+        """ Creating answers changes the representation of their questions. """
+        self.create_questions(1)
+        self.assertEqual(self.client.get(f'{QUESTIONS_URL}1/').json()['data']['answers'], [])
+
+        data = [{'text': 'answer', 'is_correct_answer': True, 'question': f'{QUESTIONS_URL}1/'}] * 2
+        self.send('post', 'answers', data, 201)
+
+        question = self.client.get(f'{QUESTIONS_URL}1/').json()['data']
+        self.assertEqual(len(question['answers']), 2)
+        self.assertTrue(question['is_multiple_choice'])
+
+    @parameterized.expand([('patch',), ('put',)])
+    def test_update(self, method):
+        """ Updates every object in the list. """
+        tag = create_tag()
+        self.create_questions(2)
+        self.client.get(f'{QUESTIONS_URL}1/')
+
+        data = [{'url': f'{QUESTIONS_URL}{pk}/', 'text': f'updated_{pk}', 'answers': [], 'tags': [f'{TAGS_URL}1/']}
+                for pk in (2, 1)]
+        results = self.send(method, 'questions', data, 200)
+
+        self.assertEqual([result['text'] for result in results], ['updated_2', 'updated_1'])
+        self.assertEqual(self.client.get(f'{QUESTIONS_URL}1/').json()['data']['text'], 'updated_1')
+        self.assertEqual(list(tag.question_set.order_by('pk').values_list('text', flat=True)),
+                         ['updated_1', 'updated_2'])
+
+    def test_update_unique(self):
+        """ Objects can keep their unique values, but not take those of other objects. """
+        create_tag('a')
+        create_tag('b')
+
+        self.send('patch', 'tags', [{'url': f'{TAGS_URL}1/', 'name': 'a'}], 200)
+        errors = self.send('patch', 'tags', [{'url': f'{TAGS_URL}1/', 'name': 'b'}], 400)
+        self.assertEqual(errors, [{'name': ['tag with this name already exists.']}])
+
+    @parameterized.expand([
+        ({'text': 'a'}, {'url': ['Invalid hyperlink - No URL match.']}),
+        ({'url': f'{TAGS_URL}1/', 'text': 'a'}, {'url': ['Invalid hyperlink - No URL match.']}),
+        ({'url': f'{QUESTIONS_URL}9/', 'text': 'a'}, {'url': ['Invalid hyperlink - Object does not exist.']}),
+    ])
+    def test_update_invalid_url(self, item, expected):
+        """ Returns an error for each object that can't be found. """
+        self.create_questions(1)
+        errors = self.send('patch', 'questions', [{'url': f'{QUESTIONS_URL}1/', 'text': 'a'}, item], 400)
+        self.assertEqual(errors, [{}, expected])
+
+    def test_update_permission(self):
+        """ Users can only update objects they created. """
+        self.create_questions(1)
+        self.client.login(username=self.other.username, password=self.password)
+        self.send('patch', 'questions', [{'url': f'{QUESTIONS_URL}1/', 'text': 'a'}], 403)
+
+    def test_destroy_permission(self):
+        """ Users can only delete objects they created, and nothing is deleted if any weren't. """
+        self.create_questions(1)
+        self.client.login(username=self.other.username, password=self.password)
+        self.create_questions(1)
+
+        self.send('delete', 'questions', [f'{QUESTIONS_URL}2/', f'{QUESTIONS_URL}1/'], 403)
+        self.assertEqual(Question.objects.count(), 2)
+
+    def test_permission_query_count(self):
+        """ Checking the user may act on each object is part of the query that fetches them, with no extra queries. """
+        self.client.login(username=self.user.username, password=self.password)
+        self.create_questions(10)
+
+        with CaptureQueriesContext(connection) as context:
+            self.send('delete', 'questions', [f'{QUESTIONS_URL}{i}/' for i in range(1, 6)], 204)
+
+        # The same as an admin, who may act on any object
+        self.client.login(username=self.admin.username, password=self.password)
+
+        with self.assertNumQueries(len(context.captured_queries)):
+            self.send('delete', 'questions', [f'{QUESTIONS_URL}{i}/' for i in range(6, 11)], 204)
+
+        fetch = next(query['sql'] for query in context.captured_queries if 'has_permission' in query['sql'])
+        self.assertIn(f'"creator_id" = {self.user.pk} AS "has_permission"', fetch)
+
+    def test_destroy(self):
+        """ Deletes every object in the list. """
+        self.create_questions(3)
+        self.send('delete', 'questions', [f'{QUESTIONS_URL}1/', {'url': f'{QUESTIONS_URL}3/'}], 204)
+        self.assertEqual(list(Question.objects.values_list('pk', flat=True)), [2])
+
+    def test_max_items(self):
+        """ Lists longer than the maximum are rejected. """
+        TagViewSet.BULK_MAX_ITEMS = 2
+        self.addCleanup(setattr, TagViewSet, 'BULK_MAX_ITEMS', 10000)
+
+        self.send('post', 'tags', [{'name': f'tag_{i}'} for i in range(3)], 400)
+        self.assertEqual(Tag.objects.count(), 0)
+
+    def test_not_a_list(self):
+        """ Bulk updates and deletes require a list. """
+        self.send('patch', 'questions', {'text': 'a'}, 400)
+        self.send('delete', 'questions', {}, 400)
@@ -0,0 +1,153 @@
+from django.test import TestCase
+from parameterized import parameterized
+
+from quizzes.models import Quiz, Answer, Tag
+from quizzes.tests import create_populated_question, create_tag, create_question, UserAuthTestsMixin
+
+
+class ConditionalRequestTests(TestCase, UserAuthTestsMixin):
+    def setUp(self) -> None:
+        self.setUpTestUsers()
+        self.question = create_populated_question([True, False], 'question')
+        self.quiz = Quiz.objects.create(name='quiz', creator=self.user)
+        self.quiz.questions.add(self.question)
+
+    def assertChangesETag(self, url, change):
+        """ Asserts that the given change to the database changes the ETag of the given url. """
+        etag = self.client.get(url)['ETag']
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    @parameterized.expand([
+        ('/api/questions/',),
+        ('/api/questions/1/',),
+        ('/api/quizzes/',),
+        ('/api/quizzes/1/',),
+    ])
+    def test_validators(self, url):
+        """ Responses have an ETag and a Last-Modified time. """
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('GMT', response['Last-Modified'])
+
+    @parameterized.expand([
+        ('/api/questions/', 1),
+        ('/api/questions/1/', 1),
+        ('/api/quizzes/', 1),
+        ('/api/quizzes/1/', 1),
+    ])
+    def test_not_modified(self, url, expected_queries):
+        """ Requests with a matching ETag return 304 Not Modified without representing any objects. """
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(expected_queries):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_not_modified_since(self):
+        """ Detail requests that weren't modified since the given time return 304 Not Modified. """
+        last_modified = self.client.get('/api/questions/1/')['Last-Modified']
+        response = self.client.get('/api/questions/1/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_ignores_modified_since(self):
+        """ Lists are only validated by their ETag, as removing objects doesn't change their Last-Modified time. """
+        last_modified = self.client.get('/api/questions/')['Last-Modified']
+        response = self.client.get('/api/questions/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+
+    @parameterized.expand([
+        ('/api/questions/1/', '/api/questions/1/?format=api'),
+        ('/api/questions/', '/api/questions/?page_size=1'),
+        ('/api/questions/?page_size=1', '/api/questions/?page_size=2'),
+    ])
+    def test_etag_varies(self, url, other_url):
+        """ Different representations of the same objects have different ETags. """
+        self.assertNotEqual(self.client.get(url)['ETag'], self.client.get(other_url)['ETag'])
+
+    def test_etag_varies_by_user(self):
+        """ Users are given different ETags for the same representation. """
+        etag = self.client.get('/api/questions/1/')['ETag']
+        self.client.force_login(self.user)
+        self.assertNotEqual(self.client.get('/api/questions/1/')['ETag'], etag)
+
+    def test_unsafe_methods_ignore_preconditions(self):
+        """ Only GET and HEAD requests are answered with 304 Not Modified. """
+        etag = self.client.get('/api/questions/1/')['ETag']
+        response = self.client.head('/api/questions/1/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.force_login(self.user)
+        self.question.creator = self.user
+        self.question.save()
+        response = self.client.patch('/api/questions/1/', {'text': 'changed'}, content_type='application/json',
+                                     HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 200)
+
+    @parameterized.expand([
+        ('question', lambda test: test.question.save()),
+        ('answer', lambda test: Answer.objects.filter(question=test.question).first().save()),
+        ('new answer', lambda test: Answer.objects.create(question=test.question, text='answer')),
+        ('deleted answer', lambda test: Answer.objects.filter(question=test.question).first().delete()),
+        ('moved answer', lambda test: test.move_answer()),
+        ('tag', lambda test: test.question.tags.add(test.create_tag())),
+        ('reverse tag', lambda test: test.create_tag().question_set.add(test.question)),
+        ('deleted tag', lambda test: test.delete_tag()),
+    ])
+    def test_question_etag_changes(self, name, change):
+        """ The ETags of questions change when they or the objects they're represented with change. """
+        for url in ['/api/questions/', '/api/questions/1/']:
+            with self.subTest(url=url):
+                self.assertChangesETag(url, lambda: change(self))
+
+    @parameterized.expand([
+        ('added question', lambda test: test.quiz.questions.add(create_question('other'))),
+        ('removed question', lambda test: test.quiz.questions.remove(test.question)),
+        ('cleared questions', lambda test: test.quiz.questions.clear()),
+        ('reverse question', lambda test: create_question('other').quiz_set.add(test.quiz)),
+        ('deleted question', lambda test: test.question.delete()),
+    ])
+    def test_quiz_etag_changes(self, name, change):
+        """ The ETags of quizzes change when their questions change. """
+        self.assertChangesETag('/api/quizzes/1/', lambda: change(self))
+
+    def test_list_etag_changes_on_delete(self):
+        """ The ETag of a list changes when objects are removed from it. """
+        Quiz.objects.create(name='other')
+        self.assertChangesETag('/api/quizzes/', lambda: Quiz.objects.filter(name='other').delete())
+
+    @parameterized.expand([
+        ('/api/questions/?tags=tag',),
+        ('/api/quizzes/?tags=tag',),
+    ])
+    def test_list_etag_changes_on_leave(self, url):
+        """ The ETag of a filtered list changes when objects leave it without being deleted. """
+        tag = create_tag('tag')
+        self.question.tags.add(tag)
+        other = create_question('other')
+        other.tags.add(tag)
+        Quiz.objects.create(name='other').questions.add(other)
+
+        self.assertChangesETag(url, lambda: self.question.tags.remove(tag))
+
+    def move_answer(self):
+        answer = Answer.objects.filter(question=self.question).first()
+        answer.question = create_question('other')
+        answer.save()
+
+    def create_tag(self):
+        return create_tag(f'tag{Tag.objects.count()}')
+
+    def delete_tag(self):
+        tag = self.create_tag()
+        self.question.tags.add(tag)
+        self.client.get('/api/questions/1/')
+        tag.delete()
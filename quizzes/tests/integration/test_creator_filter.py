@@ -0,0 +1,91 @@
+from django.test import TestCase
+from parameterized import parameterized
+
+from quizzes.models import Quiz, Question, Answer
+from quizzes.query_plans import capture_queries
+from quizzes.tests import create_question, UserAuthTestsMixin
+
+
+class CreatorFilterTests(TestCase, UserAuthTestsMixin):
+    def setUp(self) -> None:
+        self.setUpTestUsers()
+
+        for user in (self.user, self.other, self.user):
+            question = Question.objects.create(text=user.username, creator=user)
+            Answer.objects.create(question=question, text=user.username, creator=user)
+            Quiz.objects.create(name=user.username, creator=user)
+
+        create_question('anonymous')
+
+    def get_urls(self, path: str):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return [row['url'] for row in response.json()['data']['results']]
+
+    def get_expected_urls(self, model, prefix: str, creator):
+        return [f'http://testserver/api/{prefix}/{pk}/' for pk in
+                model.objects.filter(creator=creator).order_by('pk').values_list('pk', flat=True)]
+
+    @parameterized.expand([
+        ('questions', lambda: Question),
+        ('answers', lambda: Answer),
+        ('quizzes', lambda: Quiz),
+    ])
+    def test_user_urls(self, prefix, model):
+        """ Lists the objects created by a user. """
+        expected = self.get_expected_urls(model(), prefix, self.user)
+
+        self.assertEqual(len(expected), 2)
+        self.assertEqual(self.get_urls(f'/api/users/{self.user.pk}/{prefix}/'), expected)
+        self.assertEqual(self.get_urls(f'/api/{prefix}/?creator={self.user.pk}'), expected)
+
+    @parameterized.expand([
+        ('questions', lambda: Question),
+        ('answers', lambda: Answer),
+        ('quizzes', lambda: Quiz),
+    ])
+    def test_me(self, prefix, model):
+        """ 'me' is the user making the request. """
+        self.client.force_login(self.other)
+        expected = self.get_expected_urls(model(), prefix, self.other)
+
+        self.assertEqual(len(expected), 1)
+        self.assertEqual(self.get_urls(f'/api/users/me/{prefix}/'), expected)
+        self.assertEqual(self.get_urls(f'/api/{prefix}/?creator=me'), expected)
+
+    def test_me_anonymous(self):
+        """ Anonymous users can't list their own objects. """
+        self.assertEqual(self.client.get('/api/quizzes/?creator=me').status_code, 401)
+        self.assertEqual(self.client.get('/api/users/me/quizzes/').status_code, 401)
+
+    def test_invalid_creator(self):
+        """ Creators that aren't ids or 'me' are rejected. """
+        self.assertEqual(self.client.get('/api/quizzes/?creator=user').status_code, 400)
+        self.assertEqual(self.client.get('/api/users/user/quizzes/').status_code, 404)
+
+    def test_unknown_creator(self):
+        """ Users that don't exist have no objects. """
+        self.assertEqual(self.get_urls('/api/users/100/quizzes/'), [])
+
+    def test_combined_filters(self):
+        """ The creator filter can be combined with a search. """
+        self.assertEqual(len(self.get_urls(f'/api/questions/?creator={self.user.pk}&search=user')), 2)
+        self.assertEqual(self.get_urls(f'/api/questions/?creator={self.other.pk}&search=user'), [])
+
+    def test_keyset_pagination(self):
+        """ Pages of a user's objects are found with an index on their creator rather than by sorting them. """
+        Quiz.objects.bulk_create([Quiz(name=str(i), creator=self.user) for i in range(5)])
+        path = f'/api/users/{self.user.pk}/quizzes/?page_size=3'
+        urls = []
+
+        while path:
+            response = self.client.get(path)
+            urls.extend(row['url'] for row in response.json()['data']['results'])
+            path = response.json()['data']['next']
+
+        self.assertEqual(urls, self.get_expected_urls(Quiz, 'quizzes', self.user))
+
+        queries = capture_queries(lambda: self.client.get(f'/api/users/{self.user.pk}/quizzes/?page_size=3'))
+        plans = [step for query in queries for depth, step in query.get_steps() if 'quizzes_quiz' in step]
+        self.assertIn('SEARCH quizzes_quiz USING INDEX quiz_creator_created_on_idx (creator_id=?)', plans)
+        self.assertFalse([step for query in queries for step in query.plan if 'TEMP B-TREE' in step])
@@ -0,0 +1,94 @@
+from django.test import TestCase
+
+from quizzes import INDEX_LATEST_QUIZ_COUNT, NO_QUIZZES_AVAILABLE_MESSAGE
+from quizzes.feed import latest_quizzes
+from quizzes.models import Quiz
+from quizzes.tests import create_quizzes, create_api_response, UserAuthTestsMixin
+
+
+class LatestQuizzesTests(TestCase, UserAuthTestsMixin):
+    def setUp(self) -> None:
+        self.setUpTestUsers()
+        latest_quizzes.clear()
+
+    def get_names(self):
+        response = self.client.get('/api/quizzes/latest/')
+        self.assertEqual(response.status_code, 200)
+        return [quiz['name'] for quiz in response.json()['data']]
+
+    def test_no_quizzes(self):
+        """ Returns a message saying there are no quizzes when none have been created. """
+        response = self.client.get('/api/quizzes/latest/')
+        self.assertEqual(response.json(), create_api_response(message=NO_QUIZZES_AVAILABLE_MESSAGE, data=[]))
+
+    def test_latest_quizzes(self):
+        """ Returns summaries of the latest quizzes, newest first. """
+        quizzes = create_quizzes(INDEX_LATEST_QUIZ_COUNT + 2)
+        quiz = quizzes[0]
+        Quiz.objects.filter(pk=quiz.pk).update(creator=self.user, description='description')
+
+        response = self.client.get('/api/quizzes/latest/')
+        data = response.json()['data']
+
+        self.assertEqual([summary['name'] for summary in data], [quiz.name for quiz in quizzes])
+        self.assertEqual(data[0], {
+            'url': f'http://testserver/api/quizzes/{quiz.pk}/',
+            'name': quiz.name,
+            'description': 'description',
+            'creator': f'http://testserver/api/users/{self.user.pk}/',
+            'created_on': self.client.get(f'/api/quizzes/{quiz.pk}/').json()['data']['created_on']
+        })
+
+    def test_warm_cache(self):
+        """ Doesn't query the database once the latest quizzes are cached. """
+        create_quizzes(3)
+        expected = self.get_names()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_names(), expected)
+
+    def test_created(self):
+        """ Quizzes are added to the cached feed as they're created, pushing out the oldest. """
+        create_quizzes(INDEX_LATEST_QUIZ_COUNT)
+        names = self.get_names()
+        Quiz.objects.create(name='new')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_names(), ['new'] + names[:-1])
+
+    def test_bulk_created(self):
+        """ Quizzes created in bulk are added to the cached feed. """
+        self.get_names()
+        self.client.force_login(self.user)
+        response = self.client.post('/api/quizzes/', [{'name': 'a', 'questions': []}, {'name': 'b', 'questions': []}],
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.client.logout()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_names(), ['b', 'a'])
+
+    def test_changed(self):
+        """ Changes to quizzes in the feed are reflected, and changes to older quizzes don't add them. """
+        create_quizzes(INDEX_LATEST_QUIZ_COUNT + 1)
+        names = self.get_names()
+        newest, oldest = Quiz.objects.get(name=names[0]), Quiz.objects.get(name='quiz_0')
+
+        newest.name = 'renamed'
+        newest.save()
+        oldest.name = 'old'
+        oldest.save()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_names(), ['renamed'] + names[1:])
+
+    def test_deleted(self):
+        """ Deleting a quiz in the feed replaces it with the next latest quiz. """
+        create_quizzes(INDEX_LATEST_QUIZ_COUNT + 1)
+        names = self.get_names()
+        Quiz.objects.get(name=names[0]).delete()
+
+        self.assertEqual(self.get_names(), names[1:] + ['quiz_0'])
+
+        Quiz.objects.all().delete()
+        self.assertEqual(self.get_names(), [])
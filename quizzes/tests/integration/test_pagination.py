@@ -0,0 +1,115 @@
+import json
+from base64 import urlsafe_b64encode
+
+from django.test import TestCase
+from parameterized import parameterized
+
+from quizzes.tests import create_question, create_quizzes, create_tag, MockedTestCase
+
+
+class KeysetPaginationTests(MockedTestCase):
+    def get(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def get_all(self, url, params=None, link='next'):
+        """ Follows the given link from the first page to the last, returning the url of each result. """
+        pages = []
+        data = self.get(url, params)
+
+        while True:
+            pages.append([result['url'] for result in data['results']])
+            if data[link] is None:
+                return pages
+            data = self.get(data[link])
+
+    def test_pages(self):
+        """ Following 'next' returns each row once and in order, following 'previous' returns the same pages. """
+        for i in range(25):
+            create_question(f'question{i}')
+
+        pages = self.get_all('/api/questions/', {'page_size': 10})
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(sum(pages, []), [f'http://testserver/api/questions/{pk}/' for pk in range(1, 26)])
+
+        last_page = self.get('/api/questions/', {'page_size': 10})
+        while last_page['next']:
+            last_page = self.get(last_page['next'])
+
+        self.assertEqual(self.get_all(last_page['previous'], link='previous'), pages[1::-1])
+
+    def test_equal_ordering_values(self):
+        """ Quizzes are ordered by creation date, rows created at the same time are ordered by pk. """
+        # The current time is mocked, so every quiz is created at the same time
+        create_quizzes(5)
+
+        pages = self.get_all('/api/quizzes/', {'page_size': 2})
+        self.assertEqual(sum(pages, []), [f'http://testserver/api/quizzes/{pk}/' for pk in range(1, 6)])
+
+    def test_page_size_limit(self):
+        """ Page sizes larger than the maximum are reduced to the maximum. """
+        for i in range(101):
+            create_question(f'question{i}')
+
+        self.assertEqual(len(self.get('/api/questions/', {'page_size': 1000})['results']), 100)
+
+    def test_search_results(self):
+        """ Search results ordered by relevance are paginated by offset. """
+        for i in range(5):
+            create_question('planet ' * (i + 1))
+
+        pages = self.get_all('/api/questions/', {'search': 'planet', 'page_size': 2})
+        self.assertEqual(sum(pages, []), [f'http://testserver/api/questions/{pk}/' for pk in range(5, 0, -1)])
+
+    def test_ranked_search_results(self):
+        """ Search results ordered by relevance without matching related rows are paginated by offset. """
+        for i in range(5):
+            create_tag('tag' + ' tag' * i)
+
+        pages = self.get_all('/api/tags/', {'search': 'tag', 'page_size': 2})
+        self.assertEqual(sum(pages, []), [f'http://testserver/api/tags/{pk}/' for pk in range(5, 0, -1)])
+
+    @parameterized.expand([
+        ('invalid',),
+        ('eyJwIjoxfQ==',),  # {"p":1}
+        ('eyJwIjpbMSwyXX0=',),  # {"p":[1,2]}
+        ('eyJvIjotMX0=',),  # {"o":-1}
+    ])
+    def test_invalid_cursor(self, cursor):
+        """ Returns a 404 for cursors that weren't created by the paginator. """
+        response = self.client.get('/api/questions/', {'cursor': cursor})
+        self.assertEqual(response.status_code, 404)
+
+
+    @parameterized.expand([
+        ('/api/questions/', ['abc']),
+        ('/api/questions/', [None]),
+        ('/api/questions/', [[1]]),
+        ('/api/quizzes/', ['abc', 1]),
+        ('/api/quizzes/', ['2020-01-01T00:00:00', 'abc']),
+        ('/api/quizzes/', [{}, 1]),
+    ])
+    def test_malformed_cursor_position(self, path, position):
+        """ Returns a 404 for cursors with positions that aren't values of the ordering's fields. """
+        create_question('question')
+        create_quizzes(1)
+        cursor = urlsafe_b64encode(json.dumps({'p': position}).encode()).decode()
+        response = self.client.get(path, {'cursor': cursor})
+        self.assertEqual(response.status_code, 404)
+
+
+class KeysetPaginationQueryTests(TestCase):
+    def test_later_page_query_count(self):
+        """ Later pages are fetched with the same queries as the first, without counting rows. """
+        for i in range(30):
+            create_question(f'question{i}')
+
+        first_page = self.client.get('/api/questions/', {'page_size': 10}).json()['data']
+
+        # Validators, questions (with correct answer counts), answers and tags
+        with self.assertNumQueries(4):
+            response = self.client.get(first_page['next'])
+
+        self.assertEqual(len(response.json()['data']['results']), 10)
+
@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.test import TestCase
+from parameterized import parameterized
+
+from quizzes.models import Quiz, Question, Answer, Tag
+from quizzes.tests import UserAuthTestsMixin
+from utils.pagination import KeysetPagination
+
+
+class QueryCountTests(TestCase, UserAuthTestsMixin):
+    """ Pins the number of queries each endpoint runs so related objects are never fetched once per row. """
+
+    def setUp(self) -> None:
+        self.setUpTestUsers()
+
+        # Return every row on a single page so the whole result set is serialized
+        patcher = mock.patch.object(KeysetPagination, 'page_size', 100)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_rows(self, number_of_rows):
+        """ Creates the given number of tags, questions (each with answers and tags), answers and quizzes. """
+        for i in range(number_of_rows):
+            tag = Tag.objects.create(name=f'tag_{i}')
+            question = Question.objects.create(text=f'question_{i}', creator=self.user)
+            question.tags.add(tag)
+            Answer.objects.create(question=question, text='answer', is_correct_answer=True, creator=self.user)
+            quiz = Quiz.objects.create(name=f'quiz_{i}', creator=self.user)
+            quiz.questions.add(question)
+
+    @parameterized.expand([
+        # Tags
+        ('tags', 1, 1),
+        ('tags', 10, 1),
+        ('tags', 100, 1),
+        # Validators, questions (with correct answer counts), answers and tags
+        ('questions', 1, 4),
+        ('questions', 10, 4),
+        ('questions', 100, 4),
+        # Answers
+        ('answers', 1, 1),
+        ('answers', 10, 1),
+        ('answers', 100, 1),
+        # Validators, quizzes and questions
+        ('quizzes', 1, 3),
+        ('quizzes', 10, 3),
+        ('quizzes', 100, 3),
+    ])
+    def test_list_view(self, endpoint, number_of_rows, expected):
+        """ Listing an endpoint runs a fixed number of queries regardless of the number of rows. """
+        self.create_rows(number_of_rows)
+
+        with self.assertNumQueries(expected):
+            response = self.client.get(f'/api/{endpoint}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']['results']), number_of_rows)
+
+    @parameterized.expand([
+        ('tags', 1, 1),
+        ('tags', 10, 1),
+        ('tags', 100, 1),
+        ('questions', 1, 3),
+        ('questions', 10, 3),
+        ('questions', 100, 3),
+        ('answers', 1, 1),
+        ('answers', 10, 1),
+        ('answers', 100, 1),
+        ('quizzes', 1, 2),
+        ('quizzes', 10, 2),
+        ('quizzes', 100, 2),
+    ])
+    def test_detail_view(self, endpoint, number_of_rows, expected):
+        """ Retrieving an object runs a fixed number of queries regardless of the number of rows. """
+        self.create_rows(number_of_rows)
+
+        with self.assertNumQueries(expected):
+            response = self.client.get(f'/api/{endpoint}/{number_of_rows}/')
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,70 @@
+import io
+
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import TestCase
+from parameterized import parameterized
+
+from quizzes.models import Quiz
+from quizzes.query_plans import Query, FULL_SCAN, INDEX_SCAN
+from quizzes.tests import create_populated_question, create_tag, UserAuthTestsMixin
+
+
+class QueryPlanTests(TestCase, UserAuthTestsMixin):
+    def setUp(self) -> None:
+        self.setUpTestUsers()
+        question = create_populated_question([True, False], 'test question')
+        question.tags.add(create_tag('python'))
+        Quiz.objects.create(name='test quiz', creator=self.user).questions.add(question)
+
+    @parameterized.expand([
+        ('search', 'SELECT * FROM a WHERE id = 1', ['SEARCH a USING INTEGER PRIMARY KEY (rowid=?)'], []),
+        ('scan', 'SELECT * FROM a', ['SCAN a'], [FULL_SCAN]),
+        ('old format', 'SELECT * FROM a', ['SCAN TABLE a'], [FULL_SCAN]),
+        ('scan with index', 'SELECT * FROM a', ['SCAN a USING INDEX a_b'], [FULL_SCAN]),
+        ('covering index', 'SELECT MAX(b) FROM a', ['SCAN a USING COVERING INDEX a_b'], [INDEX_SCAN]),
+        ('page', 'SELECT * FROM a ORDER BY id LIMIT 10', ['SCAN a'], []),
+        ('sorted page', 'SELECT * FROM a ORDER BY b LIMIT 10', ['SCAN a', 'USE TEMP B-TREE FOR ORDER BY'],
+         [FULL_SCAN]),
+        ('limit without order', "SELECT * FROM a WHERE b = 'x' LIMIT 21", ['SCAN a'], [FULL_SCAN]),
+        ('limit of subquery', 'SELECT * FROM a WHERE b IN (SELECT c FROM d ORDER BY id LIMIT 10)',
+         ['SCAN a', 'LIST SUBQUERY 1', '  SCAN d'], [FULL_SCAN, FULL_SCAN]),
+        ('scan in subquery of page', 'SELECT *, (SELECT COUNT(*) FROM d WHERE d.c = a.c) FROM a ORDER BY id LIMIT 10',
+         ['SCAN a', 'CORRELATED SCALAR SUBQUERY 1', '  SCAN d'], [FULL_SCAN]),
+        ('inner loop of page', 'SELECT * FROM a, d WHERE a.c = d.c ORDER BY a.id LIMIT 10', ['SCAN a', 'SCAN d'],
+         [FULL_SCAN]),
+        ('virtual table', 'SELECT * FROM a_fts', ['SCAN a_fts VIRTUAL TABLE INDEX 0:M1'], []),
+        ('subquery', 'SELECT * FROM (SELECT 1)', ['SCAN (subquery-1)', 'SCAN CONSTANT ROW'], []),
+    ])
+    def test_find_scans(self, name, sql, plan, expected):
+        """ Finds steps that scan every row of a table or index. """
+        self.assertEqual([kind for step, kind in Query(sql, (), plan).find_scans()], expected)
+
+    def test_no_full_scans(self):
+        """ No request to a viewset does a full scan. """
+        output = io.StringIO()
+        call_command('check_query_plans', stdout=output)
+        self.assertIn('No full scans found', output.getvalue())
+        self.assertIn('/api/questions/?search=test', output.getvalue())
+
+    def test_failed_request(self):
+        """ Fails if a request doesn't succeed, as its queries aren't those being checked. """
+        Quiz.objects.all().delete()
+        output = io.StringIO()
+
+        with self.assertRaisesMessage(CommandError, "requests didn't succeed"):
+            call_command('check_query_plans', stdout=output)
+
+        self.assertIn('/api/quizzes/1/ (1 queries)\n    status 404', output.getvalue())
+
+    def test_full_scan(self):
+        """ Fails if a request does a full scan, e.g. sorting every quiz without an index on their creation times. """
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX quiz_created_on_idx')
+
+        output = io.StringIO()
+
+        with self.assertRaisesMessage(CommandError, 'full scans found'):
+            call_command('check_query_plans', stdout=output)
+
+        self.assertIn('full scan: SCAN quizzes_quiz', output.getvalue())
@@ -1,4 +1,9 @@
-from quizzes.tests import create_api_response, create_question, MockedTestCase
+from unittest import mock
+
+from quizzes.models import Question
+from quizzes.serializers import QuestionSerializer
+from quizzes.tests import create_api_response, create_question, MockedTestCase, create_populated_question, create_tag
+from quizzes.views import QuestionViewSet
 
 
 class QuestionTests(MockedTestCase):
@@ -7,7 +12,6 @@ class QuestionTests(MockedTestCase):
         """ Returns an empty array when there are no results. """
         expected = create_api_response(
             data={
-                "count": 0,
                 "next": None,
                 "previous": None,
                 "results": []
@@ -23,8 +27,7 @@ class QuestionTests(MockedTestCase):
         create_question('question2')
 
         expected = create_api_response(
-            data={'count': 2,
-                  'next': None,
+            data={'next': None,
                   'previous': None,
                   'results': [
                       {'answers': [],
@@ -76,3 +79,44 @@ class QuestionTests(MockedTestCase):
         response = self.client.get('/api/questions/1', follow=True)
         self.assertEqual(response.status_code, 404)
         self.assertJSONEqual(response.content.decode(), expected)
+
+    def test_list_view_query_count(self):
+        """ Listing a page of 100 questions uses a constant number of queries. """
+        tag = create_tag()
+
+        for i in range(100):
+            question = create_populated_question([True, i % 2 == 0, False], f'question{i}')
+            question.tags.add(tag)
+
+        # Validators, questions (with correct answer counts), answers and tags
+        with mock.patch.object(QuestionViewSet.pagination_class, 'page_size', 100):
+            with self.assertNumQueries(4):
+                response = self.client.get('/api/questions/')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['data']['results']
+        self.assertEqual(len(results), 100)
+        self.assertEqual([result['is_multiple_choice'] for result in results], [i % 2 == 0 for i in range(100)])
+
+    def test_detail_view_query_count(self):
+        """ Retrieving a question uses a constant number of queries. """
+        create_populated_question([True, True, False])
+
+        # Question (with correct answer count), answers and tags
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/questions/1/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['data']['is_multiple_choice'])
+
+    def test_answer_order(self):
+        """ Answers are listed in the order they were created, whether or not they're correct. """
+        create_populated_question([True, False, True])
+        expected = [f'http://testserver/api/answers/{pk}/' for pk in (1, 2, 3)]
+
+        self.assertEqual(self.client.get('/api/questions/').json()['data']['results'][0]['answers'], expected)
+        self.assertEqual(self.client.get('/api/questions/1/').json()['data']['answers'], expected)
+
+        # Prefetched answers (e.g. when saving questions) are in the same order
+        question = Question.objects.prefetch_related(*QuestionSerializer.Meta.prefetch_related).get()
+        self.assertEqual([answer.pk for answer in question.answers.all()], [1, 2, 3])
@@ -1,15 +1,18 @@
-from quizzes.tests import create_api_response, create_question, MockedTestCase, create_quizzes
+from parameterized import parameterized
 
+from quizzes.tests import create_api_response, create_question, MockedTestCase, create_quizzes, create_quiz, \
+    create_populated_question, create_tag, UserAuthTestsMixin
 
-class QuizTests(MockedTestCase):
+
+class QuizTests(MockedTestCase, UserAuthTestsMixin):
     def setUp(self) -> None:
+        self.setUpTestUsers()
         self.question = create_question()
 
     def test_list_view_empty(self):
         """ Returns an empty array when there are no results. """
         expected = create_api_response(
             data={
-                "count": 0,
                 "next": None,
                 "previous": None,
                 "results": []
@@ -24,7 +27,6 @@ class QuizTests(MockedTestCase):
         create_quizzes(2)
         expected = create_api_response(
             data={
-                "count": 2,
                 "next": None,
                 "previous": None,
                 "results": [
@@ -71,3 +73,116 @@ class QuizTests(MockedTestCase):
         response = self.client.get('/api/quizzes/1', follow=True)
         self.assertEqual(response.status_code, 404)
         self.assertJSONEqual(response.content.decode(), expected)
+
+    def test_attempt(self):
+        """ Returns the score of an attempt and whether each question was answered correctly. """
+        quiz = create_quiz()
+        first = create_populated_question([True, False])
+        second = create_populated_question([True, True, False])
+        quiz.questions.add(first, second)
+
+        expected = create_api_response(data={
+            'score': 1,
+            'total': 2,
+            'questions': [
+                {'question': f'http://testserver/api/questions/{first.pk}/',
+                 'is_correct': True,
+                 'is_multiple_choice': False,
+                 'chosen_answers': ['http://testserver/api/answers/1/'],
+                 'correct_answers': ['http://testserver/api/answers/1/']},
+                {'question': f'http://testserver/api/questions/{second.pk}/',
+                 'is_correct': False,
+                 'is_multiple_choice': True,
+                 'chosen_answers': ['http://testserver/api/answers/3/'],
+                 'correct_answers': ['http://testserver/api/answers/3/', 'http://testserver/api/answers/4/']}
+            ]
+        })
+
+        # Quiz, grading, recording votes (refreshing statistics in a savepoint and invalidating representations) and
+        # recording the attempt
+        with self.assertNumQueries(11):
+            response = self.client.post(f'/api/quizzes/{quiz.pk}/attempt/', data={'answers': [1, 3]},
+                                        content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertJSONEqual(response.content.decode(), expected)
+        self.assertEqual(list(first.answers.order_by('pk').values_list('votes', flat=True)), [1, 0])
+
+    def test_attempt_invalid_answer(self):
+        """ Returns a bad request response when an answer doesn't belong to the quiz. """
+        quiz = create_quiz()
+        other = create_populated_question([True])
+        expected = create_api_response(400, "Bad Request", data={
+            'answers': ['Invalid answer ids [1] - answers do not belong to this quiz.']
+        })
+
+        response = self.client.post(f'/api/quizzes/{quiz.pk}/attempt/', data={'answers': [1]},
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertJSONEqual(response.content.decode(), expected)
+        self.assertEqual(other.answers.get().votes, 0)
+
+    def create_bundle_quiz(self, creator=None):
+        quiz = create_quiz()
+        quiz.creator = creator
+        quiz.save()
+        question = create_populated_question([True, False], 'bundled')
+        question.tags.add(create_tag('b'), create_tag('a'))
+        quiz.questions.add(question)
+        return quiz
+
+    def test_bundle(self):
+        """ Returns a quiz with its questions, answers and tag names embedded. """
+        quiz = self.create_bundle_quiz()
+        expected = create_api_response(data={
+            'url': f'http://testserver/api/quizzes/{quiz.pk}/',
+            'creator': None,
+            'name': 'quiz_0',
+            'description': '',
+            'questions': [
+                {'url': 'http://testserver/api/questions/2/',
+                 'text': 'bundled',
+                 'description': '',
+                 'is_multiple_choice': False,
+                 'tags': ['a', 'b'],
+                 'answers': [
+                     {'url': 'http://testserver/api/answers/1/', 'text': 'answer', 'votes': 0,
+                      'is_correct_answer': True},
+                     {'url': 'http://testserver/api/answers/2/', 'text': 'answer', 'votes': 0,
+                      'is_correct_answer': False}
+                 ],
+                 'created_on': '2020-01-01T13:00:00+13:00',
+                 'updated_on': '2020-01-01T13:00:00+13:00'}
+            ],
+            'created_on': '2020-01-01T13:00:00+13:00',
+            'updated_on': '2020-01-01T13:00:00+13:00'
+        })
+
+        # Quiz, questions, answers and tags
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/api/quizzes/{quiz.pk}/bundle/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertJSONEqual(response.content.decode(), expected)
+
+    @parameterized.expand([
+        ('user', False),
+        ('other', True),
+        ('admin', False),
+        ('anonymous', True)
+    ])
+    def test_bundle_hide_correct_answers(self, user_field, expected_hidden):
+        """ Correct answers can be hidden from users other than the quiz's creator and admins. """
+        user = getattr(self, user_field)
+        quiz = self.create_bundle_quiz(creator=self.user)
+
+        if not user.is_anonymous:
+            is_authenticated = self.client.login(username=user.username, password=self.password)
+            self.assertTrue(is_authenticated)
+
+        response = self.client.get(f'/api/quizzes/{quiz.pk}/bundle/?hide_correct_answers=true')
+
+        self.assertEqual(response.status_code, 200)
+        answers = response.json()['data']['questions'][0]['answers']
+        self.assertEqual(['is_correct_answer' in answer for answer in answers], [not expected_hidden] * 2)
@@ -0,0 +1,113 @@
+import warnings
+
+from django.core.cache import CacheKeyWarning
+from django.test import TestCase
+from parameterized import parameterized
+
+from quizzes.cache import representation_cache
+from quizzes.models import Answer
+from quizzes.tests import create_quiz, create_populated_question, create_tag, UserAuthTestsMixin
+
+
+class RepresentationCacheTests(TestCase, UserAuthTestsMixin):
+    def setUp(self) -> None:
+        self.setUpTestUsers()
+        self.quiz = create_quiz()
+        self.question = create_populated_question([True, False])
+        self.quiz.questions.add(self.question)
+
+    def get(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    @parameterized.expand([
+        ('/api/quizzes/1/',),
+        ('/api/quizzes/1/bundle/',),
+        ('/api/questions/1/',),
+    ])
+    def test_cache_hit(self, path):
+        """ Cached representations are returned with only a query for the object itself. """
+        expected = self.get(path)
+        hits = representation_cache.hits
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get(path), expected)
+
+        self.assertEqual(representation_cache.hits, hits + 1)
+
+    @parameterized.expand([
+        ('/api/quizzes/1/',),
+        ('/api/quizzes/1/bundle/?hide_correct_answers=true',),
+        ('/api/questions/1/',),
+    ])
+    def test_cache_keys(self, path):
+        """ Representations are cached with keys that are valid for every cache backend, e.g. memcached. """
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.get(path)
+            self.get(path)
+
+        self.assertFalse([warning for warning in caught if issubclass(warning.category, CacheKeyWarning)])
+
+    def test_cache_miss(self):
+        """ Representations are built on a cache miss. """
+        misses = representation_cache.misses
+        self.get('/api/quizzes/1/')
+        self.assertEqual(representation_cache.misses, misses + 1)
+
+    def test_invalidated_by_answer_change(self):
+        """ Changing an answer invalidates the bundle of quizzes containing its question. """
+        self.get('/api/quizzes/1/bundle/')
+        Answer.objects.filter(pk=1).get().delete()
+
+        bundle = self.get('/api/quizzes/1/bundle/')
+        self.assertEqual(len(bundle['questions'][0]['answers']), 1)
+
+    @parameterized.expand([
+        ('/api/answers/vote/',),
+        ('/api/quizzes/1/attempt/',),
+    ])
+    def test_invalidated_by_votes(self, path):
+        """ Voting for answers invalidates the bundles of quizzes containing their questions. """
+        self.get('/api/quizzes/1/bundle/')
+        response = self.client.post(path, {'answers': [1]}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        bundle = self.get('/api/quizzes/1/bundle/')
+        self.assertEqual([answer['votes'] for answer in bundle['questions'][0]['answers']], [1, 0])
+
+    def test_invalidated_by_quiz_questions_change(self):
+        """ Adding a question to a quiz invalidates the quiz's representations. """
+        self.get('/api/quizzes/1/')
+        self.quiz.questions.add(create_populated_question([True]))
+
+        self.assertEqual(len(self.get('/api/quizzes/1/')['questions']), 2)
+
+    def test_invalidated_by_question_tags_change(self):
+        """ Tagging a question invalidates the representations of the question and quizzes containing it. """
+        self.get('/api/questions/1/')
+        self.get('/api/quizzes/1/bundle/')
+        tag = create_tag('tag')
+        tag.question_set.add(self.question)
+
+        self.assertEqual(self.get('/api/questions/1/')['tags'], ['http://testserver/api/tags/1/'])
+        self.assertEqual(self.get('/api/quizzes/1/bundle/')['questions'][0]['tags'], ['tag'])
+
+    def test_invalidated_by_tag_rename(self):
+        """ Renaming a tag invalidates the bundles of quizzes containing questions with the tag. """
+        tag = create_tag('tag')
+        self.question.tags.add(tag)
+        self.get('/api/quizzes/1/bundle/')
+
+        tag.name = 'renamed'
+        tag.save()
+
+        self.assertEqual(self.get('/api/quizzes/1/bundle/')['questions'][0]['tags'], ['renamed'])
+
+    def test_cache_stats(self):
+        """ Admin users can view cache hit and miss counts. """
+        is_authenticated = self.client.login(username=self.admin.username, password=self.password)
+        self.assertTrue(is_authenticated)
+
+        self.assertEqual(self.get('/api/quizzes/cache-stats/'), representation_cache.stats())
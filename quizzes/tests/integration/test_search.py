@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from parameterized import parameterized
+
+from quizzes.models import Question
+from quizzes.tests import create_question, create_tag, create_answer, create_quiz
+
+
+class FullTextSearchTests(TestCase):
+    def setUp(self) -> None:
+        self.capital = create_question('What is the capital of France?')
+        self.planet = create_question('Which planet is closest to the sun?')
+        self.planet.description = 'Think about the inner planets of our solar system'
+        self.planet.save()
+        self.planet.tags.add(create_tag('astronomy'))
+
+    def search(self, endpoint, search):
+        response = self.client.get(f'/api/{endpoint}/', {'search': search})
+        self.assertEqual(response.status_code, 200)
+        return [result['url'] for result in response.json()['data']['results']]
+
+    @parameterized.expand([
+        ('capital', [1]),
+        ('CAPITAL france', [1]),
+        ('cap', [1]),
+        ('solar', [2]),
+        ('astro', [2]),
+        ('capital solar', []),
+        ('the', [1, 2]),
+    ])
+    def test_search_questions(self, search, expected_ids):
+        """ Returns questions whose text, description or tags contain every search term. """
+        expected = [f'http://testserver/api/questions/{pk}/' for pk in expected_ids]
+        self.assertEqual(self.search('questions', search), expected)
+
+    def test_search_ranking(self):
+        """ Results are ordered by relevance. """
+        create_question('planet planet planet')
+        self.assertEqual(self.search('questions', 'planet'), ['http://testserver/api/questions/3/',
+                                                              'http://testserver/api/questions/2/'])
+
+    @parameterized.expand([
+        ('"',),
+        ('*',),
+        ('AND OR NOT',),
+        ('NEAR(',),
+        ('-:^',),
+    ])
+    def test_search_special_characters(self, search):
+        """ Characters with special meaning in full-text queries don't cause errors. """
+        self.search('questions', search)
+
+    def test_index_updated(self):
+        """ The index is updated when questions are changed or deleted. """
+        self.capital.text = 'What is the capital of Germany?'
+        self.capital.save()
+        self.assertEqual(self.search('questions', 'france'), [])
+        self.assertEqual(self.search('questions', 'germany'), ['http://testserver/api/questions/1/'])
+
+        Question.objects.filter(pk=self.capital.pk).delete()
+        self.assertEqual(self.search('questions', 'germany'), [])
+
+    def test_search_answers(self):
+        """ Returns answers whose text, question or question's tags contain the search terms. """
+        create_answer(self.capital, True)
+        create_answer(self.planet, True)
+        self.assertEqual(self.search('answers', 'astronomy'), ['http://testserver/api/answers/2/'])
+        self.assertEqual(self.search('answers', 'answer'), ['http://testserver/api/answers/1/',
+                                                            'http://testserver/api/answers/2/'])
+
+    def test_search_quizzes(self):
+        """ Returns quizzes whose name, description, questions or questions' tags contain the search terms. """
+        quiz = create_quiz()
+        quiz.questions.add(self.planet, self.capital)
+        self.assertEqual(self.search('quizzes', 'astronomy'), ['http://testserver/api/quizzes/1/'])
+        self.assertEqual(self.search('quizzes', 'quiz_0'), ['http://testserver/api/quizzes/1/'])
+        self.assertEqual(self.search('quizzes', 'germany'), [])
+
+    def test_search_tags(self):
+        """ Returns tags whose name contains the search terms. """
+        self.assertEqual(self.search('tags', 'astro'), ['http://testserver/api/tags/1/'])
+
+    @parameterized.expand([
+        ('questions',),
+        ('answers',),
+        ('quizzes',),
+    ])
+    def test_search_creator(self, endpoint):
+        """ Returns the objects created by a user whose username or email is the search, ignoring case. """
+        user = get_user_model().objects.create_user('Marie', email='marie@example.com')
+        quiz = create_quiz()
+        create_answer(self.planet, True)
+
+        for instance in (self.planet, self.planet.answers.get(), quiz):
+            type(instance).objects.filter(pk=instance.pk).update(creator=user)
+
+        expected = self.search(endpoint, 'marie')
+        self.assertEqual(len(expected), 1)
+        self.assertEqual(self.search(endpoint, 'MARIE@example.com'), expected)
+        self.assertEqual(self.search(endpoint, 'mar'), [])
+        self.assertEqual(self.search(endpoint, 'marie curie'), [])
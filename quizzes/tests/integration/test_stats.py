@@ -0,0 +1,204 @@
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from quizzes.models import Quiz, Question, QuestionStats, QuizStats
+from quizzes.tests import create_answer, create_populated_question, create_question, UserAuthTestsMixin
+from quizzes.votes import record_votes
+
+
+class StatsTests(TestCase, UserAuthTestsMixin):
+    def setUp(self) -> None:
+        self.setUpTestUsers()
+        self.question = create_populated_question([True, False, False], 'question')
+        self.other_question = create_populated_question([True, True], 'other')
+        self.quiz = Quiz.objects.create(name='quiz', creator=self.user)
+        self.quiz.questions.add(self.question, self.other_question)
+
+    def assertStats(self, instance, **expected):
+        stats = type(instance.stats).objects.get(pk=instance.pk)
+        self.assertEqual({name: getattr(stats, name) for name in expected}, expected)
+
+    def attempt(self, answer_ids):
+        response = self.client.post(f'/api/quizzes/{self.quiz.pk}/attempt/', data={'answers': answer_ids},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_created(self):
+        """ Questions and quizzes are created with statistics. """
+        self.assertStats(self.question, answer_count=3, correct_answer_count=1, vote_count=0, attempt_count=0)
+        self.assertStats(self.quiz, question_count=2, answer_count=5, correct_answer_count=3, vote_count=0)
+        self.assertStats(Quiz.objects.create(name='empty'), question_count=0, answer_count=0)
+
+    def test_answers_changed(self):
+        """ Statistics are refreshed when answers are created, changed, moved or deleted. """
+        answer = create_answer(self.question, True)
+        self.assertStats(self.question, answer_count=4, correct_answer_count=2)
+        self.assertStats(self.quiz, answer_count=6, correct_answer_count=4)
+
+        answer.is_correct_answer = False
+        answer.save()
+        self.assertStats(self.question, answer_count=4, correct_answer_count=1)
+
+        answer.question = self.other_question
+        answer.save()
+        self.assertStats(self.question, answer_count=3, correct_answer_count=1)
+        self.assertStats(self.other_question, answer_count=3, correct_answer_count=2)
+
+        answer.delete()
+        self.assertStats(self.other_question, answer_count=2, correct_answer_count=2)
+        self.assertStats(self.quiz, answer_count=5, correct_answer_count=3)
+
+    def test_bulk_answers(self):
+        """ Statistics are refreshed when answers are created in bulk. """
+        self.client.force_login(self.user)
+        url = f'http://testserver/api/questions/{self.question.pk}/'
+        response = self.client.post('/api/answers/', [{'question': url, 'text': 'a', 'is_correct_answer': True}] * 2,
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertStats(self.question, answer_count=5, correct_answer_count=3)
+        self.assertStats(self.quiz, answer_count=7)
+
+    def test_bulk_questions(self):
+        """ Questions and quizzes created in bulk are created with statistics. """
+        self.client.force_login(self.user)
+        response = self.client.post('/api/quizzes/', [{'name': 'a', 'questions': []}] * 2,
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(QuizStats.objects.count(), 3)
+
+    def test_votes(self):
+        """ Statistics are refreshed when answers are voted for. """
+        answer_ids = list(self.question.answers.values_list('pk', flat=True))
+        response = self.client.post('/api/answers/vote/', {'answers': answer_ids},
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertStats(self.question, vote_count=len(answer_ids))
+        self.assertStats(self.other_question, vote_count=0)
+        self.assertStats(self.quiz, vote_count=len(answer_ids))
+
+    def test_quiz_questions_changed(self):
+        """ Quiz statistics are refreshed when questions are added, removed, cleared or deleted. """
+        self.quiz.questions.remove(self.other_question)
+        self.assertStats(self.quiz, question_count=1, answer_count=3, correct_answer_count=1)
+
+        self.other_question.quiz_set.add(self.quiz)
+        self.assertStats(self.quiz, question_count=2, answer_count=5)
+
+        self.question.delete()
+        self.assertStats(self.quiz, question_count=1, answer_count=2)
+
+        self.other_question.quiz_set.clear()
+        self.assertStats(self.quiz, question_count=0, answer_count=0, correct_answer_count=0)
+
+        self.quiz.questions.add(self.other_question)
+        self.quiz.questions.clear()
+        self.assertStats(self.quiz, question_count=0)
+
+    def test_attempts(self):
+        """ Attempts are added to the statistics of the quiz and its questions. """
+        correct = list(self.question.answers.filter(is_correct_answer=True).values_list('pk', flat=True)) + \
+            list(self.other_question.answers.filter(is_correct_answer=True).values_list('pk', flat=True))
+        self.attempt(correct)
+        self.attempt(correct[:1])
+
+        self.assertStats(self.quiz, attempt_count=2, perfect_attempt_count=1, total_score=3, vote_count=4)
+        self.assertStats(self.question, attempt_count=2, correct_attempt_count=2)
+        self.assertStats(self.other_question, attempt_count=2, correct_attempt_count=1)
+
+    def test_question_stats_view(self):
+        """ Returns a question's statistics and the votes of each answer. """
+        answer_ids = list(self.question.answers.order_by('pk').values_list('pk', flat=True))
+        record_votes([answer_ids[0]] * 3 + [answer_ids[1]])
+        self.attempt(answer_ids[:1])
+
+        # Statistics (with the question) and answers
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/questions/{self.question.pk}/stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], {
+            'question': f'http://testserver/api/questions/{self.question.pk}/',
+            'answer_count': 3,
+            'correct_answer_count': 1,
+            'vote_count': 5,
+            'attempt_count': 1,
+            'correct_attempt_count': 1,
+            'correct_attempt_rate': 1.0,
+            'answers': [
+                {'answer': f'http://testserver/api/answers/{answer_ids[0]}/', 'votes': 4, 'vote_share': 0.8},
+                {'answer': f'http://testserver/api/answers/{answer_ids[1]}/', 'votes': 1, 'vote_share': 0.2},
+                {'answer': f'http://testserver/api/answers/{answer_ids[2]}/', 'votes': 0, 'vote_share': 0.0},
+            ]
+        })
+
+    def test_quiz_stats_view(self):
+        """ Returns a quiz's statistics without counting anything. """
+        # Statistics (with the quiz), whose creator permissions are checked against by id
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/quizzes/{self.quiz.pk}/stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], {
+            'quiz': f'http://testserver/api/quizzes/{self.quiz.pk}/',
+            'question_count': 2,
+            'answer_count': 5,
+            'correct_answer_count': 3,
+            'vote_count': 0,
+            'attempt_count': 0,
+            'perfect_attempt_count': 0,
+            'perfect_attempt_rate': None,
+            'mean_score': None
+        })
+
+    def test_stats_view_not_found(self):
+        """ Returns 404 for objects that don't exist. """
+        self.assertEqual(self.client.get('/api/quizzes/100/stats/').status_code, 404)
+        self.assertEqual(self.client.get('/api/questions/abc/stats/').status_code, 404)
+
+    def test_missing_stats_created(self):
+        """ Statistics that are missing are created when requested. """
+        QuestionStats.objects.all().delete()
+        response = self.client.get(f'/api/questions/{self.question.pk}/stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['answer_count'], 3)
+
+    def test_rebuild(self):
+        """ The rebuild_stats command recounts every statistic and creates missing ones, keeping attempt counts. """
+        self.attempt([])
+        QuestionStats.objects.filter(pk=self.question.pk).update(answer_count=100, vote_count=100)
+        QuizStats.objects.update(question_count=100)
+        Question.objects.bulk_create([Question(text='unsignalled')])
+
+        with open(os.devnull, 'w') as devnull:
+            call_command('rebuild_stats', stdout=devnull)
+
+        self.assertStats(self.question, answer_count=3, vote_count=0, attempt_count=1)
+        self.assertStats(self.quiz, question_count=2, attempt_count=1)
+        self.assertStats(Question.objects.get(text='unsignalled'), answer_count=0)
+        self.assertEqual(QuestionStats.objects.count(), Question.objects.count())
+
+    def test_import(self):
+        """ Imported questions and quizzes are created with statistics. """
+        create_question('unlinked')
+        QuestionStats.objects.all().delete()
+
+        path = os.path.join(self.directory(), 'export.ndjson')
+        with open(os.devnull, 'w') as devnull:
+            call_command('export_quizzes', path, stderr=devnull)
+            call_command('import_quizzes', path, stderr=devnull, stdout=devnull)
+
+        quiz = Quiz.objects.exclude(pk=self.quiz.pk).get()
+        self.assertStats(quiz, question_count=2, answer_count=5, correct_answer_count=3)
+        self.assertEqual(QuestionStats.objects.count(), 3)
+
+    def directory(self) -> str:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return directory.name
@@ -0,0 +1,87 @@
+from unittest import mock
+
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from parameterized import parameterized
+from rest_framework.response import Response
+
+from quizzes.tests import create_populated_question, create_tag, UserAuthTestsMixin
+from quizzes.views import QuestionViewSet
+from utils.renderers import StreamingJsonRenderer, DescriptiveJsonRenderer
+
+STREAM = 'application/json; stream=true'
+
+
+class StreamingRendererTests(TestCase, UserAuthTestsMixin):
+    def setUp(self) -> None:
+        self.setUpTestUsers()
+        self.tag = create_tag('python')
+
+        for i in range(5):
+            question = create_populated_question([True, False], f'question_{i} ')
+            question.tags.add(self.tag)
+
+    def get(self, url, accept):
+        return self.client.get(url, HTTP_ACCEPT=accept)
+
+    def assertStreamed(self, url):
+        """ Asserts that the response to the given url is streamed with the same body as when it isn't streamed. """
+        expected = self.get(url, 'application/json')
+        response = self.get(url, STREAM)
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response['Content-Type'], expected['Content-Type'])
+        self.assertEqual(b''.join(response.streaming_content), expected.content)
+
+    @parameterized.expand([
+        ('page', '/api/questions/'),
+        ('empty page', '/api/questions/?search=nothing'),
+        ('partial page', '/api/questions/?page_size=4'),
+        ('object', '/api/questions/1/'),
+        ('tag', '/api/tags/1/'),
+        ('not found', '/api/questions/99/'),
+    ])
+    def test_streamed(self, name, url):
+        """ Streamed responses are identical to responses that aren't streamed. """
+        self.assertStreamed(url)
+
+    @parameterized.expand([
+        ('list', list),
+        ('tuple', tuple),
+        ('iterator', iter),
+        ('empty', lambda rows: []),
+    ])
+    def test_rows(self, name, rows_type):
+        """ Lists, tuples and iterators of rows are streamed like DescriptiveJsonRenderer renders them. """
+        rows = [{'text': 'line\u2028separator'}, {'text': 'é'}, {'votes': 1.5}]
+        context = {'response': Response(status=201)}
+        renderer = StreamingJsonRenderer()
+        renderer.batch_size = 2
+
+        self.assertEqual(b''.join(renderer.render_chunks(renderer.wrap(rows_type(rows), context))),
+                         DescriptiveJsonRenderer().render(rows_type(rows), 'application/json', context))
+
+    @parameterized.expand([(1,), (2,), (5,)])
+    def test_streamed_in_batches(self, batch_size):
+        """ Rows are encoded in batches, which don't change the response. """
+        with mock.patch.object(StreamingJsonRenderer, 'batch_size', batch_size):
+            self.assertStreamed('/api/questions/')
+
+    def test_not_streamed(self):
+        """ Responses aren't streamed unless asked for, or if they're indented. """
+        for accept in ('application/json', '*/*', 'application/json; indent=4; stream=true'):
+            self.assertNotIsInstance(self.get('/api/questions/', accept), StreamingHttpResponse)
+
+    def test_browsable_api(self):
+        """ The browsable API renders data that isn't streamed. """
+        response = self.get('/api/questions/', 'text/html')
+
+        self.assertNotIsInstance(response, StreamingHttpResponse)
+        self.assertContains(response, 'question_0')
+
+    def test_streamed_by_view(self):
+        """ Views can stream every response. """
+        with mock.patch.object(QuestionViewSet, 'stream_responses', True, create=True):
+            self.assertIsInstance(self.get('/api/questions/', '*/*'), StreamingHttpResponse)
+            self.assertNotIsInstance(self.get('/api/answers/', '*/*'), StreamingHttpResponse)
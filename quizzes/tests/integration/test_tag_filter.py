@@ -0,0 +1,58 @@
+from django.test import TestCase
+from parameterized import parameterized
+
+from quizzes.tag_index import tag_index
+from quizzes.tests import create_question, create_quiz, create_tag
+
+
+class TagFilterTests(TestCase):
+    def setUp(self) -> None:
+        tag_index.clear()
+        self.addCleanup(tag_index.clear)
+
+        python = create_tag('python')
+        django = create_tag('django')
+        first = create_question('Python question')
+        second = create_question('Django question')
+        create_question('Untagged question')
+        first.tags.add(python)
+        second.tags.add(python, django)
+
+        create_quiz().questions.add(first)
+        create_quiz().questions.add(second)
+
+    def get_ids(self, endpoint, params):
+        response = self.client.get(f'/api/{endpoint}/', params)
+        self.assertEqual(response.status_code, 200)
+        return [int(result['url'].rstrip('/').rsplit('/', 1)[1]) for result in response.json()['data']['results']]
+
+    @parameterized.expand([
+        ('questions', {'tags': 'python'}, [1, 2]),
+        ('questions', {'tags': 'python,django'}, [2]),
+        ('questions', {'tags': 'python, django', 'match': 'any'}, [1, 2]),
+        ('questions', {'tags': 'django,missing'}, []),
+        ('questions', {'tags': 'django,missing', 'match': 'any'}, [2]),
+        ('questions', {'tags': ''}, [1, 2, 3]),
+        ('quizzes', {'tags': 'python'}, [1, 2]),
+        ('quizzes', {'tags': 'django'}, [2]),
+        ('quizzes', {'tags': 'missing'}, []),
+    ])
+    def test_filter(self, endpoint, params, expected):
+        """ Returns rows with all (or any) of the given tags. """
+        self.assertEqual(self.get_ids(endpoint, params), expected)
+
+    def test_filter_with_search(self):
+        """ Tag filters can be combined with searches. """
+        self.assertEqual(self.get_ids('questions', {'tags': 'python', 'search': 'django'}), [2])
+        self.assertEqual(self.get_ids('quizzes', {'tags': 'python', 'search': 'django'}), [2])
+
+    def test_invalid_match(self):
+        """ Returns an error if 'match' isn't 'all' or 'any'. """
+        response = self.client.get('/api/questions/', {'tags': 'python', 'match': 'some'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_no_extra_queries(self):
+        """ Filtering by tag doesn't add queries once the index is built. """
+        tag_index.build()
+        with self.assertNumQueries(4):
+            self.client.get('/api/questions/', {'tags': 'python'})
@@ -8,7 +8,6 @@ class TagsTests(TestCase):
         """ Returns an empty array when there are no results. """
         expected = create_api_response(
             data={
-                "count": 0,
                 "next": None,
                 "previous": None,
                 "results": []
@@ -23,8 +22,7 @@ class TagsTests(TestCase):
         create_tag('tag1')
         create_tag('tag2')
         expected = create_api_response(
-            data={'count': 2,
-                  'next': None,
+            data={'next': None,
                   'previous': None,
                   'results': [
                       {'name': 'tag1', 'url': 'http://testserver/api/tags/1/'},
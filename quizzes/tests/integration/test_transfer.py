@@ -0,0 +1,115 @@
+import gzip
+import os
+import tempfile
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from quizzes.models import Quiz, Question, Answer, Tag
+from quizzes.tests import create_tag, create_answer, UserAuthTestsMixin
+
+
+class TransferTests(TestCase, UserAuthTestsMixin):
+    def setUp(self) -> None:
+        self.setUpTestUsers()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+        self.tag = create_tag('python')
+        self.question = Question.objects.create(text='question', description='description', creator=self.user)
+        self.question.tags.add(self.tag)
+        self.answer = create_answer(self.question, True, creator=self.user)
+        self.quiz = Quiz.objects.create(name='quiz', creator=self.other)
+        self.quiz.questions.add(self.question)
+        Quiz.objects.filter(pk=self.quiz.pk).update(created_on='2020-01-01T00:00:00.123456Z')
+        self.quiz.refresh_from_db()
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def call(self, name, *args):
+        with open(os.devnull, 'w') as devnull:
+            call_command(name, *args, stdout=devnull, stderr=devnull)
+
+    def round_trip(self, name, *export_args):
+        self.call('export_quizzes', self.path(name), *export_args)
+        self.call('import_quizzes', self.path(name))
+
+    def test_export(self):
+        """ Writes a line per row, with creators as usernames. """
+        self.call('export_quizzes', self.path('export.ndjson'))
+
+        with open(self.path('export.ndjson')) as file:
+            lines = file.read().splitlines()
+
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(lines[0], '{"model":"quizzes.tag","pk":1,"fields":{"name":"python"}}')
+        self.assertIn('"creator":"other"', lines[3])
+        self.assertIn('"created_on":"2020-01-01T00:00:00.123456+00:00"', lines[3])
+
+    def test_import(self):
+        """ Imports every row with new pks, linked to the new rows they referred to. """
+        self.round_trip('export.ndjson')
+
+        self.assertEqual(Question.objects.count(), 2)
+        self.assertEqual(Answer.objects.count(), 2)
+        self.assertEqual(Quiz.objects.count(), 2)
+
+        quiz = Quiz.objects.exclude(pk=self.quiz.pk).get()
+        question = quiz.questions.get()
+        self.assertNotEqual(question.pk, self.question.pk)
+        self.assertEqual((question.text, question.description, question.creator), ('question', 'description', self.user))
+        self.assertEqual(question.answers.get().is_correct_answer, True)
+        self.assertEqual(quiz.creator, self.other)
+        self.assertEqual(quiz.created_on, self.quiz.created_on)
+
+    def test_import_existing_tags(self):
+        """ Tags are matched to existing tags with the same name rather than duplicated. """
+        self.round_trip('export.ndjson')
+
+        self.assertEqual(Tag.objects.count(), 1)
+        self.assertEqual(list(Question.objects.filter(tags=self.tag).values_list('text', flat=True)), ['question'] * 2)
+
+    def test_import_unknown_creator(self):
+        """ Rows created by users that don't exist are imported without a creator. """
+        self.call('export_quizzes', self.path('export.ndjson'))
+        self.other.delete()
+        self.call('import_quizzes', self.path('export.ndjson'))
+
+        self.assertEqual(Quiz.objects.get().creator, None)
+
+    def test_gzip(self):
+        """ Output is compressed when asked to or the path ends with '.gz', and compressed input is detected. """
+        self.call('export_quizzes', self.path('export.gz'))
+        self.call('export_quizzes', self.path('export.ndjson'), '--gzip')
+
+        for name in ('export.gz', 'export.ndjson'):
+            with gzip.open(self.path(name), 'rt') as file:
+                self.assertEqual(len(file.read().splitlines()), 6)
+            self.call('import_quizzes', self.path(name))
+
+        self.assertEqual(Quiz.objects.count(), 3)
+
+    def test_import_invalid(self):
+        """ Nothing is imported if any row is invalid. """
+        self.call('export_quizzes', self.path('export.ndjson'))
+
+        with open(self.path('export.ndjson'), 'a') as file:
+            file.write('{"model":"quizzes.answer"\n')
+
+        with self.assertRaisesMessage(CommandError, 'Nothing was imported. Line 7:'):
+            self.call('import_quizzes', self.path('export.ndjson'))
+
+        self.assertEqual(Question.objects.count(), 1)
+        self.assertEqual(Quiz.objects.count(), 1)
+
+    def test_import_missing_row(self):
+        """ Nothing is imported if a row refers to a row that wasn't imported. """
+        with open(self.path('export.ndjson'), 'w') as file:
+            file.write('{"model":"quizzes.answer","pk":2,"fields":{"question":99,"text":"answer"}}\n')
+
+        with self.assertRaisesMessage(CommandError, 'quizzes.question 99 has not been imported'):
+            self.call('import_quizzes', self.path('export.ndjson'))
+
+        self.assertEqual(Answer.objects.count(), 1)
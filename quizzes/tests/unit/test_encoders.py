@@ -0,0 +1,90 @@
+import datetime
+import decimal
+import json
+import uuid
+
+import pytz
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from parameterized import parameterized
+from rest_framework.compat import LONG_SEPARATORS
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from utils.encoders import Encoder, BACKENDS, get_backend_name
+
+INSTALLED_BACKENDS = [(name,) for name, module in BACKENDS.items() if module is not None]
+
+
+def encode_json(data, **options):
+    """ Encodes data like DRF's JSONRenderer does. """
+    options = {'ensure_ascii': False, 'allow_nan': False, 'separators': (',', ':'), **options}
+    ret = json.dumps(data, cls=JSONEncoder, **options)
+    return ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+class EncoderTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.data = ReturnDict({
+            'status': 200,
+            'success': True,
+            'message': gettext_lazy('OK'),
+            'data': ReturnList([{
+                'url': 'http://testserver/api/quizzes/1/',
+                'name': 'Ünïcödé quiz ✓ \u2028\u2029 "quoted" \\ </script>',
+                'created_on': datetime.datetime(2020, 1, 1, 0, 0, 0, 123456, tzinfo=pytz.utc),
+                'updated_on': datetime.datetime(2020, 1, 1, 13, 0, tzinfo=pytz.timezone('Pacific/Auckland')),
+                'date': datetime.date(2020, 1, 1),
+                'time': datetime.time(12, 30),
+                'duration': datetime.timedelta(minutes=90),
+                'score': decimal.Decimal('12.5'),
+                'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+                'votes': 2 ** 40,
+                'ratio': 0.1,
+                'tags': ('python', 'django'),
+                'answers': (pk for pk in range(3)),
+                'counts': {1: 'one', 2: 'two'},
+                'empty': [None, {}, []],
+            }], serializer=None)
+        }, serializer=None)
+
+    @parameterized.expand(INSTALLED_BACKENDS)
+    def test_encode(self, backend):
+        """ Data is encoded like JSONRenderer does, whichever backend is used. """
+        expected = encode_json(self.data)
+        self.data['data'][0]['answers'] = (pk for pk in range(3))
+
+        self.assertEqual(Encoder(ensure_ascii=False, allow_nan=False, backend=backend).encode(self.data), expected)
+
+    @parameterized.expand(INSTALLED_BACKENDS)
+    def test_encode_options(self, backend):
+        """ Options the backend doesn't support are supported by using the standard library. """
+        data = {'name': 'Ünïcödé', 'list': [1, 2]}
+
+        for options in ({'ensure_ascii': True}, {'indent': 4}, {'separators': LONG_SEPARATORS}):
+            with self.subTest(options=options):
+                self.assertEqual(Encoder(backend=backend, **{'ensure_ascii': False, **options}).encode(data),
+                                 encode_json(data, **options))
+
+    @parameterized.expand(INSTALLED_BACKENDS)
+    def test_encode_large_integer(self, backend):
+        """ Integers too large for the backend are encoded by the standard library. """
+        self.assertEqual(Encoder(backend=backend).encode([2 ** 70]), encode_json([2 ** 70]))
+
+    @parameterized.expand(INSTALLED_BACKENDS)
+    def test_encode_unsupported(self, backend):
+        """ Objects that can't be encoded raise a TypeError. """
+        with self.assertRaises(TypeError):
+            Encoder(backend=backend).encode({'object': object()})
+
+    def test_backend_setting(self):
+        """ The JSON_BACKEND setting chooses the backend, which defaults to the fastest one installed. """
+        with override_settings(JSON_BACKEND=''):
+            self.assertEqual(get_backend_name(), INSTALLED_BACKENDS[0][0])
+
+        with override_settings(JSON_BACKEND='json'):
+            self.assertEqual(Encoder().backend, 'json')
+
+        with override_settings(JSON_BACKEND='simplejson'), self.assertRaises(ImproperlyConfigured):
+            get_backend_name()
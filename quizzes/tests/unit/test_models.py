@@ -1,6 +1,10 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
 
-from quizzes.tests import create_populated_question
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from quizzes.models import Answer, Question
+from quizzes.tests import create_populated_question, create_question, create_answer, create_quiz
 
 
 class QuestionModelTests(TestCase):
@@ -13,3 +17,121 @@ class QuestionModelTests(TestCase):
         """ Returns False when a question has one correct answer. """
         question = create_populated_question([True])
         self.assertFalse(question.is_multiple_choice())
+
+    def test_is_multiple_choice_uses_annotation(self):
+        """ Uses the 'correct_answer_count' annotation instead of querying when it is present. """
+        question = create_populated_question([True])
+        question.correct_answer_count = 2
+
+        with self.assertNumQueries(0):
+            self.assertTrue(question.is_multiple_choice())
+
+    def test_is_multiple_choice_uses_prefetched_answers(self):
+        """ Uses prefetched answers instead of querying when they are present. """
+        create_populated_question([True, True])
+        question = Question.objects.prefetch_related('answers').get()
+
+        with self.assertNumQueries(0):
+            self.assertTrue(question.is_multiple_choice())
+
+
+class QuizModelTests(TestCase):
+    def setUp(self) -> None:
+        self.quiz = create_quiz()
+        self.single = create_populated_question([True, False])
+        self.multiple = create_populated_question([True, True, False])
+        self.quiz.questions.add(self.single, self.multiple)
+
+    def answer_ids(self, question):
+        return [answer.pk for answer in question.answers.order_by('pk')]
+
+    def test_grade_correct(self):
+        """ Questions are correct when exactly their correct answers are chosen. """
+        single_correct, _ = self.answer_ids(self.single)
+        first_correct, second_correct, _ = self.answer_ids(self.multiple)
+
+        results = self.quiz.grade([single_correct, first_correct, second_correct])
+
+        self.assertEqual([result.question_id for result in results], [self.single.pk, self.multiple.pk])
+        self.assertEqual([result.is_correct for result in results], [True, True])
+        self.assertEqual([result.is_multiple_choice for result in results], [False, True])
+
+    def test_grade_incorrect(self):
+        """ Questions are incorrect when an incorrect answer is chosen or a correct answer is missed. """
+        single_correct, single_incorrect = self.answer_ids(self.single)
+        first_correct, _, _ = self.answer_ids(self.multiple)
+
+        results = self.quiz.grade([single_correct, single_incorrect, first_correct])
+
+        self.assertEqual([result.is_correct for result in results], [False, False])
+
+    def test_grade_query_count(self):
+        """ Grading runs a single query. """
+        with self.assertNumQueries(1):
+            self.quiz.grade([])
+
+    def test_grade_answer_from_another_quiz(self):
+        """ Raises a ValueError if an answer doesn't belong to a question in the quiz. """
+        other = create_populated_question([True])
+
+        with self.assertRaises(ValueError):
+            self.quiz.grade(self.answer_ids(other))
+
+
+class AnswerManagerTests(TestCase):
+    def setUp(self) -> None:
+        question = create_question()
+        self.first = create_answer(question, True)
+        self.second = create_answer(question, False)
+
+    def test_vote(self):
+        """ Adds one vote per occurrence of an answer's id. """
+        Answer.objects.vote([self.first.pk, self.second.pk, self.first.pk])
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.votes, 2)
+        self.assertEqual(self.second.votes, 1)
+
+    def test_vote_query_count(self):
+        """ Answers receiving the same number of votes are updated by a single query. """
+        with self.assertNumQueries(1):
+            Answer.objects.vote([self.first.pk, self.second.pk])
+
+    def test_add_votes_with_different_increments(self):
+        """ Answers receiving different numbers of votes are updated by a single query. """
+        with self.assertNumQueries(1):
+            Answer.objects.add_votes({self.first.pk: 3, self.second.pk: 5})
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.votes, 3)
+        self.assertEqual(self.second.votes, 5)
+
+    def test_add_votes_returns_number_updated(self):
+        """ Returns the number of answers updated, ignoring answers that don't exist or receive no votes. """
+        updated = Answer.objects.add_votes({self.first.pk: 3, self.second.pk: 0, 1000: 1})
+        self.assertEqual(updated, 1)
+
+
+class AnswerManagerConcurrencyTests(TransactionTestCase):
+    def test_concurrent_votes_are_not_lost(self):
+        """ Votes recorded concurrently for the same answer are all counted. """
+        answer = create_answer(create_question(), True)
+        number_of_threads = 8
+        votes_per_thread = 25
+
+        def vote():
+            try:
+                for _ in range(votes_per_thread):
+                    Answer.objects.vote([answer.pk])
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=number_of_threads) as executor:
+            futures = [executor.submit(vote) for _ in range(number_of_threads)]
+
+        for future in futures:
+            future.result()
+
+        answer.refresh_from_db()
+        self.assertEqual(answer.votes, number_of_threads * votes_per_thread)
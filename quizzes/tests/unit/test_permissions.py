@@ -0,0 +1,63 @@
+from django.test import TestCase
+from parameterized import parameterized
+from rest_framework.test import APIRequestFactory
+
+from quizzes.models import Quiz
+from quizzes.permissions import IsCreatorOrAdminUserOrReadOnly
+from quizzes.views import QuizViewSet
+from quizzes.tests import UserAuthTestsMixin
+
+
+class IsCreatorOrAdminUserOrReadOnlyPermissionTests(TestCase, UserAuthTestsMixin):
+    def setUp(self) -> None:
+        self.setUpTestUsers()
+        Quiz.objects.create(name='quiz', creator=self.user)
+        Quiz.objects.create(name='anonymous')
+
+        self.factory = APIRequestFactory()
+        self.view = QuizViewSet()
+        self.permission = IsCreatorOrAdminUserOrReadOnly()
+
+    def request(self, method, requester):
+        request = getattr(self.factory, method)('/api/quizzes/1/')
+        request.user = getattr(self, requester)
+        return request
+
+    @parameterized.expand([
+        ('get', 'user', True),
+        ('get', 'other', True),
+        ('get', 'anonymous', True),
+        ('patch', 'user', True),
+        ('patch', 'admin', True),
+        ('patch', 'other', False),
+        ('patch', 'anonymous', False),
+        ('delete', 'other', False),
+    ])
+    def test_has_object_permission(self, method, requester, expected):
+        """ Anyone can view quizzes, but only their creators and admins can change them. """
+        quiz = Quiz.objects.get(name='quiz')
+
+        # Creators are compared by id rather than fetched
+        with self.assertNumQueries(0):
+            self.assertEqual(self.permission.has_object_permission(self.request(method, requester), self.view, quiz),
+                             expected)
+
+    @parameterized.expand([
+        ('get', 'other', ['anonymous', 'quiz']),
+        ('patch', 'admin', ['anonymous', 'quiz']),
+        ('patch', 'user', ['quiz']),
+        ('patch', 'other', []),
+        ('patch', 'anonymous', []),
+    ])
+    def test_queryset_filter(self, method, requester, expected):
+        """ Filters querysets to the same objects as checking each object would allow. """
+        request = self.request(method, requester)
+        permission_filter = self.permission.get_queryset_filter(request, self.view)
+        queryset = Quiz.objects.order_by('name')
+
+        if permission_filter is not None:
+            queryset = queryset.filter(permission_filter)
+
+        self.assertEqual([quiz.name for quiz in queryset], expected)
+        self.assertEqual([quiz.name for quiz in Quiz.objects.order_by('name')
+                          if self.permission.has_object_permission(request, self.view, quiz)], expected)
@@ -0,0 +1,74 @@
+from django.db.models import Count, Q
+from django.test import TestCase
+from parameterized import parameterized
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from quizzes.models import Question, Answer, Quiz, Tag
+from quizzes.representations import ValuesRepresentation
+from quizzes.serializers import TagSerializer, AnswerSerializer, QuestionSerializer, QuizSerializer, \
+    QuizBundleSerializer
+from quizzes.tests import create_populated_question, create_tag, UserAuthTestsMixin
+
+CORRECT_ANSWER_COUNT = Count('answers', filter=Q(answers__is_correct_answer=True), distinct=True)
+
+
+class ValuesRepresentationTests(TestCase, UserAuthTestsMixin):
+    def setUp(self) -> None:
+        self.setUpTestUsers()
+        tags = [create_tag('python'), create_tag('django')]
+
+        for answer_states in ([True, False], [True, True], []):
+            question = create_populated_question(answer_states)
+            question.tags.add(*tags[:len(answer_states)])
+
+        Question.objects.filter(pk=1).update(creator=self.user)
+        Answer.objects.filter(pk=1).update(creator=self.other)
+
+        quiz = Quiz.objects.create(name='quiz', creator=self.user)
+        quiz.questions.add(1, 3)
+        Quiz.objects.create(name='empty')
+
+    def get_context(self, path='/api/'):
+        return {'request': Request(APIRequestFactory().get(path)), 'format': None}
+
+    @parameterized.expand([
+        ('tags', TagSerializer, lambda: Tag.objects.all()),
+        ('answers', AnswerSerializer, lambda: Answer.objects.all()),
+        ('questions', QuestionSerializer, lambda: Question.objects.annotate(correct_answer_count=CORRECT_ANSWER_COUNT)),
+        ('questions without annotations', QuestionSerializer, lambda: Question.objects.all()),
+        ('quizzes', QuizSerializer, lambda: Quiz.objects.all()),
+    ])
+    def test_represent(self, name, serializer_class, get_queryset):
+        """ Rows are represented like the serializer represents instances. """
+        # Related objects are prefetched in pk order, as views prefetch them
+        prefetch_related = getattr(serializer_class.Meta, 'prefetch_related', [])
+        queryset = get_queryset().order_by('pk').prefetch_related(*prefetch_related)
+        serializer = serializer_class(queryset, many=True, context=self.get_context())
+        representation = ValuesRepresentation.for_serializer(serializer_class(context=self.get_context()))
+
+        self.assertEqual(representation.represent(list(representation.get_values(queryset))), serializer.data)
+        self.assertEqual([representation.represent_instance(instance) for instance in queryset], serializer.data)
+
+    def test_represent_format(self):
+        """ Hyperlinks have the format suffix of the request. """
+        context = {**self.get_context('/api/answers.json'), 'format': 'json'}
+        representation = ValuesRepresentation.for_serializer(AnswerSerializer(context=context))
+
+        self.assertEqual(representation.represent_instance(Answer.objects.get(pk=1)),
+                         AnswerSerializer(Answer.objects.get(pk=1), context=context).data)
+        self.assertEqual(representation.represent_instance(Answer.objects.get(pk=1))['url'],
+                         'http://testserver/api/answers/1.json')
+
+    def test_unsupported(self):
+        """ Serializers with fields that can't be represented from rows aren't supported. """
+        self.assertIsNone(ValuesRepresentation.for_serializer(QuizBundleSerializer(context=self.get_context())))
+        self.assertIsNone(ValuesRepresentation.for_serializer(TagSerializer()))
+
+    def test_query_count(self):
+        """ Related pks are fetched with a query per relation. """
+        representation = ValuesRepresentation.for_serializer(QuestionSerializer(context=self.get_context()))
+        rows = list(representation.get_values(Question.objects.annotate(correct_answer_count=CORRECT_ANSWER_COUNT)))
+
+        with self.assertNumQueries(2):
+            representation.represent(rows)
@@ -0,0 +1,94 @@
+from django.test import TestCase
+from parameterized import parameterized
+
+from quizzes.models import Question, Tag
+from quizzes.tag_index import TagIndex, tag_index
+from quizzes.tests import create_question, create_quiz, create_tag
+
+
+class TagIndexTests(TestCase):
+    def setUp(self) -> None:
+        # The shared index may contain rows from other tests, which are rolled back without sending signals
+        tag_index.clear()
+        self.addCleanup(tag_index.clear)
+
+        self.python = create_tag('python')
+        self.django = create_tag('django')
+        self.first = create_question()
+        self.second = create_question()
+        self.first.tags.add(self.python, self.django)
+        self.second.tags.add(self.python)
+
+        self.quiz = create_quiz()
+        self.quiz.questions.add(self.first)
+
+    @parameterized.expand([
+        (['python'], True, {1, 2}),
+        (['python', 'django'], True, {1}),
+        (['python', 'django'], False, {1, 2}),
+        (['python', 'missing'], True, set()),
+        (['python', 'missing'], False, {1, 2}),
+        ([], True, set()),
+    ])
+    def test_question_ids(self, tags, match_all, expected):
+        """ Returns the questions with all or any of the given tags. """
+        self.assertEqual(tag_index.question_ids(tags, match_all), expected)
+
+    def test_built_once(self):
+        """ The index is built with a few queries on first use, then used without querying the database. """
+        with self.assertNumQueries(3):
+            tag_index.question_ids(['python'])
+
+        with self.assertNumQueries(0):
+            tag_index.question_ids(['django'])
+            tag_index.quiz_ids(['django'])
+
+    def test_rebuilt_when_expired(self):
+        """ The index is rebuilt once older than its max age. """
+        index = TagIndex(max_age=-1)
+        index.question_ids(['python'])
+
+        with self.assertNumQueries(3):
+            index.question_ids(['python'])
+
+    def test_quiz_ids(self):
+        """ Quizzes have the tags of their questions. """
+        self.assertEqual(tag_index.quiz_ids(['django']), {1})
+        self.quiz.questions.remove(self.first)
+        self.assertEqual(tag_index.quiz_ids(['django']), set())
+        self.second.quiz_set.add(self.quiz)
+        self.assertEqual(tag_index.quiz_ids(['python']), {1})
+
+    def test_updated_by_question_tags(self):
+        """ Tagging and untagging questions from either side updates the index. """
+        tag_index.build()
+
+        self.second.tags.add(self.django)
+        self.assertEqual(tag_index.question_ids(['django']), {1, 2})
+
+        self.django.question_set.remove(self.first)
+        self.assertEqual(tag_index.question_ids(['django']), {2})
+
+        self.python.question_set.clear()
+        self.assertEqual(tag_index.question_ids(['python']), set())
+
+        self.second.tags.clear()
+        self.assertEqual(tag_index.question_ids(['django']), set())
+
+    def test_updated_by_deletes_and_renames(self):
+        """ Deleting questions and tags and renaming tags updates the index. """
+        tag_index.build()
+
+        Question.objects.filter(pk=self.second.pk).get().delete()
+        self.assertEqual(tag_index.question_ids(['python']), {1})
+
+        self.django.name = 'flask'
+        self.django.save()
+        self.assertEqual(tag_index.question_ids(['django']), set())
+        self.assertEqual(tag_index.question_ids(['flask']), {1})
+
+        Tag.objects.filter(pk=self.python.pk).get().delete()
+        self.assertEqual(tag_index.question_ids(['python']), set())
+
+        self.quiz.delete()
+        self.assertEqual(tag_index.quiz_ids(['flask']), set())
@@ -0,0 +1,148 @@
+import time
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from quizzes.models import Answer
+from quizzes.tests import create_question, create_answer
+from quizzes.votes import VoteBuffer
+
+
+class VoteBufferTests(TestCase):
+    def setUp(self) -> None:
+        question = create_question()
+        self.first = create_answer(question, True)
+        self.second = create_answer(question, False)
+
+        # A long interval ensures votes are only written when these tests expect them to be
+        self.buffer = VoteBuffer(flush_interval=60 * 1000, max_votes=10)
+        self.addCleanup(self.buffer.flush)
+
+    def test_add_buffers_votes(self):
+        """ Votes are not written until the buffer is flushed. """
+        self.buffer.add([self.first.pk, self.first.pk, self.second.pk])
+
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.votes, 0)
+        self.assertEqual(self.buffer.pending_votes, 3)
+
+    def test_flush(self):
+        """
+        Flushing writes all buffered votes with a single query, then refreshes question and quiz statistics (in the same
+        transaction, a savepoint in tests) and finds the questions and quizzes whose cached representations are
+        invalidated.
+        """
+        self.buffer.add([self.first.pk, self.first.pk])
+        self.buffer.add([self.second.pk])
+
+        with self.assertNumQueries(7):
+            flushed = self.buffer.flush()
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(flushed, 3)
+        self.assertEqual(self.first.votes, 2)
+        self.assertEqual(self.second.votes, 1)
+        self.assertEqual(self.buffer.pending_votes, 0)
+
+    def test_flush_empty(self):
+        """ Flushing an empty buffer doesn't query the database. """
+        with self.assertNumQueries(0):
+            self.assertEqual(self.buffer.flush(), 0)
+
+    def test_flush_in_batches(self):
+        """ Votes for more answers than the batch size are written (and statistics refreshed) once per batch. """
+        self.buffer = VoteBuffer(flush_interval=60 * 1000, max_votes=10, batch_size=1)
+        self.buffer.add([self.first.pk, self.second.pk])
+
+        with self.assertNumQueries(14):
+            self.buffer.flush()
+
+    def test_max_votes_triggers_flush(self):
+        """ Votes are written as soon as the number of buffered votes reaches the maximum. """
+        self.buffer.add([self.first.pk] * 9)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.votes, 0)
+
+        self.buffer.add([self.second.pk])
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.votes, 9)
+        self.assertEqual(self.second.votes, 1)
+
+    def test_failed_flush_keeps_votes(self):
+        """ Votes that fail to be written stay buffered so they can be retried. """
+        self.buffer.add([self.first.pk, self.second.pk])
+
+        with mock.patch.object(Answer.objects, 'add_votes', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.buffer.flush()
+
+        self.assertEqual(self.buffer.pending_votes, 2)
+
+    def test_batch_size(self):
+        """ Batches are small enough for UPDATEs with three parameters per answer to stay within the limit. """
+        with mock.patch.object(connection.features, 'max_query_params', 3):
+            self.assertEqual(VoteBuffer().batch_size, 1)
+
+            # Different increments for each answer need the most parameters
+            self.buffer = VoteBuffer(flush_interval=60 * 1000, max_votes=10)
+            self.buffer.add([self.first.pk, self.first.pk, self.second.pk])
+
+            with CaptureQueriesContext(connection) as queries:
+                self.buffer.flush()
+
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE "quizzes_answer"')]), 2)
+
+    def test_failed_stats_refresh_keeps_votes_once(self):
+        """ Votes aren't kept if refreshing statistics fails, so they are only added once when retried. """
+        self.buffer.add([self.first.pk, self.second.pk])
+
+        with mock.patch('quizzes.votes.refresh_stats', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.buffer.flush()
+
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.votes, 0)
+        self.assertEqual(self.buffer.pending_votes, 2)
+
+        self.buffer.flush()
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.votes, 1)
+        self.assertEqual(self.second.votes, 1)
+
+    def test_stats(self):
+        """ Reports the number of buffered and written votes. """
+        self.buffer.add([self.first.pk, self.first.pk, self.second.pk])
+        self.assertEqual(self.buffer.stats(), {
+            'pending_votes': 3,
+            'pending_answers': 2,
+            'flushes': 0,
+            'flushed_votes': 0,
+            'flush_interval': 60 * 1000,
+            'max_votes': 10
+        })
+
+        self.buffer.flush()
+        self.assertEqual(self.buffer.stats()['pending_votes'], 0)
+        self.assertEqual(self.buffer.stats()['flushes'], 1)
+        self.assertEqual(self.buffer.stats()['flushed_votes'], 3)
+
+
+class VoteBufferTimerTests(TransactionTestCase):
+    def test_flush_after_interval(self):
+        """ Buffered votes are written once the flush interval has passed. """
+        answer = create_answer(create_question(), True)
+        buffer = VoteBuffer(flush_interval=10, max_votes=1000)
+        buffer.add([answer.pk, answer.pk])
+
+        # Votes stop being pending before they're written, so wait for the flush to finish
+        deadline = time.monotonic() + 5
+        while not buffer.flushes and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        answer.refresh_from_db()
+        self.assertEqual(answer.votes, 2)
@@ -0,0 +1,191 @@
+"""
+Streams quizzes, questions, answers and tags (and the links between them) to and from NDJSON, for moving them between
+databases. Each line is a row in the form `{"model": "quizzes.question", "pk": 1, "fields": {...}}`, in the order of
+EXPORTED_MODELS so rows are imported after the rows they refer to.
+"""
+import json
+from typing import Dict, List, TextIO
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .bulk import bulk_create
+from .models import Tag, Question, Answer, Quiz
+from .stats import create_stats
+from .feed import latest_quizzes
+from .tag_index import tag_index
+
+# Models and the fields exported for each, mapped to the lookups their values are read with. Creators are exported as
+# usernames, as user pks differ between databases.
+EXPORTED_MODELS = [
+    (Tag, {'name': 'name'}),
+    (Question, {'creator': 'creator__username', 'text': 'text', 'description': 'description',
+                'created_on': 'created_on', 'updated_on': 'updated_on'}),
+    (Answer, {'creator': 'creator__username', 'question': 'question_id', 'text': 'text', 'votes': 'votes',
+              'is_correct_answer': 'is_correct_answer'}),
+    (Quiz, {'creator': 'creator__username', 'name': 'name', 'description': 'description', 'created_on': 'created_on',
+            'updated_on': 'updated_on'}),
+    (Question.tags.through, {'question': 'question_id', 'tag': 'tag_id'}),
+    (Quiz.questions.through, {'quiz': 'quiz_id', 'question': 'question_id'}),
+]
+
+
+def _encode(value):
+    # Dates are kept to the microsecond, unlike DjangoJSONEncoder
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def export_rows(stream: TextIO, chunk_size: int = 2000) -> int:
+    """ Writes every exported row to the given stream, returning the number of rows written. """
+    count = 0
+
+    for model, fields in EXPORTED_MODELS:
+        label = model._meta.label_lower
+        rows = model._default_manager.order_by('pk').values_list('pk', *fields.values())
+
+        for pk, *values in rows.iterator(chunk_size=chunk_size):
+            row = {'model': label, 'pk': pk, 'fields': dict(zip(fields, values))}
+            stream.write(json.dumps(row, default=_encode, separators=(',', ':')))
+            stream.write('\n')
+            count += 1
+
+    return count
+
+
+class Importer:
+    """
+    Imports rows written by `export_rows` in batches, giving them new pks. Tags are matched to existing tags with the
+    same name and creators to existing users with the same username (or no creator if there isn't one).
+
+    Only the old and new pks of imported rows are kept in memory, rows themselves are discarded once their batch is
+    saved.
+    """
+
+    def __init__(self, batch_size: int = 1000):
+        self.batch_size = batch_size
+        self.count = 0
+        self.batch: List[dict] = []
+        self.batch_label = None
+        self.pks: Dict[str, Dict[int, int]] = {model._meta.label_lower: {} for model, fields in EXPORTED_MODELS}
+        self.user_pks: Dict[str, int] = {}
+        self.models = {model._meta.label_lower: model for model, fields in EXPORTED_MODELS}
+
+    def import_rows(self, stream: TextIO) -> int:
+        """
+        Imports every row in the given stream in a single transaction, returning the number of rows imported. Raises a
+        ValueError if a row is invalid.
+        """
+        with transaction.atomic():
+            for line_number, line in enumerate(stream, 1):
+                if not line.strip():
+                    continue
+
+                try:
+                    row = json.loads(line)
+                    label, fields = row['model'], row['fields']
+                    if label not in self.models:
+                        raise ValueError(f"unknown model '{label}'")
+                    self.add(label, row.get('pk'), fields)
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError(f'Line {line_number}: {e!r}') from e
+
+            self.flush()
+
+            # Imported rows don't send signals, so create the statistics of imported questions (then quizzes, which
+            # are summed from their questions' statistics)
+            for model in (Question, Quiz):
+                pks = list(self.pks[model._meta.label_lower].values())
+                for i in range(0, len(pks), self.batch_size):
+                    create_stats(model, pks[i:i + self.batch_size])
+
+        # Rebuild the tag index and latest quizzes from the database when they're next used
+        tag_index.clear()
+        latest_quizzes.clear()
+        return self.count
+
+    def add(self, label: str, pk, fields: dict):
+        if label != self.batch_label or len(self.batch) >= self.batch_size:
+            self.flush()
+
+        self.batch_label = label
+        self.batch.append({'pk': pk, **fields})
+
+    def flush(self):
+        """ Saves the current batch. """
+        if not self.batch:
+            return
+
+        model = self.models[self.batch_label]
+
+        if model is Tag:
+            self.import_tags(self.batch)
+        elif model._meta.auto_created:
+            self.import_links(model, self.batch)
+        else:
+            self.import_objects(model, self.batch)
+
+        self.count += len(self.batch)
+        self.batch = []
+
+    def get_pk(self, model, old_pk):
+        """ Returns the new pk of an imported row. """
+        try:
+            return self.pks[model._meta.label_lower][old_pk]
+        except KeyError:
+            raise ValueError(f'{model._meta.label_lower} {old_pk} has not been imported') from None
+
+    def get_user_pks(self, rows: List[dict]) -> Dict[str, int]:
+        usernames = {row['creator'] for row in rows if row.get('creator')} - set(self.user_pks)
+
+        if usernames:
+            users = get_user_model()._default_manager.filter(username__in=usernames).values_list('username', 'pk')
+            self.user_pks.update(users)
+
+        return self.user_pks
+
+    def import_tags(self, rows: List[dict]):
+        names = {row['name'] for row in rows}
+        existing = set(Tag.objects.filter(name__in=names).values_list('name', flat=True))
+        Tag.objects.bulk_create([Tag(name=name) for name in names - existing])
+
+        pks = dict(Tag.objects.filter(name__in=names).values_list('name', 'pk'))
+        self.pks['quizzes.tag'].update((row['pk'], pks[row['name']]) for row in rows)
+
+    def import_objects(self, model, rows: List[dict]):
+        user_pks = self.get_user_pks(rows)
+        instances = []
+
+        for row in rows:
+            fields = {name: value for name, value in row.items() if name not in ('pk', 'creator', 'question')}
+            fields['creator_id'] = user_pks.get(row.get('creator'))
+            if 'question' in row:
+                fields['question_id'] = self.get_pk(Question, row['question'])
+            instances.append(model(**fields))
+
+        timestamps = [(instance.created_on, instance.updated_on) for instance in instances] \
+            if hasattr(model, 'created_on') else None
+
+        bulk_create(model, instances, self.batch_size)
+
+        if timestamps:
+            # Saving sets automatic timestamps to the current time, so set them back to the imported times
+            for instance, (created_on, updated_on) in zip(instances, timestamps):
+                instance.created_on, instance.updated_on = created_on, updated_on
+            model._default_manager.bulk_update(instances, ['created_on', 'updated_on'], batch_size=self.batch_size)
+
+        self.pks[model._meta.label_lower].update((row['pk'], instance.pk) for row, instance in zip(rows, instances))
+
+    def import_links(self, model, rows: List[dict]):
+        links = []
+
+        for row in rows:
+            fields = {}
+            for name, value in row.items():
+                if name != 'pk':
+                    field = model._meta.get_field(name)
+                    fields[field.attname] = self.get_pk(field.related_model, value)
+            links.append(model(**fields))
+
+        model._default_manager.bulk_create(links, batch_size=self.batch_size)
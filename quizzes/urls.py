@@ -1,3 +1,4 @@
+from django.urls import re_path
 from rest_framework import routers
 
 from . import views
@@ -9,3 +10,13 @@ router.register(r'tags', views.TagViewSet)
 router.register(r'questions', views.QuestionViewSet)
 router.register(r'answers', views.AnswerViewSet)
 router.register(r'quizzes', views.QuizViewSet)
+
+# Lists of the objects created by a user (see CreatorFilter), e.g. /users/1/quizzes/ or /users/me/quizzes/
+user_urlpatterns = [
+    re_path(r'^users/(?P<creator>[0-9]+|me)/questions/$', views.QuestionViewSet.as_view({'get': 'list'}),
+            name='user-questions'),
+    re_path(r'^users/(?P<creator>[0-9]+|me)/answers/$', views.AnswerViewSet.as_view({'get': 'list'}),
+            name='user-answers'),
+    re_path(r'^users/(?P<creator>[0-9]+|me)/quizzes/$', views.QuizViewSet.as_view({'get': 'list'}),
+            name='user-quizzes'),
+]
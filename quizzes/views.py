@@ -1,28 +1,63 @@
-from rest_framework import filters
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser, AllowAny
+from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
 from .models import Quiz, Question, Answer, Tag
+from .filters import CreatorFilter
 from .permissions import IsCreatorOrAdminUserOrReadOnly
-from .serializers import TagSerializer, QuestionSerializer, AnswerSerializer, QuizSerializer
-from .viewsets import UserLinkedModelViewSet
+from .search import FullTextSearchFilter, TAG_INDEX, QUESTION_INDEX, ANSWER_INDEX, QUIZ_INDEX
+from .tag_index import TagFilter
+from .serializers import TagSerializer, QuestionSerializer, AnswerSerializer, QuizSerializer, VoteSerializer, \
+    AttemptSerializer, QuestionResultSerializer, QuizBundleSerializer, QuestionStatsSerializer, QuizStatsSerializer, \
+    QuizSummarySerializer
+from . import NO_QUIZZES_AVAILABLE_MESSAGE
+from .cache import representation_cache
+from .feed import latest_quizzes
+from .mixins import BulkModelMixin, ValuesRepresentationMixin, ConditionalGetMixin, StatsMixin
+from .viewsets import UserLinkedModelViewSet, CachedUserLinkedModelViewSet
+from .stats import record_attempt
+from .votes import vote_buffer, record_votes
 
 
-class TagViewSet(ModelViewSet):
+class TagViewSet(BulkModelMixin, ValuesRepresentationMixin, ModelViewSet):
     """ Allows tags to be viewed or edited. """
     queryset = Tag.objects.all().order_by('pk')
     serializer_class = TagSerializer
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [FullTextSearchFilter]
     search_fields = ['name']
+    search_indexes = [('pk', TAG_INDEX)]
 
 
-class QuestionViewSet(UserLinkedModelViewSet):
+class QuestionViewSet(StatsMixin, ConditionalGetMixin, CachedUserLinkedModelViewSet):
     """ Allows questions to be viewed or edited. """
     queryset = Question.objects.all().order_by('pk')
     serializer_class = QuestionSerializer
+    stats_serializer_class = QuestionStatsSerializer
     permission_classes = [IsCreatorOrAdminUserOrReadOnly]
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [CreatorFilter, TagFilter, FullTextSearchFilter]
     search_fields = ['creator__username', 'creator__email', 'text', 'description', 'tags__name']
+    search_indexes = [('pk', QUESTION_INDEX), ('tags', TAG_INDEX)]
+    search_user_lookups = ['creator']
+    tag_index_lookup = 'question_ids'
+
+    def get_queryset(self):
+        # Annotate the number of correct answers so 'is_multiple_choice' doesn't need a query per question. It's read
+        # from the question's statistics rather than counted by grouping answers, which would group every question to
+        # sort a page of them. Questions without statistics (e.g. created without signals) have their answers counted.
+        correct_answers = Answer.objects.filter(question=OuterRef('pk'), is_correct_answer=True).order_by() \
+            .values('question').annotate(count=Count('pk')).values('count')
+        correct_answer_count = Coalesce(F('stats__correct_answer_count'), Subquery(correct_answers), 0)
+        return super().get_queryset().annotate(correct_answer_count=correct_answer_count)
+
+    def get_validation_queryset(self):
+        # The number of correct answers isn't needed to find when questions were last modified
+        return super().get_queryset()
 
 
 class AnswerViewSet(UserLinkedModelViewSet):
@@ -30,16 +65,103 @@ class AnswerViewSet(UserLinkedModelViewSet):
     queryset = Answer.objects.all().order_by('pk')
     serializer_class = AnswerSerializer
     permission_classes = [IsCreatorOrAdminUserOrReadOnly]
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [CreatorFilter, FullTextSearchFilter]
     search_fields = ['creator__username', 'creator__email', 'question__text', 'question__description',
                      'question__tags__name', 'text']
+    search_indexes = [('pk', ANSWER_INDEX), ('question', QUESTION_INDEX), ('question__tags', TAG_INDEX)]
+    search_user_lookups = ['creator']
+
+    @action(detail=False, methods=['post'], serializer_class=VoteSerializer)
+    def vote(self, request):
+        """
+        Records a vote for each of the given answers. Answers given more than once are only voted for once.
+
+        Votes are buffered and written in bulk if the VOTE_BUFFER_FLUSH_INTERVAL setting is positive.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        answer_ids = serializer.validated_data['answers']
+        record_votes(answer_ids)
+        return Response({'votes': len(answer_ids)}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='vote-buffer', permission_classes=[IsAdminUser])
+    def vote_buffer_stats(self, request):
+        """ Returns metrics for votes buffered by this process, e.g. the number of votes that are yet to be written. """
+        return Response(vote_buffer.stats())
 
 
-class QuizViewSet(UserLinkedModelViewSet):
+class QuizViewSet(StatsMixin, ConditionalGetMixin, CachedUserLinkedModelViewSet):
     """ Allows quizzes to be viewed or edited. """
-    queryset = Quiz.objects.all().order_by('pk')
+    queryset = Quiz.objects.all().order_by('created_on', 'pk')
     serializer_class = QuizSerializer
+    stats_serializer_class = QuizStatsSerializer
     permission_classes = [IsCreatorOrAdminUserOrReadOnly]
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [CreatorFilter, TagFilter, FullTextSearchFilter]
     search_fields = ['creator__username', 'creator__email', 'name', 'description', 'questions__text',
                      'questions__description', 'questions__tags__name']
+    search_indexes = [('pk', QUIZ_INDEX), ('questions', QUESTION_INDEX), ('questions__tags', TAG_INDEX)]
+    search_user_lookups = ['creator']
+    tag_index_lookup = 'quiz_ids'
+
+    @action(detail=True, methods=['get'], serializer_class=QuizBundleSerializer)
+    def bundle(self, request, pk=None):
+        """
+        Returns this quiz with its questions, their answers and tag names embedded.
+
+        Users other than the quiz's creator and admins can pass '?hide_correct_answers=true' to leave out which answers
+        are correct, e.g. when displaying a quiz to be attempted.
+        """
+        quiz = self.get_object_without_prefetching()
+        hide_correct_answers = request.query_params.get('hide_correct_answers', '').lower() in ('true', '1') \
+            and not (request.user.is_staff or quiz.creator_id == request.user.pk)
+
+        context = self.get_serializer_context()
+        context['hide_correct_answers'] = hide_correct_answers
+        return Response(self.get_cached_representation(quiz, variant=f'hide:{hide_correct_answers}', context=context))
+
+    @action(detail=False, methods=['get'], serializer_class=QuizSummarySerializer)
+    def latest(self, request):
+        """
+        Returns summaries of the most recently created quizzes, newest first.
+
+        Summaries are represented from a cache of the latest quizzes (see quizzes.feed), so no queries are made once
+        it's cached.
+        """
+        rows = latest_quizzes.get_rows()
+        response = Response(self.get_values_representation().represent(rows))
+
+        if not rows:
+            response.message = NO_QUIZZES_AVAILABLE_MESSAGE
+
+        return response
+
+    @action(detail=False, methods=['get'], url_path='cache-stats', permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """ Returns the number of representation cache hits and misses made by this process. """
+        return Response(representation_cache.stats())
+
+    @action(detail=True, methods=['post'], serializer_class=AttemptSerializer, permission_classes=[AllowAny])
+    def attempt(self, request, pk=None):
+        """
+        Grades an attempt at this quiz given the ids of the chosen answers, and records a vote for each chosen answer.
+
+        A question is answered correctly if exactly its correct answers are chosen.
+        """
+        quiz = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        answer_ids = set(serializer.validated_data['answers'])
+
+        try:
+            results = quiz.grade(answer_ids)
+        except ValueError as e:
+            raise ValidationError({'answers': [str(e)]})
+
+        record_votes(answer_ids)
+        record_attempt(quiz.pk, results)
+
+        return Response({
+            'score': sum(result.is_correct for result in results),
+            'total': len(results),
+            'questions': QuestionResultSerializer(results, many=True, context=self.get_serializer_context()).data
+        })
@@ -1,12 +1,25 @@
 from rest_framework.viewsets import ModelViewSet
 
-from quizzes.mixins import CreateUserLinkedModelMixin
+from quizzes.mixins import CreateUserLinkedModelMixin, RelatedQuerySetMixin, CachedRetrieveMixin, BulkModelMixin, \
+    ValuesRepresentationMixin
 
 
-class UserLinkedModelViewSet(CreateUserLinkedModelMixin, ModelViewSet):
+class UserLinkedModelViewSet(BulkModelMixin, ValuesRepresentationMixin, CreateUserLinkedModelMixin,
+                             RelatedQuerySetMixin, ModelViewSet):
     """
-    ModelViewSet that sets the user related to an object being created to the user who made the request.
+    ModelViewSet that sets the user related to an object being created to the user who made the request, fetches the
+    related objects its serializer needs up front, creates, updates or deletes lists of objects in bulk, and represents
+    listed and retrieved objects from their values.
 
-    See CreateUserLinkedModelMixin for details.
+    See CreateUserLinkedModelMixin, RelatedQuerySetMixin, BulkModelMixin and ValuesRepresentationMixin for details.
+    """
+    pass
+
+
+class CachedUserLinkedModelViewSet(CachedRetrieveMixin, UserLinkedModelViewSet):
+    """
+    UserLinkedModelViewSet that caches the representations of objects returned by the retrieve action.
+
+    See CachedRetrieveMixin for details.
     """
     pass
@@ -0,0 +1,211 @@
+import logging
+import threading
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Mapping, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import Answer
+from .signals import invalidate_questions
+from .stats import refresh_stats
+
+logger = logging.getLogger(__name__)
+
+# Answers whose votes are added by each UPDATE on databases without a limit on the number of query parameters
+DEFAULT_BATCH_SIZE = 500
+
+
+def get_batch_size() -> int:
+    """
+    Returns the number of answers whose votes can be added by a single UPDATE, which has up to three parameters per
+    answer (see AnswerManager.add_votes), within the database's limit on the number of query parameters (999 on some
+    SQLite builds).
+    """
+    max_query_params = connection.features.max_query_params
+    return max_query_params // 3 if max_query_params else DEFAULT_BATCH_SIZE
+
+
+def get_batches(votes: Mapping[int, int], batch_size: int) -> Iterator[Dict[int, int]]:
+    """ Yields the given votes in batches of up to `batch_size` answers. """
+    items = iter(list(votes.items()))
+    batch = dict(islice(items, batch_size))
+
+    while batch:
+        yield batch
+        batch = dict(islice(items, batch_size))
+
+
+class VoteBuffer:
+    """
+    Accumulates votes for answers in memory and writes them to the database in bulk.
+
+    Votes are flushed once `flush_interval` milliseconds have passed since the first vote was buffered, or as soon as
+    `max_votes` votes are buffered, whichever comes first. Each flush adds the accumulated votes with a single UPDATE
+    per `batch_size` answers (see get_batch_size), so many submissions share one write instead of each taking
+    SQLite's writer lock. The statistics of the answers' questions and quizzes are refreshed, and their cached
+    representations invalidated, after each batch.
+
+    Votes that have not been flushed are lost if the process is killed. QuizzesConfig registers an exit handler that
+    flushes the buffer when the interpreter shuts down normally.
+    """
+
+    def __init__(self, flush_interval: Optional[int] = None, max_votes: Optional[int] = None,
+                 batch_size: Optional[int] = None):
+        self._flush_interval = flush_interval
+        self._max_votes = max_votes
+        self._batch_size = batch_size
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._votes = Counter()
+        self._timer = None
+
+        self.flushes = 0
+        self.flushed_votes = 0
+
+    @property
+    def flush_interval(self) -> int:
+        """ Milliseconds to wait before flushing buffered votes. Defaults to the VOTE_BUFFER_FLUSH_INTERVAL setting. """
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return settings.VOTE_BUFFER_FLUSH_INTERVAL
+
+    @property
+    def max_votes(self) -> int:
+        """ Number of buffered votes that triggers a flush. Defaults to the VOTE_BUFFER_MAX_VOTES setting. """
+        if self._max_votes is not None:
+            return self._max_votes
+        return settings.VOTE_BUFFER_MAX_VOTES
+
+    @property
+    def batch_size(self) -> int:
+        """ Number of answers whose votes are written by each UPDATE. Defaults to get_batch_size. """
+        if self._batch_size is not None:
+            return self._batch_size
+        return get_batch_size()
+
+    @property
+    def enabled(self) -> bool:
+        """ Returns True if votes should be buffered, i.e. the flush interval is positive. """
+        return self.flush_interval > 0
+
+    @property
+    def pending_votes(self) -> int:
+        """ Number of votes that have been buffered but not yet flushed. """
+        with self._lock:
+            return sum(self._votes.values())
+
+    @property
+    def pending_answers(self) -> int:
+        """ Number of distinct answers with buffered votes. """
+        with self._lock:
+            return len(self._votes)
+
+    def stats(self) -> dict:
+        """ Returns metrics describing the state of this buffer. """
+        with self._lock:
+            pending_votes = sum(self._votes.values())
+            pending_answers = len(self._votes)
+
+        return {
+            'pending_votes': pending_votes,
+            'pending_answers': pending_answers,
+            'flushes': self.flushes,
+            'flushed_votes': self.flushed_votes,
+            'flush_interval': self.flush_interval,
+            'max_votes': self.max_votes
+        }
+
+    def add(self, answer_ids: Iterable[int]):
+        """ Buffers one vote for each of the given answers. Answers given more than once receive more than one vote. """
+        with self._lock:
+            self._votes.update(answer_ids)
+            should_flush = sum(self._votes.values()) >= self.max_votes
+
+            if not should_flush and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval / 1000, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> int:
+        """ Writes all buffered votes to the database. Returns the number of votes written. """
+        with self._flush_lock:
+            with self._lock:
+                votes, self._votes = self._votes, Counter()
+
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            if not votes:
+                return 0
+
+            total = sum(votes.values())
+
+            try:
+                for batch in get_batches(votes, self.batch_size):
+                    add_votes(batch)
+
+                    # Only forget votes once they've been committed
+                    for answer_id in batch:
+                        del votes[answer_id]
+            except Exception:
+                # Put back any votes that weren't written so they are retried by the next flush
+                with self._lock:
+                    self._votes.update(votes)
+                raise
+
+            self.flushes += 1
+            self.flushed_votes += total
+            return total
+
+    def _flush_on_timer(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to flush buffered votes")
+        finally:
+            # Timer threads open their own database connection, which would otherwise never be closed
+            connection.close()
+
+
+def add_votes(votes: Mapping[int, int]):
+    """
+    Adds votes to answers given a mapping of answer ids to the number of votes to add to each (see
+    AnswerManager.add_votes), refreshes the statistics of their questions and invalidates the cached representations
+    of their questions and quizzes, as votes are added without sending signals.
+
+    Votes are added and statistics refreshed in a single transaction, so either both are committed or neither is. The
+    votes of more answers than get_batch_size should be added in batches.
+    """
+    with transaction.atomic():
+        Answer.objects.add_votes(votes)
+        question_ids = list(Answer.objects.filter(pk__in=list(votes)).values_list('question', flat=True).distinct())
+        refresh_stats(question_ids)
+
+    invalidate_questions(question_ids)
+
+
+vote_buffer = VoteBuffer()
+
+
+def flush_vote_buffer():
+    """ Flushes the shared vote buffer, logging rather than raising any error. Used as an exit handler. """
+    try:
+        vote_buffer.flush()
+    except Exception:
+        logger.exception("Failed to flush buffered votes")
+
+
+def record_votes(answer_ids: Iterable[int]):
+    """ Records a vote for each of the given answers, buffering them if the shared vote buffer is enabled. """
+    if vote_buffer.enabled:
+        vote_buffer.add(answer_ids)
+    else:
+        for batch in get_batches(Counter(answer_ids), get_batch_size()):
+            add_votes(batch)
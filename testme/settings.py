@@ -9,7 +9,7 @@ https://docs.djangoproject.com/en/3.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.1/ref/settings/
 """
-from os import environ
+from os import environ, cpu_count
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -39,9 +39,9 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'quizzes',
+    'quizzes.apps.QuizzesConfig',
     'rest_framework',
-    'testme_auth',
+    'testme_auth.apps.AuthConfig',
     'utils'
 ]
 
@@ -106,6 +106,29 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# Hasher new passwords are hashed with: 'pbkdf2', 'argon2' (requires argon2-cffi) or 'scrypt', and the costs of each.
+# Passwords hashed with another hasher or other costs are rehashed when their users next log in. Hashes are computed on
+# a pool of PASSWORD_HASHING_THREADS threads, and requests are rejected (503) when more than PASSWORD_HASHING_QUEUE
+# hashes are waiting for a thread (see testme_auth.hashers).
+PASSWORD_HASHER = environ.get('PASSWORD_HASHER', 'pbkdf2')
+PBKDF2_ITERATIONS = int(environ.get('PBKDF2_ITERATIONS', 216000))
+ARGON2_TIME_COST = int(environ.get('ARGON2_TIME_COST', 2))
+ARGON2_MEMORY_COST = int(environ.get('ARGON2_MEMORY_COST', 512))
+ARGON2_PARALLELISM = int(environ.get('ARGON2_PARALLELISM', 2))
+SCRYPT_WORK_FACTOR = int(environ.get('SCRYPT_WORK_FACTOR', 2 ** 14))
+SCRYPT_BLOCK_SIZE = int(environ.get('SCRYPT_BLOCK_SIZE', 8))
+SCRYPT_PARALLELISM = int(environ.get('SCRYPT_PARALLELISM', 1))
+PASSWORD_HASHING_THREADS = int(environ.get('PASSWORD_HASHING_THREADS', cpu_count() or 1))
+PASSWORD_HASHING_QUEUE = int(environ.get('PASSWORD_HASHING_QUEUE', 64))
+
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'testme_auth.hashers.PBKDF2PasswordHasher',
+    'argon2': 'testme_auth.hashers.Argon2PasswordHasher',
+    'scrypt': 'testme_auth.hashers.ScryptPasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS.pop(PASSWORD_HASHER), *_PASSWORD_HASHERS.values()]
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.1/topics/i18n/
 
@@ -136,14 +159,55 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly'
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'testme_auth.authentication.TokenClaimsJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication'
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'utils.renderers.DescriptiveJsonRenderer',
+        'utils.renderers.StreamingJsonRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'EXCEPTION_HANDLER': 'utils.exception_handlers.custom_exception_handler',
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'utils.pagination.KeysetPagination',
     'PAGE_SIZE': 10
 }
+
+# Votes
+# Milliseconds that votes for answers are buffered in memory before being written to the database in bulk (0 writes
+# votes immediately), and the number of buffered votes that causes them to be written early.
+VOTE_BUFFER_FLUSH_INTERVAL = int(environ.get('VOTE_BUFFER_FLUSH_INTERVAL', 0))
+VOTE_BUFFER_MAX_VOTES = int(environ.get('VOTE_BUFFER_MAX_VOTES', 1000))
+
+# Representation cache
+# Name of the cache (see CACHES) used to cache serialized quizzes and questions, and the number of seconds they are
+# cached for. Django uses a local-memory cache by default.
+REPRESENTATION_CACHE_ALIAS = environ.get('REPRESENTATION_CACHE_ALIAS', 'default')
+REPRESENTATION_CACHE_TIMEOUT = int(environ.get('REPRESENTATION_CACHE_TIMEOUT', 300))
+
+# Token revocation
+# Name of the cache (see CACHES) that revoked JWTs are recorded in, and the number of seconds each process remembers the
+# revocations it has read. Safe requests are authenticated from a token's claims without fetching the user, so a token
+# revoked by another process may be accepted for this long. Use a cache shared by every process (e.g. memcached).
+JWT_REVOCATION_CACHE_ALIAS = environ.get('JWT_REVOCATION_CACHE_ALIAS', 'default')
+JWT_REVOCATION_CHECK_INTERVAL = int(environ.get('JWT_REVOCATION_CHECK_INTERVAL', 30))
+
+SIMPLE_JWT = {
+    # Users safe requests are authenticated as (see testme_auth.authentication)
+    'TOKEN_USER_CLASS': 'testme_auth.authentication.TokenUser',
+}
+
+# Username and email availability
+# Seconds before the in-memory bloom filter of taken usernames and emails is rebuilt from the database, and the
+# proportion of available values it reports as possibly taken (which are then looked up). The filter is updated as this
+# process registers users, so the max age bounds how long users registered by other processes go unseen.
+USER_AVAILABILITY_FILTER_MAX_AGE = int(environ.get('USER_AVAILABILITY_FILTER_MAX_AGE', 60))
+USER_AVAILABILITY_FILTER_ERROR_RATE = float(environ.get('USER_AVAILABILITY_FILTER_ERROR_RATE', 0.01))
+
+# Tag index
+# Seconds before the in-memory index used to filter questions and quizzes by tag is rebuilt from the database. The index
+# is updated as this process changes tags, so this only bounds how long changes made by other processes go unseen.
+TAG_INDEX_MAX_AGE = int(environ.get('TAG_INDEX_MAX_AGE', 60))
+
+# JSON
+# Library used to encode JSON responses: 'orjson', 'ujson' or 'json' (the standard library). Defaults to the fastest
+# one installed.
+JSON_BACKEND = environ.get('JSON_BACKEND', '')
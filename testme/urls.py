@@ -15,19 +15,20 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework import routers
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from quizzes.urls import router as quizzes_router
+from quizzes.routers import BulkRouter
+from quizzes.urls import router as quizzes_router, user_urlpatterns
 from testme_auth.urls import router as auth_router
+from testme_auth.views import TokenObtainPairView, TokenRefreshView
 
-router = routers.DefaultRouter()
+router = BulkRouter()
 router.registry.extend(quizzes_router.registry)
 router.registry.extend(auth_router.registry)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include(router.urls)),
+    path('api/', include(user_urlpatterns)),
     path('api/', include('rest_framework.urls', namespace='rest_framework')),
     path('api/auth/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
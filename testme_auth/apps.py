@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class AuthConfig(AppConfig):
     name = 'testme_auth'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - connects signal receivers
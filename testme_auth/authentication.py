@@ -0,0 +1,278 @@
+"""
+Authenticates requests with JWTs without fetching the user from the database for safe (read only) requests.
+
+Tokens issued by TokenObtainPairView carry the user's username, whether they are staff, and when they were issued (see
+TokenObtainPairSerializer). Safe requests are authenticated as a TokenUser built from these claims, so they don't query
+the user table. Other requests fetch the user as JWTAuthentication does, as they may save objects linked to the user.
+Tokens issued without these claims are always authenticated against the database.
+
+A token's claims can't change once it's issued, so saving or deleting a user revokes every token issued to them before
+then (see testme_auth.signals). Tokens only record the second they were issued in, so tokens issued in the same second
+as a revocation are revoked too. Revocations are stored in the cache named by the
+JWT_REVOCATION_CACHE_ALIAS setting, and each process remembers the revocations it has read for
+JWT_REVOCATION_CHECK_INTERVAL seconds, so other processes may accept a revoked token for up to that long.
+
+Individual refresh tokens are revoked by their id (jti) when they're used, as they're rotated (see
+TokenRefreshSerializer). Each is kept in the same cache until the token expires, so the revoked tokens stored are
+bounded by the tokens that could still be used. Database and file based caches only delete expired entries once
+they're full, so they should be cleaned up periodically with the cleanup_revoked_tokens command.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import connections, router, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser as BaseTokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+# Claims a user is built from, added to tokens by TokenObtainPairSerializer
+USER_CLAIMS = ('username', 'is_staff', 'iat')
+
+
+class TokenUser(BaseTokenUser):
+    """
+    A user built from a token's claims (see TOKEN_USER_CLASS in SIMPLE_JWT). Like simplejwt's TokenUser it has no
+    permissions, but it does have every permission in an empty list, as users do, so DjangoModelPermissions allows it
+    to make safe requests (which require no permissions).
+    """
+
+    def has_perms(self, perm_list, obj=None):
+        return all(self.has_perm(perm, obj) for perm in perm_list)
+
+
+class TokenRevocations:
+    """
+    Records when each user's tokens were last revoked. Revocations are kept in the cache for as long as the longest
+    lived token, and the revocations read from it are remembered by this process for a while, for up to `max_size`
+    users.
+    """
+
+    def __init__(self, alias: str = None, check_interval: int = None, max_size: int = 10000,
+                 prefix: str = 'jwt-revoked'):
+        self._alias = alias
+        self._check_interval = check_interval
+        self.max_size = max_size
+        self.prefix = prefix
+
+        # Maps user ids to when their revocation was read from the cache and when their tokens were revoked (if ever),
+        # least recently used first
+        self._lock = threading.Lock()
+        self._revocations = OrderedDict()
+
+    @property
+    def cache(self):
+        return caches[self._alias or settings.JWT_REVOCATION_CACHE_ALIAS]
+
+    @property
+    def check_interval(self) -> int:
+        """ Seconds revocations read from the cache are remembered for. Defaults to JWT_REVOCATION_CHECK_INTERVAL. """
+        if self._check_interval is not None:
+            return self._check_interval
+        return settings.JWT_REVOCATION_CHECK_INTERVAL
+
+    @property
+    def timeout(self) -> int:
+        lifetime = max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME)
+        return int(lifetime.total_seconds())
+
+    def get_key(self, user_id) -> str:
+        return f'{self.prefix}:{user_id}'
+
+    def revoke(self, user_id):
+        """ Revokes every token issued to a user until now. """
+        revoked_at = time.time()
+        self.cache.set(self.get_key(user_id), revoked_at, timeout=self.timeout)
+        self._remember(user_id, revoked_at)
+
+    def get_revoked_at(self, user_id) -> Optional[float]:
+        """ Returns when a user's tokens were last revoked (as a timestamp), or None if they haven't been. """
+        with self._lock:
+            entry = self._revocations.get(user_id)
+
+            if entry is not None and time.monotonic() - entry[0] < self.check_interval:
+                self._revocations.move_to_end(user_id)
+                return entry[1]
+
+        revoked_at = self.cache.get(self.get_key(user_id))
+        self._remember(user_id, revoked_at)
+        return revoked_at
+
+    def is_revoked(self, token) -> bool:
+        """
+        Returns whether the given token was issued before its user's tokens were last revoked, or in the same second.
+        """
+        revoked_at = self.get_revoked_at(token[api_settings.USER_ID_CLAIM])
+        return revoked_at is not None and token.get('iat', 0) <= revoked_at
+
+    def clear(self):
+        """ Forgets the revocations read by this process, so they're read from the cache when next needed. """
+        with self._lock:
+            self._revocations.clear()
+
+    def _remember(self, user_id, revoked_at: Optional[float]):
+        with self._lock:
+            self._revocations[user_id] = (time.monotonic(), revoked_at)
+            self._revocations.move_to_end(user_id)
+
+            if len(self._revocations) > self.max_size:
+                self._revocations.popitem(last=False)
+
+
+token_revocations = TokenRevocations()
+
+
+class RevokedTokens:
+    """
+    Records the ids (jti) of individual tokens that have been revoked, until they expire. Revoked ids are stored in the
+    cache, and the ids this process has revoked or read are remembered until they expire, for up to `max_size` ids.
+    Ids that aren't revoked aren't remembered, so tokens revoked by other processes are rejected straight away.
+    """
+
+    def __init__(self, alias: str = None, max_size: int = 10000, prefix: str = 'jwt-revoked-jti'):
+        self._alias = alias
+        self.max_size = max_size
+        self.prefix = prefix
+
+        # Maps revoked ids to when their tokens expire (as a timestamp), least recently used first
+        self._lock = threading.Lock()
+        self._revoked = OrderedDict()
+
+    @property
+    def cache(self):
+        return caches[self._alias or settings.JWT_REVOCATION_CACHE_ALIAS]
+
+    def get_key(self, jti: str) -> str:
+        return f'{self.prefix}:{jti}'
+
+    def revoke(self, jti: str, exp: int) -> bool:
+        """
+        Revokes the token with the given id until it expires. Returns False if it was already revoked, atomically if the
+        cache supports it (e.g. memcached), so a token can only be revoked once.
+        """
+        timeout = exp - int(time.time())
+
+        if timeout <= 0 or self._is_remembered(jti):
+            return False
+
+        revoked = self.cache.add(self.get_key(jti), exp, timeout=timeout)
+        self._remember(jti, exp)
+        return revoked
+
+    def revoke_token(self, token) -> bool:
+        """ Revokes the given token until it expires. Returns False if it was already revoked. """
+        return self.revoke(token[api_settings.JTI_CLAIM], token['exp'])
+
+    def is_revoked(self, jti: str) -> bool:
+        """ Returns whether the token with the given id has been revoked. """
+        if self._is_remembered(jti):
+            return True
+
+        exp = self.cache.get(self.get_key(jti))
+
+        if exp is not None:
+            self._remember(jti, exp)
+
+        return exp is not None
+
+    def clear(self):
+        """ Forgets the ids revoked or read by this process, so they're read from the cache when next needed. """
+        with self._lock:
+            self._revoked.clear()
+
+    def _is_remembered(self, jti: str) -> bool:
+        with self._lock:
+            exp = self._revoked.get(jti)
+
+            if exp is None:
+                return False
+
+            if exp <= time.time():
+                del self._revoked[jti]
+                return False
+
+            self._revoked.move_to_end(jti)
+            return True
+
+    def _remember(self, jti: str, exp: int):
+        with self._lock:
+            self._revoked[jti] = exp
+            self._revoked.move_to_end(jti)
+
+            if len(self._revoked) > self.max_size:
+                self._revoked.popitem(last=False)
+
+
+revoked_tokens = RevokedTokens()
+
+
+class TokenClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that authenticates safe requests as a user built from the token's claims rather than fetched from
+    the database, and rejects tokens that have been revoked. Use with tokens issued by TokenObtainPairView.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        if api_settings.USER_ID_CLAIM in validated_token and token_revocations.is_revoked(validated_token):
+            raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+
+        if request.method in SAFE_METHODS and all(claim in validated_token for claim in USER_CLAIMS):
+            return self.get_token_user(validated_token), validated_token
+
+        return self.get_user(validated_token), validated_token
+
+    def get_token_user(self, validated_token):
+        """ Returns a user built from the claims of the given token, without querying the database. """
+        return api_settings.TOKEN_USER_CLASS(validated_token)
+
+
+def delete_expired_entries(cache) -> Optional[int]:
+    """
+    Deletes the expired entries of a database or file based cache, and returns how many were deleted. Returns None for
+    other caches (e.g. memcached), which delete entries as they expire.
+    """
+    if isinstance(cache, DatabaseCache):
+        db = router.db_for_write(cache.cache_model_class)
+        connection = connections[db]
+        table = connection.ops.quote_name(cache._table)
+        now = timezone.now() if settings.USE_TZ else datetime.now()
+
+        with transaction.atomic(using=db), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {table} WHERE expires < %s',
+                           [connection.ops.adapt_datetimefield_value(now.replace(microsecond=0))])
+            return cursor.rowcount
+
+    if isinstance(cache, FileBasedCache):
+        count = 0
+
+        # Expired files are deleted as they're checked
+        for path in cache._list_cache_files():
+            try:
+                with open(path, 'rb') as file:
+                    count += cache._is_expired(file)
+            except FileNotFoundError:
+                pass
+
+        return count
+
+    return None
@@ -0,0 +1,156 @@
+"""
+Checks whether usernames and emails are available to register, without a failed insert.
+
+Usernames and emails are compared case-insensitively, by their lowercase forms, which are indexed (see migration
+0003_lower_indexes). As signup forms check availability as the user types, most checks are answered by a process-local
+bloom filter of the lowercase usernames and emails already taken: a value the filter doesn't contain is available
+without querying the database, and only values it may contain (those taken, and about
+USER_AVAILABILITY_FILTER_ERROR_RATE of the rest) are looked up.
+
+The filter is built from the database on first use and kept up to date by signal receivers (see testme_auth.signals).
+Users registered by other processes aren't seen until the filter is rebuilt, which happens once it is older than the
+USER_AVAILABILITY_FILTER_MAX_AGE setting (in seconds), so the availability endpoint may report a value taken by another
+process as available for up to that long. Registering always checks the database.
+"""
+import hashlib
+import math
+import operator
+import threading
+import time
+from functools import reduce
+from typing import Dict, Optional, Set
+
+from django.conf import settings
+from django.db.models import BooleanField, ExpressionWrapper, Q, Value
+from django.db.models.functions import Lower
+
+from .models import User
+
+FIELDS = ('username', 'email')
+
+
+class BloomFilter:
+    """ A set of strings that may report false positives, at about `error_rate` once it holds `capacity` strings. """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _get_indexes(self, value: str):
+        # Double hashing, with the halves of a single digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], 'little')
+        b = int.from_bytes(digest[8:], 'little') | 1
+        return ((a + i * b) % self.size for i in range(self.hash_count))
+
+    def add(self, value: str):
+        for index in self._get_indexes(value):
+            self._bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[index >> 3] & (1 << (index & 7)) for index in self._get_indexes(value))
+
+
+class UserAvailability:
+    """
+    Process-local bloom filter of the usernames and emails that are taken, sized for twice the number of users when
+    it's built. It's rebuilt early if more users than that are added to it.
+    """
+
+    def __init__(self, max_age: int = None, error_rate: float = None):
+        self._max_age = max_age
+        self._error_rate = error_rate
+        self._lock = threading.Lock()
+        self._filter: Optional[BloomFilter] = None
+        self._built_at = None
+
+    @property
+    def max_age(self) -> int:
+        return settings.USER_AVAILABILITY_FILTER_MAX_AGE if self._max_age is None else self._max_age
+
+    @property
+    def error_rate(self) -> float:
+        return settings.USER_AVAILABILITY_FILTER_ERROR_RATE if self._error_rate is None else self._error_rate
+
+    @staticmethod
+    def get_key(field: str, value: str) -> str:
+        return f'{field}:{value.lower()}'
+
+    def build(self) -> BloomFilter:
+        """ Builds the filter from the database. """
+        capacity = max(1000, User.objects.count() * 2)
+        bloom_filter = BloomFilter(capacity, self.error_rate)
+
+        for row in User.objects.values_list(*FIELDS).iterator():
+            for field, value in zip(FIELDS, row):
+                if value is not None:
+                    bloom_filter.add(self.get_key(field, value))
+
+        with self._lock:
+            self._filter = bloom_filter
+            self._built_at = time.monotonic()
+
+        return bloom_filter
+
+    def clear(self):
+        """ Discards the filter so it is rebuilt when next used. """
+        with self._lock:
+            self._filter = None
+            self._built_at = None
+
+    def add(self, user: User):
+        """ Adds a user's username and email to the filter, if it's built. """
+        with self._lock:
+            if self._filter is None:
+                return
+
+            for field in FIELDS:
+                value = getattr(user, field)
+                if value is not None:
+                    self._filter.add(self.get_key(field, value))
+
+    def get_filter(self) -> BloomFilter:
+        with self._lock:
+            bloom_filter = self._filter
+            is_fresh = bloom_filter is not None and time.monotonic() - self._built_at <= self.max_age
+
+        if is_fresh and bloom_filter.count <= bloom_filter.capacity:
+            return bloom_filter
+
+        return self.build()
+
+    @staticmethod
+    def get_taken(**values: str) -> Set[str]:
+        """ Returns which of the given fields (usernames or emails) are taken, with a single query. """
+        values = {field: value for field, value in values.items() if value is not None}
+
+        if not values:
+            return set()
+
+        # Both sides are lowercased by the database, so they're compared the same way the indexes are built
+        conditions = {field: Q(**{f'{field}_lower': Lower(Value(value))}) for field, value in values.items()}
+        queryset = User.objects.annotate(**{f'{field}_lower': Lower(field) for field in conditions}).annotate(**{
+            f'{field}_taken': ExpressionWrapper(condition, output_field=BooleanField())
+            for field, condition in conditions.items()
+        }).filter(reduce(operator.or_, conditions.values()))
+
+        taken = set()
+
+        for row in queryset.values_list(*[f'{field}_taken' for field in conditions]):
+            taken.update(field for field, is_taken in zip(conditions, row) if is_taken)
+
+        return taken
+
+    def get_available(self, **values: str) -> Dict[str, bool]:
+        """ Returns whether each of the given fields (usernames or emails) is available. """
+        bloom_filter = self.get_filter()
+        maybe_taken = {field: value for field, value in values.items() if self.get_key(field, value) in bloom_filter}
+        taken = self.get_taken(**maybe_taken)
+        return {field: field not in taken for field in values}
+
+
+user_availability = UserAvailability()
@@ -1,3 +1,4 @@
+from rest_framework import status
 from rest_framework.exceptions import APIException
 
 
@@ -11,3 +12,9 @@ class EmailInUseException(APIException):
     status_code = 200
     default_detail = 'This email is already linked to another account.'
     default_code = 'email_in_use'
+
+
+class PasswordHashingUnavailableException(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many passwords are being checked, please try again shortly.'
+    default_code = 'password_hashing_unavailable'
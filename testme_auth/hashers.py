@@ -0,0 +1,184 @@
+"""
+Password hashers whose costs are read from the settings (see PASSWORD_HASHER in testme.settings), and which hash on a
+bounded pool of threads.
+
+Hashing is deliberately slow and CPU bound, so a burst of registrations or logins could otherwise take up every
+request thread. Hashes are computed on a pool of PASSWORD_HASHING_THREADS threads (hashlib and argon2 release the GIL,
+so they run in parallel), with up to PASSWORD_HASHING_QUEUE hashes waiting for a thread. Requests that need a hash while
+the queue is full are rejected with 503 Service Unavailable rather than waiting.
+
+Passwords hashed with a hasher other than the preferred one, or with different costs, are rehashed when their users
+next log in (see `django.contrib.auth.hashers.check_password`).
+"""
+import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+
+from .exceptions import PasswordHashingUnavailableException
+
+
+class HashingPool:
+    """ Runs functions on a bounded pool of threads, raising PasswordHashingUnavailableException if it's full. """
+
+    def __init__(self, threads: int = None, queue: int = None):
+        self._threads = threads
+        self._queue = queue
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+
+        # Set on the pool's threads, so hashes computed by functions already on the pool aren't queued behind them
+        self._local = threading.local()
+
+    @property
+    def threads(self) -> int:
+        return settings.PASSWORD_HASHING_THREADS if self._threads is None else self._threads
+
+    @property
+    def queue(self) -> int:
+        return settings.PASSWORD_HASHING_QUEUE if self._queue is None else self._queue
+
+    def run(self, func, *args, **kwargs):
+        """ Calls the given function on the pool and returns its result, waiting for it to finish. """
+        if getattr(self._local, 'in_pool', False):
+            return func(*args, **kwargs)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.threads, thread_name_prefix='password-hashing')
+                self._slots = threading.BoundedSemaphore(self.threads + self.queue)
+
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingUnavailableException()
+
+        try:
+            return self._executor.submit(self._call, func, args, kwargs).result()
+        finally:
+            self._slots.release()
+
+    def _call(self, func, args, kwargs):
+        self._local.in_pool = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._local.in_pool = False
+
+    def shutdown(self):
+        """ Stops the pool's threads. A new pool is started when it's next used. """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+hashing_pool = HashingPool()
+
+
+class PooledHasherMixin:
+    """ Computes hashes on the hashing pool. """
+
+    def encode(self, *args, **kwargs):
+        return hashing_pool.run(super().encode, *args, **kwargs)
+
+    def verify(self, *args, **kwargs):
+        return hashing_pool.run(super().verify, *args, **kwargs)
+
+
+class PBKDF2PasswordHasher(PooledHasherMixin, hashers.PBKDF2PasswordHasher):
+    """ PBKDF2 with SHA256, with PBKDF2_ITERATIONS iterations. """
+
+    @property
+    def iterations(self) -> int:
+        return settings.PBKDF2_ITERATIONS
+
+
+class Argon2PasswordHasher(PooledHasherMixin, hashers.Argon2PasswordHasher):
+    """ Argon2, with ARGON2_TIME_COST, ARGON2_MEMORY_COST (in KiB) and ARGON2_PARALLELISM. Requires argon2-cffi. """
+
+    @property
+    def time_cost(self) -> int:
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self) -> int:
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self) -> int:
+        return settings.ARGON2_PARALLELISM
+
+
+class ScryptPasswordHasher(hashers.BasePasswordHasher):
+    """
+    scrypt, with SCRYPT_WORK_FACTOR, SCRYPT_BLOCK_SIZE and SCRYPT_PARALLELISM. Hashes are in the same format as those of
+    Django's own scrypt hasher (added in Django 4.0), so they can be verified by it after upgrading.
+    """
+    algorithm = 'scrypt'
+
+    @property
+    def work_factor(self) -> int:
+        return settings.SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self) -> int:
+        return settings.SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self) -> int:
+        return settings.SCRYPT_PARALLELISM
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        return hashing_pool.run(self._encode, password, salt, n or self.work_factor, r or self.block_size,
+                                p or self.parallelism)
+
+    def _encode(self, password, salt, n, r, p):
+        # scrypt needs 128 * n * r bytes of memory, which may be more than OpenSSL allows by default
+        hash = hashlib.scrypt(password.encode(), salt=salt.encode(), n=n, r=r, p=p, maxmem=256 * n * r, dklen=64)
+        hash = base64.b64encode(hash).decode('ascii').strip()
+        return '%s$%d$%s$%d$%d$%s' % (self.algorithm, n, salt, r, p, hash)
+
+    def decode(self, encoded) -> dict:
+        algorithm, work_factor, salt, block_size, parallelism, hash = encoded.split('$', 5)
+        assert algorithm == self.algorithm
+        return {
+            'algorithm': algorithm,
+            'work_factor': int(work_factor),
+            'salt': salt,
+            'block_size': int(block_size),
+            'parallelism': int(parallelism),
+            'hash': hash
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(password, decoded['salt'], decoded['work_factor'], decoded['block_size'],
+                                decoded['parallelism'])
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {
+            _('algorithm'): decoded['algorithm'],
+            _('work factor'): decoded['work_factor'],
+            _('block size'): decoded['block_size'],
+            _('parallelism'): decoded['parallelism'],
+            _('salt'): hashers.mask_hash(decoded['salt']),
+            _('hash'): hashers.mask_hash(decoded['hash']),
+        }
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (decoded['work_factor'], decoded['block_size'], decoded['parallelism']) != \
+            (self.work_factor, self.block_size, self.parallelism)
+
+    def harden_runtime(self, password, encoded):
+        # The cost of scrypt can't be made up by hashing again with a lower cost, unlike PBKDF2's iterations
+        pass
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from testme_auth.authentication import delete_expired_entries, revoked_tokens
+
+
+class Command(BaseCommand):
+    help = 'Deletes expired token revocations from the cache they are stored in (see JWT_REVOCATION_CACHE_ALIAS), ' \
+           'if it does not delete them itself (database and file based caches).'
+
+    def handle(self, *args, **options):
+        count = delete_expired_entries(revoked_tokens.cache)
+
+        if count is None:
+            self.stdout.write('The cache deletes expired entries itself, nothing to clean up')
+        else:
+            self.stdout.write(f'Deleted {count} expired cache entries')
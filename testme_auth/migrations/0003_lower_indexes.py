@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Indexes the lowercase forms of usernames and emails, which are looked up to check they're available (see
+    testme_auth.availability). Django 3.1 can't declare indexes on expressions, so they're created with SQL.
+    """
+
+    dependencies = [
+        ('testme_auth', '0002_auto_20201125_1816'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX user_username_lower_idx ON testme_auth_user (LOWER(username));',
+            'DROP INDEX user_username_lower_idx;'
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX user_email_lower_idx ON testme_auth_user (LOWER(email));',
+            'DROP INDEX user_email_lower_idx;'
+        ),
+    ]
@@ -10,4 +10,7 @@ class IsSelfOrAdminUserOrReadOnly(permissions.BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        return obj == request.user or request.user.is_staff or request.method in permissions.SAFE_METHODS
+        if request.method in permissions.SAFE_METHODS or request.user.is_staff:
+            return True
+
+        return request.user.is_authenticated and obj.pk == request.user.pk
@@ -1,7 +1,16 @@
 from django.contrib.auth.password_validation import validate_password
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_to_epoch
 
+from .authentication import revoked_tokens, token_revocations
+
+from .availability import user_availability
 from .exceptions import UsernameUnavailableException, EmailInUseException
 from .models import User
 
@@ -16,19 +25,81 @@ class UserSerializer(serializers.HyperlinkedModelSerializer):
         fields = ['url', 'username', 'email', 'password']
 
     def create(self, validated_data):
+        username = validated_data['username']
+        email = validated_data['email'] or None
+        self.check_available(username, email)
+
         try:
-            user = User.objects.create_user(
-                username=validated_data['username'],
-                email=validated_data['email'],
-                password=validated_data['password']
-            )
-        except IntegrityError as e:
-            message = str(e)
-            if 'username' in message:
-                raise UsernameUnavailableException()
-            elif 'email' in message:
-                raise EmailInUseException()
-            else:
-                raise
+            # In a savepoint, so a user registering with the same username or email since they were checked doesn't
+            # break the request's transaction
+            with transaction.atomic():
+                user = User.objects.create_user(username=username, email=email, password=validated_data['password'])
+        except IntegrityError:
+            self.check_available(username, email)
+            raise
 
         return user
+
+    @staticmethod
+    def check_available(username: str, email: str = None):
+        """ Raises an exception if the given username or email are taken (ignoring case). """
+        taken = user_availability.get_taken(username=username, email=email)
+
+        if 'username' in taken:
+            raise UsernameUnavailableException()
+        if 'email' in taken:
+            raise EmailInUseException()
+
+
+class AvailabilitySerializer(serializers.Serializer):
+    """ A username and/or email to check the availability of. """
+    username = serializers.CharField(max_length=32, min_length=2, required=False)
+    email = serializers.EmailField(required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError('A username or email is required.')
+        return attrs
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    """
+    Issues tokens with the claims requests are authenticated with (see testme_auth.authentication). Access tokens
+    refreshed from a refresh token have its claims.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['username'] = user.username
+        token['is_staff'] = user.is_staff
+        token['iat'] = datetime_to_epoch(aware_utcnow())
+        return token
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """
+    Rotates refresh tokens: each can be used once, and is exchanged for an access token and a new refresh token with
+    the same claims. Used refresh tokens are revoked until they expire. A refresh token that's used again has likely
+    been stolen, so every token issued to its user is revoked.
+    """
+
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        user_id = refresh.get(api_settings.USER_ID_CLAIM)
+
+        if user_id is not None and token_revocations.is_revoked(refresh):
+            raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+
+        if not revoked_tokens.revoke_token(refresh):
+            if user_id is not None:
+                token_revocations.revoke(user_id)
+            raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+
+        data = {'access': str(refresh.access_token)}
+
+        refresh.set_jti()
+        refresh.set_exp()
+        data['refresh'] = str(refresh)
+
+        return data
@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .authentication import token_revocations
+from .availability import user_availability
+
+
+@receiver(post_save, sender=get_user_model())
+def revoke_saved_user_tokens(sender, instance, created, update_fields=None, **kwargs):
+    # The claims of existing tokens (e.g. whether the user is active or staff) may no longer be true. New users have no
+    # tokens, and logging in only updates when the user last logged in or rehashes their password (which leaves the
+    # raw password unset, see AbstractBaseUser.check_password).
+    if created or update_fields == frozenset({'last_login'}):
+        return
+    if update_fields == frozenset({'password'}) and getattr(instance, '_password', None) is None:
+        return
+
+    token_revocations.revoke(instance.pk)
+
+
+@receiver(post_delete, sender=get_user_model())
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    token_revocations.revoke(instance.pk)
+
+
+@receiver(post_save, sender=get_user_model())
+def add_taken_username(sender, instance, **kwargs):
+    user_availability.add(instance)
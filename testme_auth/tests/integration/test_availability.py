@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from parameterized import parameterized
+
+from quizzes.query_plans import capture_queries
+from testme_auth.availability import user_availability
+
+
+class AvailabilityTests(TestCase):
+    def setUp(self) -> None:
+        self.path = '/api/users/available/'
+        self.password = 'thisisasecret'
+        self.user = get_user_model().objects.create_user('User', email='user@example.com', password=self.password)
+        user_availability.clear()
+
+    def get_available(self, query: str):
+        response = self.client.get(f'{self.path}?{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    @parameterized.expand([
+        ('username=user', {'username': False}),
+        ('username=USER', {'username': False}),
+        ('username=other', {'username': True}),
+        ('email=User@Example.com', {'email': False}),
+        ('email=other@example.com', {'email': True}),
+        ('username=other&email=user@example.com', {'username': True, 'email': False}),
+    ])
+    def test_available(self, query, expected):
+        """ Usernames and emails are available if no user has them, ignoring case. """
+        self.assertEqual(self.get_available(query), expected)
+
+    @parameterized.expand([
+        ('',),
+        ('username=a',),
+        ('email=user',),
+    ])
+    def test_invalid(self, query):
+        """ A valid username or email must be given. """
+        self.assertEqual(self.client.get(f'{self.path}?{query}').status_code, 400)
+
+    def test_available_without_query(self):
+        """ Values that aren't in the bloom filter are available without querying the database. """
+        user_availability.build()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_available('username=other&email=other@example.com'),
+                             {'username': True, 'email': True})
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_available('username=user&email=user@example.com'),
+                             {'username': False, 'email': False})
+
+    def test_registered(self):
+        """ Users registered by this process are added to the filter. """
+        user_availability.build()
+        self.client.post('/api/users/', {'username': 'other', 'password': self.password})
+        self.assertEqual(self.get_available('username=OTHER'), {'username': False})
+
+    def test_rebuilt(self):
+        """ The filter is rebuilt once it's older than its max age, so users registered elsewhere are seen. """
+        user_availability.build()
+
+        with mock.patch('testme_auth.signals.user_availability'):
+            get_user_model().objects.create_user('other', password=self.password)
+
+        self.assertEqual(self.get_available('username=other'), {'username': True})
+
+        with self.settings(USER_AVAILABILITY_FILTER_MAX_AGE=-1):
+            self.assertEqual(self.get_available('username=other'), {'username': False})
+
+    def test_index(self):
+        """ Usernames and emails are looked up with the indexes on their lowercase forms. """
+        if connection.vendor != 'sqlite':
+            self.skipTest('Query plans are only checked on SQLite')
+
+        queries = capture_queries(lambda: self.get_available('username=user&email=user@example.com'))
+        plans = [step for query in queries for depth, step in query.get_steps() if 'testme_auth_user' in step]
+
+        self.assertIn('SEARCH testme_auth_user USING INDEX user_username_lower_idx (<expr>=?)', plans)
+        self.assertIn('SEARCH testme_auth_user USING INDEX user_email_lower_idx (<expr>=?)', plans)
+
+    @parameterized.expand([
+        ({'username': 'USER'}, 'This username is unavailable.'),
+        ({'username': 'other', 'email': 'USER@example.com'}, 'This email is already linked to another account.'),
+    ])
+    def test_register_taken(self, data, expected):
+        """ Registering reports usernames and emails that are taken, ignoring case, without trying to insert them. """
+        with mock.patch.object(get_user_model().objects, 'create_user') as create_user:
+            response = self.client.post('/api/users/', {'password': self.password, **data})
+
+        self.assertEqual(response.json()['data'], {'detail': expected})
+        create_user.assert_not_called()
+
+    def test_register_race(self):
+        """ Users registering with a username that's taken after it was checked get the same response. """
+        with mock.patch.object(user_availability, 'get_taken', side_effect=[set(), {'username'}]):
+            response = self.client.post('/api/users/', {'username': 'User', 'password': self.password})
+
+        self.assertEqual(response.json()['data'], {'detail': 'This username is unavailable.'})
+        self.assertEqual(get_user_model().objects.count(), 1)
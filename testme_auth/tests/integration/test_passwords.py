@@ -0,0 +1,59 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from testme_auth.authentication import token_revocations
+from testme_auth.exceptions import PasswordHashingUnavailableException
+
+PBKDF2 = 'testme_auth.hashers.PBKDF2PasswordHasher'
+SCRYPT = 'testme_auth.hashers.ScryptPasswordHasher'
+
+
+@override_settings(PASSWORD_HASHERS=[PBKDF2, SCRYPT], PBKDF2_ITERATIONS=1000, SCRYPT_WORK_FACTOR=2 ** 10)
+class PasswordTests(TestCase):
+    def setUp(self) -> None:
+        self.password = 'thisisasecret'
+        self.user = get_user_model().objects.create_user('user', password=self.password)
+        caches['default'].clear()
+        token_revocations.clear()
+
+    def login(self):
+        return self.client.post('/api/auth/', {'username': 'user', 'password': self.password})
+
+    def test_rehashed_on_login(self):
+        """ Passwords hashed with a hasher other than the preferred one are rehashed when their user logs in. """
+        with self.settings(PASSWORD_HASHERS=[SCRYPT, PBKDF2]):
+            self.assertEqual(self.login().status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$1024$'))
+        self.assertTrue(self.user.check_password(self.password))
+
+        # Rehashing a password doesn't change it, so the user's tokens are kept
+        self.assertIsNone(token_revocations.get_revoked_at(self.user.pk))
+
+    def test_rehashed_with_new_costs(self):
+        """ Passwords are rehashed when the costs of their hasher change. """
+        with self.settings(PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login().status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+
+    def test_password_changed(self):
+        """ Changing a password revokes the user's tokens. """
+        self.user.set_password('anothersecret')
+        self.user.save(update_fields=['password'])
+        self.assertIsNotNone(token_revocations.get_revoked_at(self.user.pk))
+
+    def test_hashing_unavailable(self):
+        """ Registering and logging in are rejected while too many passwords are being hashed. """
+        with mock.patch('testme_auth.hashers.hashing_pool.run', side_effect=PasswordHashingUnavailableException):
+            login = self.login()
+            register = self.client.post('/api/users/', {'username': 'other', 'password': self.password})
+
+        self.assertEqual(login.status_code, 503)
+        self.assertEqual(register.status_code, 503)
+        self.assertFalse(get_user_model().objects.filter(username='other').exists())
@@ -0,0 +1,159 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from parameterized import parameterized
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from quizzes.feed import latest_quizzes
+from quizzes.models import Quiz
+from testme_auth.authentication import token_revocations, revoked_tokens
+
+
+class TokenAuthenticationTests(TestCase):
+    def setUp(self) -> None:
+        self.password = 'thisisasecret'
+        self.user = get_user_model().objects.create_user('user', password=self.password)
+        self.admin = get_user_model().objects.create_superuser('admin', password=self.password)
+
+        caches['default'].clear()
+        token_revocations.clear()
+        revoked_tokens.clear()
+        latest_quizzes.clear()
+
+    def obtain_tokens(self, user) -> dict:
+        response = self.client.post('/api/auth/', {'username': user.username, 'password': self.password})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def refresh(self, token):
+        return self.client.post('/api/auth/refresh/', {'refresh': token})
+
+    def get(self, path, token):
+        return self.client.get(path, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_claims(self):
+        """ Issued tokens carry the claims users are built from. """
+        token = AccessToken(self.obtain_tokens(self.admin)['access'])
+        self.assertEqual(token['username'], 'admin')
+        self.assertTrue(token['is_staff'])
+        self.assertIn('iat', token)
+
+    def test_safe_requests(self):
+        """ Safe requests are authenticated without querying the user table. """
+        token = self.obtain_tokens(self.admin)['access']
+        self.get('/api/quizzes/latest/', token)
+
+        with self.assertNumQueries(0):
+            response = self.get('/api/answers/vote-buffer/', token)
+
+        # Only admins can see the vote buffer's metrics
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get('/api/answers/vote-buffer/', self.obtain_tokens(self.user)['access']).status_code,
+                         403)
+
+    @parameterized.expand([
+        ('/api/tags/',),
+        ('/api/questions/',),
+        ('/api/answers/',),
+        ('/api/quizzes/',),
+        ('/api/quizzes/latest/',),
+        ('/api/users/',),
+        ('/api/users/me/questions/',),
+        ('/api/users/me/answers/',),
+        ('/api/users/me/quizzes/',),
+    ])
+    def test_list(self, path):
+        """ Users authenticated from a token's claims can list everything anonymous users can. """
+        token = self.obtain_tokens(self.user)['access']
+        self.assertEqual(self.client.get(path).status_code, 200 if 'me' not in path else 401)
+        self.assertEqual(self.get(path, token).status_code, 200)
+
+    def test_unsafe_requests(self):
+        """ Other requests are authenticated as the user fetched from the database. """
+        token = self.obtain_tokens(self.user)['access']
+        response = self.client.post('/api/quizzes/', {'name': 'quiz', 'questions': []}, content_type='application/json',
+                                    HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Quiz.objects.get().creator, self.user)
+
+    def test_tokens_without_claims(self):
+        """ Tokens without the claims users are built from are authenticated against the database. """
+        token = AccessToken.for_user(self.user)
+        self.get('/api/quizzes/latest/', token)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get('/api/quizzes/latest/', token).status_code, 200)
+
+    def test_revoked_when_saved(self):
+        """ Tokens issued before a user is saved (e.g. deactivated) are rejected. """
+        tokens = self.obtain_tokens(self.user)
+        self.user.is_active = False
+
+        with mock.patch('time.time', return_value=AccessToken(tokens['access'])['iat'] + 1):
+            self.user.save()
+
+        response = self.get('/api/quizzes/latest/', tokens['access'])
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['data'], {'detail': 'Token has been revoked'})
+
+        # Refresh tokens are also revoked
+        self.assertEqual(self.refresh(tokens['refresh']).status_code, 401)
+
+    def test_revoked_in_same_second(self):
+        """ Tokens issued in the same second as their user's tokens are revoked are rejected, as they may be older. """
+        tokens = self.obtain_tokens(self.user)
+
+        with mock.patch('time.time', return_value=AccessToken(tokens['access'])['iat'] + 0.5):
+            self.user.save()
+
+        self.assertEqual(self.get('/api/quizzes/latest/', tokens['access']).status_code, 401)
+        self.assertEqual(self.refresh(tokens['refresh']).status_code, 401)
+
+    def test_revoked_when_deleted(self):
+        """ Deleting a user revokes their tokens. """
+        self.obtain_tokens(self.user)
+        user_id = self.user.pk
+        self.user.delete()
+        self.assertIsNotNone(token_revocations.get_revoked_at(user_id))
+
+    def test_not_revoked_by_login(self):
+        """ Logging in, which updates when the user last logged in, doesn't revoke their tokens. """
+        self.client.login(username=self.user.username, password=self.password)
+        self.assertIsNone(token_revocations.get_revoked_at(self.user.pk))
+
+    def test_refresh_rotated(self):
+        """ Refreshing a token issues a new refresh token with the same claims, and revokes the one used. """
+        tokens = self.obtain_tokens(self.user)
+        response = self.refresh(tokens['refresh'])
+        self.assertEqual(response.status_code, 200)
+
+        old, new = RefreshToken(tokens['refresh']), RefreshToken(response.json()['data']['refresh'])
+        self.assertNotEqual(old['jti'], new['jti'])
+        self.assertEqual((new['username'], new['iat']), (old['username'], old['iat']))
+        self.assertTrue(revoked_tokens.is_revoked(old['jti']))
+        self.assertFalse(revoked_tokens.is_revoked(new['jti']))
+
+        self.assertEqual(self.get('/api/quizzes/latest/', response.json()['data']['access']).status_code, 200)
+        self.assertEqual(self.refresh(response.json()['data']['refresh']).status_code, 200)
+
+    def test_refresh_reused(self):
+        """ Reusing a refresh token is rejected, and revokes every token issued to its user. """
+        tokens = self.obtain_tokens(self.user)
+        rotated = self.refresh(tokens['refresh']).json()['data']
+
+        # The revocation is read from the cache, as if the token were first used by another process
+        revoked_tokens.clear()
+        response = self.refresh(tokens['refresh'])
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['data'], {'detail': 'Token has been revoked'})
+        self.assertIsNotNone(token_revocations.get_revoked_at(self.user.pk))
+
+        with mock.patch('time.time', return_value=RefreshToken(tokens['refresh'])['iat'] + 1):
+            token_revocations.revoke(self.user.pk)
+
+        self.assertEqual(self.refresh(rotated['refresh']).status_code, 401)
+        self.assertEqual(self.get('/api/quizzes/latest/', rotated['access']).status_code, 401)
@@ -0,0 +1,117 @@
+import io
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from testme_auth.authentication import TokenRevocations, RevokedTokens, delete_expired_entries
+
+
+class TokenRevocationsTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.revocations = TokenRevocations(check_interval=30, max_size=2, prefix='test-revoked')
+        self.revocations.cache.delete_many([self.revocations.get_key(user_id) for user_id in range(4)])
+
+    def test_revoke(self):
+        """ Tokens issued before their user's tokens were revoked, or in the same second, are revoked. """
+        with mock.patch('time.time', return_value=1000.5):
+            self.revocations.revoke(1)
+
+        self.assertTrue(self.revocations.is_revoked({'user_id': 1, 'iat': 999}))
+        self.assertTrue(self.revocations.is_revoked({'user_id': 1, 'iat': 1000}))
+        self.assertFalse(self.revocations.is_revoked({'user_id': 1, 'iat': 1001}))
+        self.assertFalse(self.revocations.is_revoked({'user_id': 2, 'iat': 999}))
+
+    def test_remembered(self):
+        """ Revocations read from the cache are remembered until the check interval has passed. """
+        self.assertIsNone(self.revocations.get_revoked_at(1))
+        self.revocations.cache.set(self.revocations.get_key(1), 1000)
+        self.assertIsNone(self.revocations.get_revoked_at(1))
+
+        with mock.patch('time.monotonic', return_value=10 ** 9):
+            self.assertEqual(self.revocations.get_revoked_at(1), 1000)
+
+    def test_max_size(self):
+        """ Only the revocations of the most recently used users are remembered. """
+        for user_id in range(3):
+            self.revocations.get_revoked_at(user_id)
+
+        self.revocations.cache.set(self.revocations.get_key(0), 1000)
+        self.revocations.cache.set(self.revocations.get_key(2), 1000)
+
+        self.assertEqual(self.revocations.get_revoked_at(0), 1000)
+        self.assertIsNone(self.revocations.get_revoked_at(2))
+
+
+class RevokedTokensTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.revoked = RevokedTokens(max_size=2, prefix='test-revoked-jti')
+        self.revoked.cache.delete_many([self.revoked.get_key(jti) for jti in 'abcd'])
+
+    def test_revoke(self):
+        """ Tokens can only be revoked once, and are revoked until they expire. """
+        with mock.patch('time.time', return_value=1000):
+            self.assertTrue(self.revoked.revoke('a', 1060))
+            self.assertFalse(self.revoked.revoke('a', 1060))
+            self.assertTrue(self.revoked.is_revoked('a'))
+            self.assertFalse(self.revoked.is_revoked('b'))
+
+        with mock.patch('time.time', return_value=1060):
+            self.assertFalse(self.revoked.is_revoked('a'))
+
+    def test_expired(self):
+        """ Expired tokens aren't stored. """
+        with mock.patch('time.time', return_value=1000):
+            self.assertFalse(self.revoked.revoke('a', 1000))
+            self.assertIsNone(self.revoked.cache.get(self.revoked.get_key('a')))
+
+    def test_shared(self):
+        """ Tokens revoked by other processes are revoked straight away. """
+        other = RevokedTokens(prefix='test-revoked-jti')
+        self.assertFalse(self.revoked.is_revoked('a'))
+
+        with mock.patch('time.time', return_value=1000):
+            other.revoke('a', 10 ** 10)
+            self.assertTrue(self.revoked.is_revoked('a'))
+            self.assertFalse(self.revoked.revoke('a', 10 ** 10))
+
+    def test_max_size(self):
+        """ Only the most recently used ids are remembered, and the rest are read from the cache. """
+        for jti in 'abc':
+            self.revoked.revoke(jti, 10 ** 10)
+
+        self.assertEqual(list(self.revoked._revoked), ['b', 'c'])
+        self.assertTrue(self.revoked.is_revoked('a'))
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'db': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'test_cache_table'},
+})
+class DeleteExpiredEntriesTests(TestCase):
+    def setUp(self) -> None:
+        call_command('createcachetable', 'test_cache_table', verbosity=0)
+        self.cache = caches['db']
+
+    def test_database_cache(self):
+        """ Expired entries are deleted from database caches. """
+        self.cache.set('live', 1, timeout=60)
+        self.cache.set('expired', 1, timeout=-10)
+
+        self.assertEqual(delete_expired_entries(self.cache), 1)
+        self.assertEqual(self.cache.get('live'), 1)
+
+    def test_command(self):
+        """ cleanup_revoked_tokens deletes expired entries from the cache revocations are stored in. """
+        self.cache.set('expired', 1, timeout=-10)
+        output = io.StringIO()
+
+        with self.settings(JWT_REVOCATION_CACHE_ALIAS='db'):
+            call_command('cleanup_revoked_tokens', stdout=output)
+
+        self.assertEqual(output.getvalue().strip(), 'Deleted 1 expired cache entries')
+
+    def test_other_caches(self):
+        """ Other caches delete entries as they expire. """
+        self.assertIsNone(delete_expired_entries(caches['default']))
@@ -0,0 +1,25 @@
+from django.test import SimpleTestCase
+
+from testme_auth.availability import BloomFilter
+
+
+class BloomFilterTests(SimpleTestCase):
+    def test_contains(self):
+        """ Values added to the filter are always contained by it. """
+        bloom_filter = BloomFilter(100, 0.01)
+
+        for i in range(100):
+            bloom_filter.add(f'user_{i}')
+
+        self.assertTrue(all(f'user_{i}' in bloom_filter for i in range(100)))
+        self.assertEqual(bloom_filter.count, 100)
+
+    def test_error_rate(self):
+        """ Values not added to a full filter are reported as contained by it at about its error rate. """
+        bloom_filter = BloomFilter(1000, 0.01)
+
+        for i in range(1000):
+            bloom_filter.add(f'user_{i}')
+
+        false_positives = sum(f'other_{i}' in bloom_filter for i in range(10000))
+        self.assertLess(false_positives, 200)
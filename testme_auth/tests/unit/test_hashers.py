@@ -0,0 +1,90 @@
+import base64
+import threading
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password, check_password, identify_hasher
+from django.test import SimpleTestCase, override_settings
+
+from testme_auth.exceptions import PasswordHashingUnavailableException
+from testme_auth.hashers import HashingPool, ScryptPasswordHasher
+
+PBKDF2 = 'testme_auth.hashers.PBKDF2PasswordHasher'
+SCRYPT = 'testme_auth.hashers.ScryptPasswordHasher'
+
+
+@override_settings(SCRYPT_WORK_FACTOR=2 ** 10, PBKDF2_ITERATIONS=1000)
+class HasherTests(SimpleTestCase):
+    @override_settings(PASSWORD_HASHERS=[SCRYPT, PBKDF2])
+    def test_scrypt(self):
+        """ Passwords can be hashed with scrypt. """
+        encoded = make_password('thisisasecret')
+
+        self.assertTrue(encoded.startswith('scrypt$1024$'))
+        self.assertTrue(check_password('thisisasecret', encoded))
+        self.assertFalse(check_password('thisisnotasecret', encoded))
+
+    def test_scrypt_format(self):
+        """ Hashes are in the format used by Django's scrypt hasher. """
+        # The second test vector of RFC 7914
+        expected = bytes.fromhex('fdbabe1c9d3472007856e7190d01e9fe7c6ad7cbc8237830e77376634b3731622eaf30d92e22a3886ff1'
+                                 '09279d9830dac727afb94a83ee6d8360cbdfa2cc0640')
+        encoded = ScryptPasswordHasher().encode('password', 'NaCl', 1024, 8, 16)
+        self.assertEqual(encoded, f"scrypt$1024$NaCl$8$16${base64.b64encode(expected).decode('ascii')}")
+
+    @override_settings(PASSWORD_HASHERS=[PBKDF2, SCRYPT])
+    def test_costs(self):
+        """ Costs are read from the settings, and hashes with other costs must be updated. """
+        encoded = make_password('thisisasecret')
+        self.assertTrue(encoded.startswith('pbkdf2_sha256$1000$'))
+
+        with self.settings(PBKDF2_ITERATIONS=2000):
+            self.assertTrue(identify_hasher(encoded).must_update(encoded))
+
+        with self.settings(PASSWORD_HASHERS=[SCRYPT, PBKDF2], SCRYPT_BLOCK_SIZE=4):
+            encoded = make_password('thisisasecret')
+            self.assertFalse(identify_hasher(encoded).must_update(encoded))
+
+        self.assertTrue(identify_hasher(encoded).must_update(encoded))
+
+    @override_settings(PASSWORD_HASHERS=[PBKDF2, SCRYPT])
+    def test_hashed_on_pool(self):
+        """ Hashes are computed on the pool's threads. """
+        threads = set()
+
+        def pbkdf2(*args, **kwargs):
+            threads.add(threading.current_thread().name)
+            return b''
+
+        with mock.patch('django.contrib.auth.hashers.pbkdf2', side_effect=pbkdf2):
+            make_password('thisisasecret')
+
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads.pop().startswith('password-hashing'))
+
+
+class HashingPoolTests(SimpleTestCase):
+    def test_full(self):
+        """ Functions can't be run once every thread is busy and the queue is full. """
+        pool = HashingPool(threads=1, queue=1)
+        self.addCleanup(pool.shutdown)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        running = [threading.Thread(target=pool.run, args=(block,)) for _ in range(2)]
+        for thread in running:
+            thread.start()
+
+        started.wait()
+
+        try:
+            with self.assertRaises(PasswordHashingUnavailableException):
+                pool.run(lambda: None)
+        finally:
+            release.set()
+            for thread in running:
+                thread.join()
+
+        self.assertEqual(pool.run(lambda: 1), 1)
@@ -1,11 +1,35 @@
 from django.contrib.auth import get_user_model
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework_simplejwt import views as jwt_views
 
+from .availability import user_availability
 from .permissions import IsSelfOrAdminUserOrReadOnly
-from .serializers import UserSerializer
+from .serializers import AvailabilitySerializer, UserSerializer, TokenObtainPairSerializer, TokenRefreshSerializer
 
 
 class UserViewSet(viewsets.ModelViewSet):
     queryset = get_user_model().objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsSelfOrAdminUserOrReadOnly]
+
+    @action(detail=False, methods=['get'], serializer_class=AvailabilitySerializer)
+    def available(self, request):
+        """
+        Returns whether the given username and/or email are available to register, ignoring case, e.g.
+        `?username=user&email=user@example.com`. Another user may take them before they're registered.
+        """
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(user_availability.get_available(**serializer.validated_data))
+
+
+class TokenObtainPairView(jwt_views.TokenObtainPairView):
+    """ Issues a pair of access and refresh tokens given a username and password. """
+    serializer_class = TokenObtainPairSerializer
+
+
+class TokenRefreshView(jwt_views.TokenRefreshView):
+    """ Exchanges a refresh token for an access token and a new refresh token. Each refresh token can be used once. """
+    serializer_class = TokenRefreshSerializer
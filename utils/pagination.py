@@ -0,0 +1,217 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Optional, Sequence
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, Cursor, _reverse_ordering
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Paginates by the values of the last row on the previous page (a keyset) rather than by page number, so each page is
+    found with an index seek instead of counting every row and skipping over those on earlier pages.
+
+    The keyset is the queryset's ordering, which must be made up of non-null model fields ending with 'pk' (or another
+    unique field), e.g. `order_by('created_on', 'pk')`. Querysets ordered by anything else, such as search results
+    ordered by relevance, are paginated by offset instead. Responses contain 'next', 'previous' and 'results' but no
+    count of results.
+
+    Clients can set the page size with `?page_size=`, up to `max_page_size`.
+    """
+
+    ordering = ('pk',)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        if self.ordering is None:
+            return self.paginate_by_offset(queryset)
+
+        return self.paginate_by_keyset(queryset)
+
+    def paginate_by_keyset(self, queryset):
+        offset, reverse, position = self.cursor or (0, False, None)
+
+        if position is not None:
+            position = self.get_position_values(queryset, position)
+
+        queryset = queryset.order_by(*(_reverse_ordering(self.ordering) if reverse else self.ordering))
+
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position, reverse))
+
+        # Fetch an extra row to find out if there is another page
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        return self.page
+
+    def paginate_by_offset(self, queryset):
+        offset = self.cursor.offset if self.cursor else 0
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        self.has_next = len(results) > self.page_size
+        self.has_previous = offset > 0
+        return self.page
+
+    def get_position_values(self, queryset, position: Sequence) -> list:
+        """
+        Converts the values of a cursor's position (from the client) to those of the ordering's fields, raising NotFound
+        if they aren't valid values of those fields.
+        """
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        meta = queryset.model._meta
+        values = []
+
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            model_field = meta.pk if name == 'pk' else meta.get_field(name)
+
+            try:
+                value = model_field.to_python(value)
+            except (TypeError, ValueError, DjangoValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+
+            values.append(value)
+
+        return values
+
+    def get_keyset_filter(self, position: Sequence, reverse: bool) -> Q:
+        """
+        Returns a filter matching rows after the given position in the ordering (or before it if reversed). For an
+        ordering of (a, b) this is `a > x OR (a = x AND b > y)`.
+        """
+        keyset_filter = Q()
+        equal_to_position = {}
+
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') != reverse else 'gt'
+            keyset_filter |= Q(**equal_to_position, **{f'{name}__{lookup}': value})
+            equal_to_position[name] = value
+
+        return keyset_filter
+
+    def get_ordering(self, request, queryset, view) -> Optional[Sequence[str]]:
+        """ Returns the fields of the queryset's ordering, or None if it can't be used as a keyset. """
+        query = queryset.query
+
+        if query.combinator:
+            return None
+
+        if not query.order_by:
+            return self.ordering
+
+        fields = query.order_by
+        meta = queryset.model._meta
+        model_fields = {'pk'} | {field.name for field in meta.concrete_fields}
+
+        # Annotations (e.g. search ranks) and related fields aren't used, as their values may not be stable
+        if not all(isinstance(field, str) and field.lstrip('-') in model_fields for field in fields):
+            return None
+
+        if fields[-1].lstrip('-') not in ('pk', meta.pk.name):
+            return None
+
+        return tuple(fields)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        if self.ordering is None:
+            offset = (self.cursor.offset if self.cursor else 0) + self.page_size
+            return self.encode_cursor(Cursor(offset=offset, reverse=False, position=None))
+
+        if not self.page:
+            # Only happens when paging backwards past rows that were since deleted, so start again
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+
+        if self.ordering is None:
+            offset = self.cursor.offset - self.page_size
+            if offset <= 0:
+                return remove_query_param(self.base_url, self.cursor_query_param)
+            return self.encode_cursor(Cursor(offset=offset, reverse=False, position=None))
+
+        if not self.page:
+            return None
+
+        position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request) -> Optional[Cursor]:
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if encoded is None:
+            return None
+
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            offset = int(tokens.get('o', 0))
+            reverse = bool(tokens.get('r', False))
+            position = tokens.get('p')
+        except (TypeError, ValueError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if offset < 0 or (position is not None and not isinstance(position, list)):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=offset, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor: Cursor) -> str:
+        tokens = {}
+
+        if cursor.offset:
+            tokens['o'] = cursor.offset
+        if cursor.reverse:
+            tokens['r'] = 1
+        if cursor.position is not None:
+            tokens['p'] = cursor.position
+
+        encoded = json.dumps(tokens, separators=(',', ':'), default=str)
+        encoded = urlsafe_b64encode(encoded.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+
+        for field in ordering:
+            # Rows may be instances or dicts (from `values()`)
+            name = field.lstrip('-')
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            # Dates are kept to the microsecond (unlike DjangoJSONEncoder) so no rows are skipped or repeated
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+
+        return position
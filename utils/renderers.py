@@ -1,17 +1,136 @@
+import uuid
+from collections.abc import Iterator
+from typing import Optional
+
+from django.http import StreamingHttpResponse
+from django.http.multipartparser import parse_header
+from rest_framework.compat import SHORT_SEPARATORS, LONG_SEPARATORS, INDENT_SEPARATORS
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
+from utils.encoders import Encoder
+
 
 class DescriptiveJsonRenderer(JSONRenderer):
+    """
+    Renders data wrapped in an envelope describing the response's status. Data is encoded with orjson or ujson if
+    either is installed (see utils.encoders).
+    """
 
     def render(self, data, accepted_media_type=None, renderer_context=None, message=None):
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        return self.get_encoder(indent).encode(self.wrap(data, renderer_context, message))
+
+    def get_encoder(self, indent: Optional[int] = None) -> Encoder:
+        """ Returns an encoder that encodes data like JSONRenderer does with the given indent. """
+        if indent is None:
+            separators = SHORT_SEPARATORS if self.compact else LONG_SEPARATORS
+        else:
+            separators = INDENT_SEPARATORS
+
+        return Encoder(self.encoder_class, indent=indent, ensure_ascii=self.ensure_ascii, allow_nan=not self.strict,
+                       separators=separators)
+
+    def wrap(self, data, renderer_context, message=None) -> dict:
+        """
+        Wraps data in an envelope describing the status of the response it's rendered for. Views can set a 'message'
+        attribute on a response to replace its status text.
+        """
         response: Response = renderer_context['response']
 
-        wrapped_data = {
+        return {
             'status': response.status_code,
             'success': response.status_code < 400,
-            'message': message or response.status_text,
+            'message': message or getattr(response, 'message', None) or response.status_text,
             'data': data
         }
 
-        return super().render(wrapped_data, accepted_media_type, renderer_context)
+
+class StreamingJsonRenderer(DescriptiveJsonRenderer):
+    """
+    DescriptiveJsonRenderer that can stream responses, so the whole body is never held in memory at once. The rows of a
+    list (the data itself, or the 'results' of a page) are encoded `batch_size` at a time as the response is sent, the
+    rest of the envelope around them up front. The body is identical to that rendered by DescriptiveJsonRenderer.
+
+    Usage:
+        Use in place of DescriptiveJsonRenderer. Responses are streamed when a client sends
+        `Accept: application/json; stream=true`, or for every request to views whose `stream_responses` attribute is
+        True. Responses with an indent (e.g. `Accept: application/json; indent=4`) aren't streamed.
+    """
+    batch_size = 100
+
+    def render(self, data, accepted_media_type=None, renderer_context=None, message=None):
+        renderer_context = renderer_context or {}
+
+        if not self.should_stream(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context, message)
+
+        response: Response = renderer_context['response']
+        content_type = response['Content-Type']
+        chunks = self.render_chunks(self.wrap(data, renderer_context, message))
+
+        # Responses can't be streamed by renderers, so replace the response with one that is once it's rendered. The
+        # rendered content is empty, which also removes its content type.
+        response.add_post_render_callback(lambda rendered: self.get_streaming_response(rendered, chunks, content_type))
+        return b''
+
+    def should_stream(self, accepted_media_type, renderer_context) -> bool:
+        response = renderer_context.get('response')
+
+        # The browsable API renders data with the first JSON renderer of the view, which mustn't replace its response
+        if response is None or getattr(response, 'accepted_renderer', None) is not self:
+            return False
+
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return False
+
+        if getattr(renderer_context.get('view'), 'stream_responses', False):
+            return True
+
+        params = parse_header(accepted_media_type.encode('ascii'))[1] if accepted_media_type else {}
+        return params.get('stream') == b'true'
+
+    def render_chunks(self, data: dict):
+        """ Yields the encoded envelope in chunks, encoding the rows of lists in batches as they're needed. """
+        body = data['data']
+        encoder = self.get_encoder()
+        placeholder = uuid.uuid4().hex
+
+        if isinstance(body, (list, tuple, Iterator)):
+            rows, data = body, {**data, 'data': placeholder}
+        elif isinstance(body, dict) and isinstance(body.get('results'), (list, tuple, Iterator)):
+            rows, data = body['results'], {**data, 'data': {**body, 'results': placeholder}}
+        else:
+            yield encoder.encode(data)
+            return
+
+        # Rows are encoded in place of the placeholder, which is a (quoted) string that can't occur elsewhere
+        head, tail = encoder.encode(data).split(encoder.encode(placeholder))
+        separator = (SHORT_SEPARATORS if self.compact else LONG_SEPARATORS)[0].encode()
+        prefix, batch = b'', []
+
+        yield head + b'['
+
+        # Each batch is encoded as a list, without its brackets
+        for row in rows:
+            batch.append(row)
+
+            if len(batch) == self.batch_size:
+                yield prefix + encoder.encode(batch)[1:-1]
+                prefix, batch = separator, []
+
+        if batch:
+            yield prefix + encoder.encode(batch)[1:-1]
+
+        yield b']' + tail
+
+    def get_streaming_response(self, response: Response, chunks, content_type: str) -> StreamingHttpResponse:
+        streaming_response = StreamingHttpResponse(chunks, status=response.status_code, content_type=content_type)
+
+        for header, value in response.items():
+            if header.lower() != 'content-type':
+                streaming_response[header] = value
+
+        streaming_response.cookies = response.cookies
+        return streaming_response